@@ -1,10 +1,37 @@
-import pandas as pd
 import os
 import time
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import redirect_stdout
 import importlib.util
+import multiprocessing
+import queue
 import sys
 
+import pandas as pd
+
+from fetch_engine import FetchEngine
+from crawl_metrics import CrawlMetrics
+from http_client import HttpClient
+from http_cache import HttpCache
+from url_frontier import UrlFrontier
+from crawl_checkpoint import CrawlCheckpoint, clear_checkpoint
+from dataset_store import count_rows, read_dataset
+from article_store import ArticleStore
+from scraper_common import set_progress_callback
+
+# Toplanan kaynaklar: kaynak adı -> (görünen ad, betik, toplama fonksiyonu)
+SOURCES = {
+    'cnnturk': ("CNN Türk", "notebooks/01_cnn_scrapping.py", 'get_cnn_news'),
+    'ntv': ("NTV", "notebooks/04_ntv_scrapping.py", 'get_ntv_news'),
+    'haberturk': ("Habertürk", "notebooks/03_haberturk_scrapping.py", 'get_haberturk_news'),
+    'sabah': ("Sabah", "notebooks/02_sabah_scrapping.py", 'get_sabah_news')
+}
+
+# İlerleme satırlarının yazdırılma aralığı (saniye)
+PROGRESS_INTERVAL = 10
+
+
 def import_module_from_file(module_name, file_path):
     """Belirtilen dosya yolundan bir modül yükler"""
     spec = importlib.util.spec_from_file_location(module_name, file_path)
@@ -13,12 +40,121 @@ def import_module_from_file(module_name, file_path):
     spec.loader.exec_module(module)
     return module
 
-def collect_all_data(target_per_category=200):
+def save_source_dataset(df, output_file, append=False):
+    """
+    Kaynağın veri setini CSV'ye yazar; append=True ise mevcut dosyanın sonuna ekler
+
+    Eklenen satırlar mevcut dosyanın başlığındaki sütun sırasına göre yazılır.
+    Sütunlar farklıysa (ör. content_hash sütunu olmayan eski dosyalar) dosya
+    eski ve yeni haberlerle, yeni başlıkla baştan yazılır; satırlar başlıkla
+    kaymaz.
+    """
+    if append and os.path.exists(output_file):
+        header = pd.read_csv(output_file, nrows=0, encoding='utf-8').columns.tolist()
+        if set(header) == set(df.columns):
+            df.reindex(columns=header).to_csv(output_file, mode='a', header=False, index=False, encoding='utf-8')
+            return
+        existing = pd.read_csv(output_file, dtype=str, encoding='utf-8')
+        df = pd.concat([existing, df], ignore_index=True)
+        df = df.reindex(columns=list(dict.fromkeys(header + list(df.columns))))
+    df.to_csv(output_file + '.part', index=False, encoding='utf-8')
+    os.replace(output_file + '.part', output_file)
+
+def collect_source(source, target_per_category, per_host, use_cache, seen_urls_path, resume, progress_queue, store_path=None):
+    """
+    Tek bir kaynağı kendi sürecinde toplar ve ham veri setini kaydeder
+
+    Her kaynak kendi bağlantı havuzunu ve indirme motorunu kullanır; ayrıntılı
+    çıktılar data/logs/<kaynak>.log dosyasına, ölçümler (istek süreleri, bayt,
+    ayrıştırma süreleri, hata sınıfları) data/raw/<kaynak>_metrics.json dosyasına
+    yazılır; haber ve hata olayları `progress_queue` üzerinden ana sürece bildirilir.
+
+    Returns:
+        Kaynağın toplam haber sayısı (haberlerin kendisi data/stream/<kaynak>/ akışındadır; resume=False ise data/stream/<kaynak>.adhoc/)
+    """
+    name, script, function_name = SOURCES[source]
+    os.makedirs('data/logs', exist_ok=True)
+
+    with open(f'data/logs/{source}.log', 'a', encoding='utf-8') as log, redirect_stdout(log):
+        print(f"\n{name} toplama işlemi başladı: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        set_progress_callback(lambda source, event, category: progress_queue.put((source, event, category)))
+
+        module = import_module_from_file(f"{source}_scrapping", script)
+        cache = HttpCache() if use_cache else None
+        client = HttpClient(pool_maxsize=per_host, cache=cache)
+        engine = FetchEngine(per_host=per_host, client=client, metrics=CrawlMetrics(source))
+        frontier = UrlFrontier(seen_urls_path)
+        checkpoint = CrawlCheckpoint(source) if resume else None
+        store = ArticleStore(store_path) if store_path else None
+
+        try:
+            df = getattr(module, function_name)(target_per_category=target_per_category, engine=engine, frontier=frontier, checkpoint=checkpoint, store=store)
+        finally:
+            if store is not None:
+                store.close()
+            engine.close()
+            engine.print_stats()
+            engine.metrics.save(f'data/raw/{source}_metrics.json')
+            client.close()
+            set_progress_callback(None)
+
+        if len(df) > 0:
+            save_source_dataset(df, f'data/raw/{source}_news_dataset.csv', append=seen_urls_path is not None or store_path is not None)
+        print(f"{name} toplama işlemi bitti: {len(df)} haber")
+
+    return len(df)
+
+class SourceProgress:
+    """Bir kaynağın ilerleme sayaçları (ana süreçte tutulur)"""
+
+    def __init__(self, source):
+        self.source = source
+        self.started = time.monotonic()
+        self.finished = None
+        self.articles = 0
+        self.errors = 0
+        self.status = 'çalışıyor'
+
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def throughput(self):
+        elapsed = self.elapsed()
+        return self.articles / elapsed if elapsed > 0 else 0.0
+
+    def line(self):
+        return (f"{SOURCES[self.source][0]}: {self.articles} haber, {self.errors} hata, "
+                f"{self.throughput():.2f} haber/sn ({self.status})")
+
+def collect_all_data(target_per_category=200, per_host=4, use_cache=True, seen_urls_path=None, resume=True, sources=None,
+                     dedup_threshold=0.8, store_path=None):
     """
     Tüm haber kaynaklarından veri çekip birleştiren fonksiyon
     
+    Kaynaklar ayrı süreçlerde aynı anda toplanır; toplam süre en yavaş sitenin
+    süresiyle sınırlıdır. Biten her kaynağın ham veri seti hemen birleşik veri
+    setine eklenir (04_combine_datasets ile artımlı: yalnızca kaynağın yeni veya
+    değişen haberleri okunur); haberlerin tamamı hiçbir zaman belleğe alınmaz.
+    
     Args:
         target_per_category: Her kategoriden çekilecek hedef haber sayısı
+        per_host: Aynı siteye aynı anda gönderilecek en fazla istek sayısı; kaynak bazında
+            farklı değer için sözlük verilebilir ({'sabah': 2, 'ntv': 6} gibi, verilmeyenler için 4)
+        use_cache: Yanıtlar data/cache/http altındaki disk önbelleğinde tutulsun mu
+        seen_urls_path: Verilirse işlenen haber URL'leri bu dosyada saklanır ve sonraki
+            çalışmalarda tekrar çekilmez (ör. 'data/state/seen_urls.txt'); bu durumda
+            yalnızca yeni haberler çekildiği için kaynak CSV'lerinin sonuna eklenir
+        resume: Tarama durumu data/checkpoints altında adım adım kaydedilir; yarıda kalan
+            bir toplama işlemi yeniden başlatıldığında kaldığı yerden devam eder
+        sources: Toplanacak kaynak adları (varsayılan: SOURCES içindeki tüm kaynaklar)
+        dedup_threshold: Farklı kaynaklardaki yakın kopya haberlerin (ajans haberleri gibi)
+            atılacağı benzerlik eşiği; ilk eklenen tutulur, atılanlar data/raw/all_news_duplicates.csv
+            dosyasına yazılır (None ise kopya kontrolü yapılmaz)
+        store_path: Verilirse haber deposu (ör. article_store.STORE_PATH); depoda zaten olan
+            haberler indirilmez, yeni haberler depoya eklenir ve kaynak CSV'lerinin sonuna yazılır
+    
+    Returns:
+        Birleşik veri setinin yolu (hiç veri çekilemediyse None)
     """
     # Data/raw klasörünü oluştur (yoksa)
     os.makedirs('data/raw', exist_ok=True)
@@ -28,50 +164,86 @@ def collect_all_data(target_per_category=200):
     print(f"VERİ TOPLAMA İŞLEMİ BAŞLADI: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 50)
     
-    all_data = []
+    sources = list(sources or SOURCES)
+    # Biten kaynaklar birleşik veri setine (data/dataset/all_news) artımlı olarak eklenir
+    combine = import_module_from_file('combine_datasets', 'notebooks/04_combine_datasets.py').combine_news_datasets
     
-    # Modülleri dinamik olarak yükle
-    cnn_module = import_module_from_file("cnn_scrapping", "notebooks/01_cnn_scrapping.py")
-    ntv_module = import_module_from_file("ntv_scrapping", "notebooks/04_ntv_scrapping.py")
+    output_file = None
+    progress = {source: SourceProgress(source) for source in sources}
     
-    # CNN Türk'ten veri çek
-    print("\n1. CNN Türk'ten veriler çekiliyor...")
-    cnn_df = cnn_module.get_cnn_news(target_per_category=target_per_category)
-    if len(cnn_df) > 0:
-        cnn_df.to_csv('data/raw/cnnturk_news_dataset.csv', index=False, encoding='utf-8')
-        all_data.append(cnn_df)
-        print(f"  - {len(cnn_df)} haber çekildi ve kaydedildi.")
-    else:
-        print("  ! CNN Türk'ten hiç veri çekilemedi.")
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=len(sources)) as executor:
+        progress_queue = manager.Queue()
+        futures = {}
+        for source in sources:
+            budget = per_host.get(source, 4) if isinstance(per_host, dict) else per_host
+            print(f"  - {SOURCES[source][0]} başlatıldı (site başına {budget} eşzamanlı istek, günlük: data/logs/{source}.log)")
+            future = executor.submit(collect_source, source, target_per_category, budget, use_cache,
+                                     seen_urls_path, resume, progress_queue, store_path)
+            futures[future] = source
+        
+        pending = set(futures)
+        last_report = time.monotonic()
+        while pending:
+            done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+            
+            # Kaynaklardan gelen olayları işle
+            while True:
+                try:
+                    source, event, category = progress_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event == 'article':
+                    progress[source].articles += 1
+                else:
+                    progress[source].errors += 1
+            
+            # Biten kaynağın haberlerini birleşik veri setine ekle
+            for future in done:
+                source = futures[future]
+                state = progress[source]
+                state.finished = time.monotonic()
+                try:
+                    state.articles = future.result()
+                except Exception as e:
+                    state.status = 'başarısız'
+                    print(f"  ! {SOURCES[source][0]} toplanırken hata oluştu: {str(e)}")
+                    continue
+                
+                state.status = f'bitti, {state.elapsed():.0f} sn'
+                if state.articles > 0:
+                    output_file = combine(chunksize=500, dedup_threshold=dedup_threshold, sources=[source]) or output_file
+                    print(f"  - {SOURCES[source][0]}: {state.articles} haber çekildi ve kaydedildi.")
+                else:
+                    print(f"  ! {SOURCES[source][0]}: hiç veri çekilemedi.")
+                
+                # Haberler kaydedildi; kaynağın bir sonraki çalışması baştan başlamalı
+                clear_checkpoint(source)
+            
+            if time.monotonic() - last_report >= PROGRESS_INTERVAL and pending:
+                last_report = time.monotonic()
+                print(" | ".join(state.line() for state in progress.values()))
     
-    # NTV'den veri çek
-    print("\n2. NTV'den veriler çekiliyor...")
-    ntv_df = ntv_module.get_ntv_news(target_per_category=target_per_category)
-    if len(ntv_df) > 0:
-        ntv_df.to_csv('data/raw/ntv_news_dataset.csv', index=False, encoding='utf-8')
-        all_data.append(ntv_df)
-        print(f"  - {len(ntv_df)} haber çekildi ve kaydedildi.")
-    else:
-        print("  ! NTV'den hiç veri çekilemedi.")
+    print("\nKaynak özeti:")
+    for state in progress.values():
+        print(f"  - {state.line()}")
     
-    # Tüm verileri birleştir
-    if all_data:
-        combined_df = pd.concat(all_data, ignore_index=True)
-        combined_df.to_csv('data/processed/all_news_dataset.csv', index=False, encoding='utf-8')
+    # Birleşik veri setinin özeti (yalnızca bölüm sütunları okunur)
+    if output_file:
+        counts = read_dataset('all_news', columns=['source', 'category'])
         
         print("\n" + "=" * 50)
         print(f"VERİ TOPLAMA İŞLEMİ TAMAMLANDI: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Toplam {len(combined_df)} haber çekildi.")
-        print(f"Kaynak dağılımı:\n{combined_df['source'].value_counts()}")
-        print(f"Kategori dağılımı:\n{combined_df['category'].value_counts()}")
+        print(f"Bu çalışmada {sum(state.articles for state in progress.values())} haber çekildi; birleşik veri setinde {count_rows('all_news')} haber var.")
+        print(f"Kaynak dağılımı:\n{counts['source'].value_counts()}")
+        print(f"Kategori dağılımı:\n{counts['category'].value_counts()}")
         print("=" * 50)
         
-        return combined_df
+        return output_file
     else:
         print("\n" + "=" * 50)
         print("Hiçbir kaynaktan veri çekilemedi!")
         print("=" * 50)
-        return pd.DataFrame()
+        return None
 
 if __name__ == "__main__":
     collect_all_data(target_per_category=200) 
\ No newline at end of file
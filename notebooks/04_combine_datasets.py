@@ -1,69 +1,286 @@
 import pandas as pd
 import os
+import io
+import json
 import glob
+import hashlib
+from collections import Counter
 
-def combine_news_datasets():
+from article_sink import STREAM_DIR, list_parts
+from dataset_store import (HAS_ARROW, RAW_COLUMNS, RAW_PARTITIONS, DatasetManifest, DatasetWriter, append_files,
+                           count_rows, dataset_path, delete_files, read_dataset, read_files)
+from near_duplicates import NearDuplicateIndex, drop_near_duplicates
+from article_store import ArticleStore
+from url_canon import content_hash
+
+# Birleşik veri setinin kopya dizini (sonraki birleştirmelerde yeni haberler önceki haberlerle de karşılaştırılır)
+DEDUP_INDEX_PATH = 'data/dataset/all_news.dedup.npz'
+DUPLICATES_REPORT = 'data/raw/all_news_duplicates.csv'
+
+def find_inputs(include_streams=False, sources=None):
+    """
+    Birleştirilecek girdi dosyaları: kaynak CSV'leri ve (istenirse) akış parçaları
+
+    Returns:
+        [(dosya yolu, kaynak adı, tür)] listesi; tür 'csv' veya 'stream'
+    """
+    # Tüm CSV dosyalarını bul (eski birleşik dosya hariç)
+    legacy_file = 'data/raw/all_news_dataset.csv'
+    inputs = []
+    for file in sorted(glob.glob('data/raw/*_news_dataset.csv')):
+        if os.path.abspath(file) != os.path.abspath(legacy_file):
+            inputs.append((file.replace(os.sep, '/'), os.path.basename(file).replace('_news_dataset.csv', ''), 'csv'))
+    if include_streams:
+        for directory in sorted(glob.glob(os.path.join(STREAM_DIR, '*'))):
+            for part in list_parts(directory):
+                inputs.append((part.replace(os.sep, '/'), os.path.basename(directory), 'stream'))
+    if sources is not None:
+        inputs = [item for item in inputs if item[1] in sources]
+    return inputs
+
+def read_input(path, start=0, chunksize=1000):
+    """
+    Girdi dosyasını `start` baytından itibaren parça parça okur
+
+    Önceki birleştirmeden sonra sonuna eklenmiş girdilerde yalnızca yeni baytlar
+    okunur (CSV başlık satırı bu baytların önüne eklenir). Akış parçalarında
+    yazılırken yarıda kalmış son satır bir sonraki birleştirmeye bırakılır.
+
+    Returns:
+        (DataFrame üreteci, okunan kısmın bittiği bayt)
+    """
+    with open(path, 'rb') as f:
+        header = f.readline() if path.endswith('.csv') else b''
+        start = max(start, len(header))
+        f.seek(start)
+        data = f.read()
+    if not path.endswith('.csv'):
+        data = data[:data.rfind(b'\n') + 1]
+    return _read_chunks(path, header, data, chunksize), start + len(data)
+
+def _read_chunks(path, header, data, chunksize):
+    if not data.strip():
+        return
+    if path.endswith('.csv'):
+        yield from pd.read_csv(io.BytesIO(header + data), encoding='utf-8', dtype=str, chunksize=chunksize)
+        return
+    rows = []
+    for line in data.splitlines():
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            continue
+        if len(rows) >= chunksize:
+            yield pd.DataFrame(rows)
+            rows = []
+    if rows:
+        yield pd.DataFrame(rows)
+
+def add_fingerprints(chunk):
+    """
+    content_hash sütunu olmayan (eski kaynak CSV'leri) veya boş olan satırların
+    parmak izini içerikten hesaplar; depo indeksi ve birebir kopya kontrolü tüm
+    haberleri kapsar
+    """
+    if 'content_hash' not in chunk.columns:
+        chunk['content_hash'] = None
+    missing = chunk['content_hash'].isna() & chunk['content'].notna()
+    if missing.any():
+        chunk.loc[missing, 'content_hash'] = chunk.loc[missing, 'content'].astype(str).map(content_hash)
+    return chunk
+
+def combine_news_datasets(include_streams=False, chunksize=1000, dedup_threshold=0.8, sources=None, full=False):
     """
     Tüm haber veri setlerini birleştiren ve kategorilere göre düzenleyen fonksiyon
+
+    Birleştirme artımlıdır: her girdi dosyasının boyutu, değişiklik zamanı ve
+    içerik özeti data/dataset/all_news.manifest.json kaydında tutulur. Değişmeyen
+    girdiler okunmaz, sonuna eklenen girdilerin yalnızca yeni satırları okunur,
+    içeriği değişen girdilerin eski dosyaları silinip girdi yeniden eklenir.
+    Böylece bir günün yeni haberlerini birleştirmek tüm geçmişi değil yalnızca
+    yeni veriyi okumak kadar sürer. Birleşik veri seti data/dataset/all_news
+    altında kaynak / kategori / tarih bölümlerine ayrılmış Parquet dosyalarıdır;
+    her girdi bölümlere kendi dosyalarını ekler (pyarrow kurulu değilse veri seti
+    data/dataset/all_news.csv dosyasıdır ve her seferinde baştan oluşturulur).
+    Eklenen haberler haber deposuna (data/state/articles.sqlite) da yazılır;
+    sonraki aşamalar alt kümeleri depo indekslerinden seçebilir.
+
+    Args:
+        include_streams: True ise data/stream altındaki (taraması devam eden) kaynakların
+            o ana kadar yazılmış haberleri de eklenir
+        chunksize: Tek seferde okunan en fazla satır sayısı
+        dedup_threshold: Bu benzerliğin üzerindeki yakın kopya haberler (farklı kaynaklarda
+            yayımlanan aynı ajans haberi gibi) yalnızca bir kez eklenir; atılanlar
+            data/raw/all_news_duplicates.csv dosyasına yazılır (None ise kopya kontrolü yapılmaz)
+        sources: Yalnızca bu kaynakların girdilerine bakılır (varsayılan: tümü)
+        full: True ise veri seti baştan oluşturulur
+
+    Returns:
+        Birleşik veri setinin yolu (hiç veri yoksa None)
     """
     print("Veri setleri birleştiriliyor...")
-    
+
     # Data/raw klasörünü kontrol et
     if not os.path.exists('data/raw'):
         print("Error: 'data/raw' klasörü bulunamadı!")
         return
-    
-    # Tüm CSV dosyalarını bul
-    csv_files = glob.glob('data/raw/*_news_dataset.csv')
-    
-    if not csv_files:
+
+    inputs = find_inputs(include_streams, sources)
+    if not inputs:
         print("Error: Hiçbir veri seti bulunamadı!")
         return
-    
-    print(f"{len(csv_files)} adet veri seti bulundu:")
-    for file in csv_files:
-        print(f"  - {os.path.basename(file)}")
-    
-    # Tüm veri setlerini oku ve birleştir
-    all_data = []
-    
-    for file in csv_files:
+
+    store = ArticleStore()
+    if not HAS_ARROW:
+        try:
+            return _combine_csv(inputs, chunksize, dedup_threshold, store)
+        finally:
+            store.close()
+
+    # 'fingerprints': parmak izi olmadan birleştirilmiş eski veri setleri bir kez baştan oluşturulur
+    manifest = DatasetManifest('all_news', settings={'dedup_threshold': dedup_threshold, 'fingerprints': True})
+    # Depo silinmişse veri setiyle birlikte baştan oluşturulur
+    if full or not manifest.valid or (manifest.rows() and not store.count()):
+        print("  - Birleşik veri seti baştan oluşturuluyor.")
+        manifest.reset()
+        store.clear()
+        if os.path.exists(DEDUP_INDEX_PATH):
+            os.remove(DEDUP_INDEX_PATH)
+
+    # Yarıda kalmış bir birleştirmenin kayda geçmemiş dosyalarını sil
+    orphans = manifest.orphans()
+    if orphans:
+        delete_files('all_news', orphans)
+        print(f"  - Yarıda kalmış birleştirmeden kalan {len(orphans)} dosya silindi.")
+
+    duplicates = None
+    if dedup_threshold is not None:
+        if os.path.exists(DEDUP_INDEX_PATH):
+            duplicates = NearDuplicateIndex.load(DEDUP_INDEX_PATH)
+        else:
+            duplicates = NearDuplicateIndex(threshold=dedup_threshold)
+
+    # Kaldırılan CSV girdilerinin haberlerini veri setinden çıkar (akış parçaları, haberleri
+    # kaynak CSV'sine kaydedildikten sonra silindiği için eklenmiş hâlleriyle kalır)
+    scanned = {path for path, _, _ in inputs}
+    for path, entry in list(manifest.inputs.items()):
+        if path not in scanned and entry['kind'] == 'csv' and (sources is None or entry['source'] in sources):
+            _drop_input(manifest, path, duplicates, store)
+            print(f"  - {path} artık yok; haberleri veri setinden çıkarıldı.")
+
+    added = Counter()
+    category_counts = Counter()
+    for path, source_name, kind in inputs:
+        try:
+            status, start = manifest.check(path)
+            if status == 'unchanged':
+                manifest.touch(path)
+                continue
+            if status == 'changed':
+                _drop_input(manifest, path, duplicates, store)
+
+            chunks, end = read_input(path, start, chunksize)
+            # Her girdi kendi adlı dosyalarını yazar; değişen girdinin dosyaları ayrıca silinebilir
+            input_id = hashlib.sha1(path.encode('utf-8')).hexdigest()[:10]
+            part = manifest.inputs.get(path, {}).get('parts', 0)
+            files = []
+            total = 0
+            for chunk in chunks:
+                # Kaynak bilgisini kontrol et, yoksa ekle
+                if 'source' not in chunk.columns:
+                    chunk['source'] = source_name
+                chunk = add_fingerprints(chunk)
+                if duplicates is not None:
+                    chunk = drop_near_duplicates(chunk, duplicates)
+                files += append_files(chunk, 'all_news', RAW_PARTITIONS, f'{input_id}-{part:05d}-{len(files)}-{{i}}.parquet', RAW_COLUMNS)
+                store.add(chunk, replace=True)
+                total += len(chunk)
+                added.update(chunk['source'])
+                category_counts.update(chunk['category'])
+            manifest.record(path, end, files, total, source=source_name, kind=kind)
+            state = {'new': 'yeni', 'appended': 'sonuna eklenmiş', 'changed': 'değişmiş'}[status]
+            print(f"  - {os.path.basename(path)} ({source_name}, {state}): {total} haber eklendi.")
+        except Exception as e:
+            print(f"  ! {path} dosyası okunurken hata oluştu: {str(e)}")
+
+    # Önce kayıt, sonra kopya dizini: kayıttan sonra yarıda kalırsa yalnızca bazı kopyalar kaçabilir
+    manifest.save()
+    store.close()
+    if duplicates is not None:
+        duplicates.save(DEDUP_INDEX_PATH)
+        if duplicates.duplicates:
+            duplicates.save_report(DUPLICATES_REPORT, append=True)
+
+    output_file = dataset_path('all_news')
+    if not manifest.rows():
+        print("Error: Hiçbir veri okunamadı!")
+        return
+
+    print(f"{sum(added.values())} yeni haber eklendi; birleşik veri setinde toplam {count_rows('all_news')} haber var.")
+    if added:
+        print("Eklenen haberlerin kategori dağılımı:")
+        print(pd.Series(category_counts).sort_values(ascending=False))
+
+    print(f"\nBirleştirilmiş veri seti {output_file} konumuna kaydedildi!")
+
+    # Kaynak dağılımını göster (yalnızca bölüm sütunu okunur)
+    print("Kaynak dağılımı:")
+    print(read_dataset('all_news', columns=['source'])['source'].value_counts())
+
+    return output_file
+
+def _drop_input(manifest, path, duplicates, store):
+    """Girdinin veri setindeki dosyalarını, depodaki ve kopya dizinindeki haberlerini siler"""
+    files = manifest.inputs.get(path, {}).get('files', [])
+    if files:
+        urls = read_files('all_news', files, columns=['url'])['url'].astype(str)
+        store.remove(urls)
+        if duplicates is not None:
+            duplicates.remove(urls)
+    delete_files('all_news', manifest.forget(path))
+
+def _combine_csv(inputs, chunksize, dedup_threshold, store):
+    """pyarrow yoksa: tüm girdileri baştan okuyup tek CSV veri seti (ve depoyu) yazar"""
+    store.clear()
+    writer = DatasetWriter('all_news', RAW_PARTITIONS)
+    source_counts = Counter()
+    category_counts = Counter()
+    duplicates = NearDuplicateIndex(threshold=dedup_threshold) if dedup_threshold is not None else None
+
+    for path, source_name, _ in inputs:
         try:
-            df = pd.read_csv(file, encoding='utf-8')
-            source_name = os.path.basename(file).replace('_news_dataset.csv', '')
-            print(f"  - {source_name} veri seti okunuyor: {len(df)} haber bulundu.")
-            
-            # Kaynak bilgisini kontrol et, yoksa ekle
-            if 'source' not in df.columns:
-                df['source'] = source_name
-                
-            all_data.append(df)
+            total = 0
+            for chunk in read_input(path, chunksize=chunksize)[0]:
+                if 'source' not in chunk.columns:
+                    chunk['source'] = source_name
+                chunk = add_fingerprints(chunk)
+                if duplicates is not None:
+                    chunk = drop_near_duplicates(chunk, duplicates)
+                writer.write(chunk)
+                store.add(chunk, replace=True)
+                source_counts.update(chunk['source'])
+                category_counts.update(chunk['category'])
+                total += len(chunk)
+            print(f"  - {os.path.basename(path)} okunuyor: {total} haber bulundu.")
         except Exception as e:
-            print(f"  ! {file} dosyası okunurken hata oluştu: {str(e)}")
-    
-    if not all_data:
+            print(f"  ! {path} dosyası okunurken hata oluştu: {str(e)}")
+
+    if not source_counts:
         print("Error: Hiçbir veri okunamadı!")
         return
-    
-    # Tüm verileri birleştir
-    combined_df = pd.concat(all_data, ignore_index=True)
-    
-    # Kategorilere göre düzenle
-    print(f"Toplam {len(combined_df)} haber birleştirildi.")
+
+    output_file = writer.close()
+    if duplicates is not None:
+        duplicates.save_report(DUPLICATES_REPORT)
+
+    print(f"Toplam {sum(source_counts.values())} haber birleştirildi.")
     print("Kategori dağılımı:")
-    print(combined_df['category'].value_counts())
-    
-    # Veri setini kaydet
-    output_file = 'data/raw/all_news_dataset.csv'
-    combined_df.to_csv(output_file, index=False, encoding='utf-8')
-    print(f"\nBirleştirilmiş veri seti {output_file} dosyasına kaydedildi!")
-    
-    # Kaynak dağılımını göster
+    print(pd.Series(category_counts).sort_values(ascending=False))
+    print(f"\nBirleştirilmiş veri seti {output_file} konumuna kaydedildi!")
     print("Kaynak dağılımı:")
-    print(combined_df['source'].value_counts())
-    
-    return combined_df
+    print(pd.Series(source_counts).sort_values(ascending=False))
+    return output_file
 
 if __name__ == "__main__":
-    # Veri setlerini birleştir
-    combine_news_datasets() 
\ No newline at end of file
+    # Veri setlerini birleştir (yalnızca yeni veya değişmiş girdiler okunur)
+    combine_news_datasets()
@@ -1,157 +1,195 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from datetime import datetime
-import time
-import random
 import os
-import re
+from contextlib import closing
 
-def get_ntv_news(target_per_category=200):
+from scraper_common import NewsCollector
+from http_cache import CachePolicy
+from extraction import ExtractionSpec, Extractor
+from discovery import DiscoverySpec
+from crawl_checkpoint import CrawlCheckpoint
+from crawl_metrics import CrawlMetrics
+from fetch_engine import FetchEngine
+from url_canon import unique_urls
+
+BASE_URL = 'https://www.ntv.com.tr'
+
+# Sayfalı listeler (?page=N) sık kaydığı için kısa, haber sayfaları için sınırsız tazelik
+CACHE_POLICY = CachePolicy(listing_ttl=5 * 60)
+
+# Haberler çekilirken önden indirilen liste sayfası sayısı
+PREFETCH_PAGES = 3
+
+
+def extract_news_links(soup):
+    """Liste sayfasındaki haber linklerini çıkarır (sayfadaki sırayı koruyarak)"""
+    # Haber linklerini bul (NTV'ye özel CSS seçicileri)
+    links = soup.select('a.card-text-link, a.card-img-link, .category-item a')
+    
+    if not links:
+        print(f"  ! Bu sayfada haber linki bulunamadı, farklı seçiciler deneniyor...")
+        # Alternatif seçiciler
+        links = soup.find_all('a', href=True)
+        # Sadece haber linklerini filtrele
+        links = [link for link in links if '/haber/' in link.get('href', '')]
+    
+    news_links = []
+    for link in links:
+        news_url = link.get('href')
+        if news_url:
+            # Tam URL oluştur
+            if not news_url.startswith('http'):
+                news_url = BASE_URL + news_url
+            news_links.append(news_url)
+    
+    # Aynı sayfadaki tekrarlanan linkleri kaldır
+    return unique_urls(news_links, BASE_URL)
+
+
+# Site haritası ve kategori RSS beslemeleri (liste sayfalarını indirmeden link bulmak için)
+DISCOVERY_SPEC = DiscoverySpec(
+    BASE_URL,
+    category_feeds={
+        'dunya': [f'{BASE_URL}/dunya.rss'],
+        'ekonomi': [f'{BASE_URL}/ekonomi.rss'],
+        'spor': [f'{BASE_URL}/sporskor.rss'],
+        'egitim': [f'{BASE_URL}/egitim.rss'],
+        'magazin': [f'{BASE_URL}/n-life.rss'],
+        'yasam': [f'{BASE_URL}/yasam.rss']
+    },
+    category_paths={'spor': ['/sporskor/', '/spor/'], 'magazin': ['/n-life/magazin/', '/magazin/']}
+)
+
+# Haber sayfasından başlık ve içerik çıkarma tanımı (seçiciler isabet oranına göre yeniden sıralanır;
+# haber metni eşleşen konteyner içinde metin yoğunluğuna göre seçilir)
+EXTRACTION_SPEC = ExtractionSpec(
+    title_selectors=['h1.category-detail-title, h1.title'],
+    content_selectors=['div.category-detail-content', 'article'],
+    title_meta=None,
+    content_mode='density',
+    min_content_length=100
+)
+
+parse_news = Extractor(EXTRACTION_SPEC)
+
+# NTV kategorileri: kategori -> liste sayfası
+CATEGORIES = {
+    'dunya': 'https://www.ntv.com.tr/dunya',
+    'ekonomi': 'https://www.ntv.com.tr/ekonomi',
+    'spor': 'https://www.ntv.com.tr/sporskor',
+    'egitim': 'https://www.ntv.com.tr/egitim',
+    'magazin': 'https://www.ntv.com.tr/n-life/magazin',
+    'yasam': 'https://www.ntv.com.tr/yasam'
+}
+
+
+def get_ntv_news(target_per_category=200, engine=None, frontier=None, checkpoint=None, use_feeds=True, queue=None, store=None):
     """
     NTV'den haber metinlerini ve kategorilerini çeken fonksiyon
     
     Args:
         target_per_category: Her kategoriden çekilecek hedef haber sayısı
+        engine: Paylaşılan FetchEngine (verilmezse fonksiyon kendi motorunu oluşturur)
+        frontier: Paylaşılan UrlFrontier (kalıcı depolu verilirse önceki çalışmalarda işlenen haberler atlanır)
+        checkpoint: CrawlCheckpoint; verilirse tarama adım adım kaydedilir ve yarıda kalan tarama kaldığı yerden sürer
+        use_feeds: True ise haber linkleri önce site haritası ve RSS beslemelerinden alınır;
+            hedefe ulaşılamayan kategorilerde liste sayfaları taranır
+        queue: Paylaşılan tarama kuyruğu (WorkQueue / RemoteWorkQueue); verilirse haber linkleri kuyruktan
+            kiralanarak çekilir ve aynı kaynak birden fazla süreç veya makinede birlikte taranabilir
+        store: Haber deposu (ArticleStore); verilirse depoda zaten olan haberler indirilmez,
+            yeni haberler depoya da eklenir
     """
-    # NTV kategorileri
-    categories = {
-        'dunya': 'https://www.ntv.com.tr/dunya',
-        'ekonomi': 'https://www.ntv.com.tr/ekonomi',
-        'spor': 'https://www.ntv.com.tr/sporskor',
-        'egitim': 'https://www.ntv.com.tr/egitim',
-        'magazin': 'https://www.ntv.com.tr/n-life/magazin',
-        'yasam': 'https://www.ntv.com.tr/yasam'
-    }
+    categories = CATEGORIES
     
     # Sayfa numaraları (daha fazla haber için)
     page_numbers = list(range(1, 21))  # 1'den 20'ye kadar sayfalar
     
-    news_data = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    collector = NewsCollector('ntv', parse_news, target_per_category, engine=engine, cache_policy=CACHE_POLICY, frontier=frontier, checkpoint=checkpoint, queue=queue, store=store)
     
-    for category, base_url in categories.items():
-        print(f"{category.capitalize()} kategorisinden haberler çekiliyor...")
-        category_count = 0
+    try:
+        # Tüm kategoriler için haber linklerini site haritası / RSS üzerinden topla
+        feed_links = collector.discover_links(DISCOVERY_SPEC, categories) if use_feeds else {}
         
-        for page in page_numbers:
-            # Hedef sayıya ulaşıldıysa bu kategoriyi atla
-            if category_count >= target_per_category:
-                print(f"  - {category} kategorisi için hedef sayıya ({target_per_category}) ulaşıldı.")
-                break
-                
-            # Sayfa URL'sini oluştur
-            if page == 1:
-                url = base_url
-            else:
-                url = f"{base_url}?page={page}"
-                
+        for category, base_url in categories.items():
+            # Önceki çalışmada tamamlanan kategorileri atla
+            if collector.is_finished(category):
+                print(f"{category.capitalize()} kategorisi önceki çalışmada tamamlanmış ({collector.count(category)} haber), atlanıyor.")
+                continue
+            
+            print(f"{category.capitalize()} kategorisinden haberler çekiliyor...")
+            
+            # Yarıda kalan linkler varsa önce onları tamamla
             try:
-                # Her istek arasında rastgele bekleme süresi
-                time.sleep(random.uniform(1, 3))
-                
-                print(f"  - Sayfa {page} inceleniyor: {url}")
-                response = requests.get(url, headers=headers)
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Haber linklerini bul (NTV'ye özel CSS seçicileri)
-                news_links = soup.select('a.card-text-link, a.card-img-link, .category-item a')
-                
-                if not news_links:
-                    print(f"  ! Bu sayfada haber linki bulunamadı, farklı seçiciler deneniyor...")
-                    # Alternatif seçiciler
-                    news_links = soup.find_all('a', href=True)
-                    # Sadece haber linklerini filtrele
-                    news_links = [link for link in news_links if '/haber/' in link.get('href', '')]
-                
-                print(f"  - {len(news_links)} adet haber linki bulundu.")
-                
-                # Bu sayfada hiç link bulunamadıysa sonraki sayfaya geç
-                if not news_links:
-                    print("  ! Bu sayfada haber linki bulunamadı, sonraki sayfaya geçiliyor.")
-                    continue
-                
-                for link in news_links:
-                    # Hedef sayıya ulaşıldıysa döngüyü kır
-                    if category_count >= target_per_category:
+                collector.resume_pending(category)
+            except Exception as e:
+                print(f"! {category} kategorisinin yarım kalan linkleri çekilirken hata oluştu: {str(e)}")
+            
+            # Site haritası / RSS linklerini çek (hedefe ulaşılırsa sayfalar taranmaz)
+            if feed_links.get(category):
+                print(f"  - Site haritası/RSS: {len(feed_links[category])} adet haber linki")
+                try:
+                    collector.fetch_news(feed_links[category], category)
+                except Exception as e:
+                    print(f"! {category} kategorisinin site haritası/RSS linkleri çekilirken hata oluştu: {str(e)}")
+            
+            # Liste sayfaları önden indirilir: bir sayfanın haberleri çekilirken sonraki sayfalar iner
+            page_urls = [base_url if page == 1 else f"{base_url}?page={page}" for page in page_numbers]
+            seen_links = set()
+            with closing(collector.prefetch_pages(page_urls, prefetch=PREFETCH_PAGES)) as pages:
+                for page, (url, soup, error) in zip(page_numbers, pages):
+                    # Hedef sayıya ulaşıldıysa bu kategoriyi atla (önden indirilen sayfalar iptal edilir)
+                    if collector.is_done(category):
+                        print(f"  - {category} kategorisi için hedef sayıya ({target_per_category}) ulaşıldı.")
                         break
+                    
+                    if error is not None:
+                        print(f"! {category} kategorisi, sayfa {page} çekilirken hata oluştu: {str(error)}")
+                        continue
+                    
+                    try:
+                        print(f"  - Sayfa {page} inceleniyor: {url}")
+                        news_links = extract_news_links(soup)
+                        print(f"  - {len(news_links)} adet haber linki bulundu.")
                         
-                    news_url = link.get('href')
-                    if news_url:
-                        # Tam URL oluştur
-                        if not news_url.startswith('http'):
-                            news_url = 'https://www.ntv.com.tr' + news_url
-                            
-                        # Tekrar eden haberleri kontrol et
-                        if any(item.get('url') == news_url for item in news_data):
-                            continue
-                            
-                        try:
-                            # Her haber isteği arasında rastgele bekleme
-                            time.sleep(random.uniform(0.5, 1.5))
-                            
-                            news_response = requests.get(news_url, headers=headers)
-                            news_soup = BeautifulSoup(news_response.content, 'html.parser')
-                            
-                            # Haber başlığı
-                            title = news_soup.select_one('h1.category-detail-title, h1.title')
-                            title = title.text.strip() if title else "Başlık bulunamadı"
-                            
-                            # Haber metni
-                            content_parts = news_soup.select('div.category-detail-content p, article p')
-                            content = ' '.join([p.text.strip() for p in content_parts]) if content_parts else "İçerik bulunamadı"
-                            
-                            # İçerik çok kısaysa meta açıklamasını kontrol et
-                            if len(content) < 100:
-                                meta_desc = news_soup.find('meta', property='og:description')
-                                if meta_desc:
-                                    content = meta_desc.get('content', content)
-                            
-                            # Metin temizleme
-                            content = re.sub(r'\s+', ' ', content).strip()
-                            
-                            # Başlık ve içerik bulunabildiyse ekle
-                            if title != "Başlık bulunamadı" and content != "İçerik bulunamadı":
-                                news_data.append({
-                                    'category': category,
-                                    'title': title,
-                                    'content': content,
-                                    'url': news_url,
-                                    'source': 'ntv',
-                                    'date': datetime.now().strftime("%Y-%m-%d")
-                                })
-                                category_count += 1
-                                print(f"  - '{title[:50]}...' haberi eklendi. ({category}: {category_count}/{target_per_category})")
-                            else:
-                                print(f"  ! Başlık veya içerik bulunamadı: {news_url}")
-                            
-                        except Exception as e:
-                            print(f"  ! Haber çekilirken hata oluştu: {str(e)}")
-                            continue
-                            
-            except Exception as e:
-                print(f"! {category} kategorisi, sayfa {page} çekilirken hata oluştu: {str(e)}")
-                continue
-                
-        print(f"  = {category} kategorisinden toplam {category_count} haber çekildi.")
+                        # Sayfada yeni link yoksa (boş sayfa veya son sayfanın tekrarı) liste bitmiştir
+                        new_links = [link for link in news_links if link not in seen_links]
+                        if not new_links:
+                            print("  ! Bu sayfada yeni haber linki yok, liste sona erdi.")
+                            break
+                        seen_links.update(new_links)
+                        
+                        collector.fetch_news(new_links, category)
+                                    
+                    except Exception as e:
+                        print(f"! {category} kategorisi, sayfa {page} çekilirken hata oluştu: {str(e)}")
+                        continue
+                    
+            print(f"  = {category} kategorisinden toplam {collector.count(category)} haber çekildi.")
+            collector.finish_category(category)
+    finally:
+        collector.close()
     
-    return pd.DataFrame(news_data)
+    return collector.to_dataframe()
 
 if __name__ == "__main__":
     # Data/raw klasörünü oluştur (yoksa)
     os.makedirs('data/raw', exist_ok=True)
     
-    # Haber verilerini çek
-    df = get_ntv_news(target_per_category=200)
+    # Haber verilerini çek (yarıda kalırsa tekrar çalıştırıldığında kaldığı yerden devam eder)
+    checkpoint = CrawlCheckpoint('ntv')
+    engine = FetchEngine(metrics=CrawlMetrics('ntv'))
+    df = get_ntv_news(target_per_category=200, engine=engine, checkpoint=checkpoint)
+    engine.close()
+    engine.print_stats()
+    
+    # İstek süreleri, aktarılan bayt, ayrıştırma süreleri ve hata sınıfları
+    engine.metrics.save('data/raw/ntv_metrics.json')
     
     # CSV dosyasına kaydet
     if len(df) > 0:
         output_file = 'data/raw/ntv_news_dataset.csv'
         df.to_csv(output_file, index=False, encoding='utf-8')
+        checkpoint.clear()
         print(f"\nVeriler başarıyla {output_file} dosyasına kaydedildi!")
         print(f"Toplam {len(df)} haber çekildi.")
         print(f"Kategori dağılımı:\n{df['category'].value_counts()}")
     else:
-        print("Hiç veri çekilemedi!") 
\ No newline at end of file
+        print("Hiç veri çekilemedi!")
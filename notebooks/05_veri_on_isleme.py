@@ -7,7 +7,6 @@
 # 
 # ## Gerekli Kütüphanelerin Yüklenmesi
 
-import pandas as pd
 import numpy as np
 import re
 import string
@@ -19,6 +18,10 @@ import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+from dataset_store import CLEANED_PARTITIONS, write_dataset
+from article_store import STORE_PATH, ArticleStore
+from news_loader import load_news
+
 # Türkçe NLP işlemleri için gerekli kütüphaneler
 import nltk
 from nltk.corpus import stopwords
@@ -35,8 +38,11 @@ nltk.download('stopwords')
 if not os.path.exists('data/processed'):
     os.makedirs('data/processed')
 
-# Tüm haber veri setini yükleyelim
-df = pd.read_csv('data/raw/all_news_dataset.csv')
+# Tüm haber veri setini yükleyelim: haber deposu doluysa depodan, değilse birleşik veri setinden
+# (birleşik veri seti henüz oluşturulmadıysa eski CSV dosyasından). Kaynak, kategori ve tarih
+# category, metinler Arrow tabanlı string tipinde yüklenir; yükleme sırasındaki en yüksek bellek yazdırılır
+df = load_news()
+store = ArticleStore() if os.path.exists(STORE_PATH) else None
 
 # Sütun isimlerini Türkçeye çevirme
 df = df.rename(columns={
@@ -187,9 +193,14 @@ plt.close()
 
 # ## Temizlenmiş Veri Setini Kaydetme
 
-# Temiz veri setini kaydet
-df_filtered.to_csv('data/processed/news_cleaned.csv', index=False)
-print("\nTemizlenmiş veri seti kaydedildi: 'data/processed/news_cleaned.csv'")
+# Temiz veri setini kaynak / kategori / tarih bölümlerine ayrılmış olarak kaydet
+cleaned_path = write_dataset(df_filtered, 'news_cleaned', CLEANED_PARTITIONS)
+print(f"\nTemizlenmiş veri seti kaydedildi: '{cleaned_path}'")
+
+# Temizlenmiş metinleri depodaki haberlerin yanına da yaz (eğitim aşaması kategori indeksinden okur)
+if store is not None:
+    store.set_cleaned(df_filtered['url'], df_filtered['baslik_temiz'], df_filtered['icerik_temiz'])
+    store.close()
 
 # Özet istatistikler
 print("\nÖzet İstatistikler:")
@@ -7,12 +7,14 @@
 #
 # ## Gerekli Kütüphanelerin Yüklenmesi
 
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
+import json
 import pickle
+from datetime import datetime
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.naive_bayes import MultinomialNB
@@ -23,23 +25,36 @@ from sklearn.pipeline import Pipeline
 import warnings
 warnings.filterwarnings('ignore')
 
+from news_loader import load_cleaned, optimize_dtypes
+from dataset_snapshot import create_snapshot, load_snapshot, snapshot_info
+
 # ## Temizlenmiş Veri Setinin Yüklenmesi
 
 # Klasör kontrolü
 if not os.path.exists('models'):
     os.makedirs('models')
 
-# Temizlenmiş veri setini yükleyelim
-df = pd.read_csv('data/processed/news_cleaned.csv')
-
-# Veri seti hakkında genel bilgiler
-print("Veri seti boyutu:", df.shape)
-print("\nKategori dağılımı:")
-print(df['kategori'].value_counts())
-
 # Sadece ödevde istenen 6 kategoriyi alalım
 istenen_kategoriler = ['dunya', 'ekonomi', 'spor', 'egitim', 'magazin', 'yasam']
-df_filtered = df[df['kategori'].isin(istenen_kategoriler)]
+
+if len(sys.argv) > 1:
+    # Bir veri anlık görüntüsü kimliği verildiyse eğitim o görüntüdeki veriyle tekrarlanır
+    snapshot_id = snapshot_info(sys.argv[1])['id']
+    df_filtered = optimize_dtypes(load_snapshot(snapshot_id, columns=['url', 'kategori', 'metin']))
+    print(f"  - Veri anlık görüntüsü {snapshot_id} yüklendi: {len(df_filtered)} satır")
+else:
+    # Yalnızca bu kategorileri ve modelde kullanılan sütunları okuyalım: haber deposunda ön işleme
+    # sonuçları varsa kategori indeksinden, yoksa temizlenmiş veri setinin ilgili bölümlerinden.
+    # Başlık ve içerik okunurken parça parça tek 'metin' sütununda birleştirilir (ayrı kopyaları tutulmaz)
+    df_filtered = load_cleaned(['url', 'kategori'], istenen_kategoriler, text_column='metin')
+    # Eğitim verisinin değişmez anlık görüntüsü (yalnızca değişen parçalar yazılır); modeller bu kimliği kaydeder
+    snapshot_id = create_snapshot(df_filtered, key='url', label='news_cleaned: ' + ', '.join(istenen_kategoriler))
+
+# Satırlar URL sırasına dizilir: aynı görüntüden yapılan eğitimlerde eğitim/test ayrımı da aynı olur
+df_filtered = df_filtered.sort_values('url', kind='stable', ignore_index=True)
+
+# Veri seti hakkında genel bilgiler (eğitimde kullanılan veri: yüklenen veya tekrarlanan görüntü)
+print("Veri seti boyutu:", len(df_filtered))
 
 print("\nFiltreleme sonrası kategori dağılımı:")
 print(df_filtered['kategori'].value_counts())
@@ -47,9 +62,6 @@ print("\nFiltreleme sonrası veri boyutu:", df_filtered.shape)
 
 # ## Veri Setinin Eğitim ve Test Olarak Ayrılması
 
-# İçerik ve başlıkları birleştirme (opsiyonel)
-df_filtered['metin'] = df_filtered['baslik_temiz'] + ' ' + df_filtered['icerik_temiz']
-
 # Özellikler ve hedef değişkenin belirlenmesi
 X = df_filtered['metin']  # Başlık ve içerik birleştirilmiş olarak
 y = df_filtered['kategori']
@@ -70,8 +82,8 @@ count_vectorizer = CountVectorizer(max_features=5000, ngram_range=(1, 2), min_df
 
 # ## Model Oluşturma ve Değerlendirme
 
-def model_egit_degerlendir(model_ismi, model, vektorlestirici, X_train, X_test, y_train, y_test):
-    """Modeli eğitir ve performansını değerlendirir"""
+def model_egit_degerlendir(model_ismi, model, vektorlestirici, X_train, X_test, y_train, y_test, snapshot_id=None):
+    """Modeli eğitir, performansını değerlendirir; modeli ve eğitildiği veri anlık görüntüsünü kaydeder"""
     
     # Pipeline oluşturma
     pipeline = Pipeline([
@@ -110,6 +122,16 @@ def model_egit_degerlendir(model_ismi, model, vektorlestirici, X_train, X_test,
     with open(f'models/{model_ismi.lower().replace(" ", "_")}_model.pkl', 'wb') as f:
         pickle.dump(pipeline, f)
     
+    # Modelin hangi veriyle eğitildiğini yanına yaz (dataset_snapshot.load_snapshot ile aynı veri yüklenebilir)
+    with open(f'models/{model_ismi.lower().replace(" ", "_")}_model.json', 'w', encoding='utf-8') as f:
+        json.dump({
+            'snapshot': snapshot_id,
+            'accuracy': accuracy,
+            'train_rows': len(X_train),
+            'test_rows': len(X_test),
+            'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }, f, ensure_ascii=False, indent=1)
+    
     return pipeline, accuracy
 
 # Modelleri tanımlama
@@ -128,7 +150,8 @@ for model_name, model in models.items():
         f"TF-IDF {model_name}", 
         model, 
         tfidf_vectorizer, 
-        X_train, X_test, y_train, y_test
+        X_train, X_test, y_train, y_test,
+        snapshot_id=snapshot_id
     )
     tfidf_results[model_name] = accuracy
 
@@ -141,7 +164,8 @@ for model_name, model in models.items():
         f"Count {model_name}", 
         model, 
         count_vectorizer, 
-        X_train, X_test, y_train, y_test
+        X_train, X_test, y_train, y_test,
+        snapshot_id=snapshot_id
     )
     count_results[model_name] = accuracy
 
@@ -7,16 +7,19 @@
 # 
 # ## Gerekli Kütüphanelerin Yüklenmesi
 
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import json
 import pickle
 from sklearn.metrics import confusion_matrix, classification_report, accuracy_score
 import warnings
 warnings.filterwarnings('ignore')
 
+from dataset_store import count_rows
+from news_loader import load_cleaned
+
 # Görsel ayarları
 plt.style.use('ggplot')
 plt.rcParams['figure.figsize'] = (12, 8)
@@ -28,18 +31,19 @@ plt.rcParams['font.size'] = 12
 if not os.path.exists('reports'):
     os.makedirs('reports')
 
-# Temizlenmiş veri setini yükleyelim
-df = pd.read_csv('data/processed/news_cleaned.csv')
-
-# Sadece ödevde istenen 6 kategoriyi alalım
+# Sadece ödevde istenen 6 kategoriyi alalım; haber deposundan (yoksa temizlenmiş veri setinden)
+# yalnızca bu kategoriler ve raporda kullanılan sütunlar okunur
 istenen_kategoriler = ['dunya', 'ekonomi', 'spor', 'egitim', 'magazin', 'yasam']
-df_filtered = df[df['kategori'].isin(istenen_kategoriler)]
+df_filtered = load_cleaned(['kategori', 'kaynak', 'baslik_temiz', 'icerik_temiz'], istenen_kategoriler)
+
+# Toplam haber sayısı dosya üst verilerinden okunur
+toplam_haber = count_rows('news_cleaned', csv_path='data/processed/news_cleaned.csv')
 
 # ## 1. Veri Seti Özeti
 
 print("## HABER METİNLERİ KATEGORİZASYONU - SONUÇ RAPORU ##")
 print("\n1. VERİ SETİ ÖZETİ")
-print(f"Toplam haber sayısı: {df.shape[0]}")
+print(f"Toplam haber sayısı: {toplam_haber}")
 print(f"Filtrelenmiş haber sayısı (6 kategori): {df_filtered.shape[0]}")
 print("\nKategori dağılımı:")
 kategori_dagilimi = df_filtered['kategori'].value_counts()
@@ -180,7 +184,7 @@ print("4. Hibrit model yaklaşımları")
 print("\n5. SONUÇ VE GELECEK ÇALIŞMALAR")
 
 print("\nProje sonuçları:")
-print(f"- Web kazıma yöntemiyle {df.shape[0]} haber metni elde edildi")
+print(f"- Web kazıma yöntemiyle {toplam_haber} haber metni elde edildi")
 print("- 6 farklı kategori için sınıflandırma yapıldı")
 print(f"- En iyi model {best_accuracy:.2%} doğruluk oranı sağladı")
 print("- Bazı kategorilerde daha yüksek başarı (Spor: %95)")
@@ -201,6 +205,11 @@ best_model_path = 'models/count_naive_bayes_model.pkl'
 with open(best_model_path, 'rb') as f:
     model = pickle.load(f)
 
+# Modelin eğitildiği veri anlık görüntüsü (06 tarafından modelin yanına yazılır)
+if os.path.exists(best_model_path.replace('.pkl', '.json')):
+    with open(best_model_path.replace('.pkl', '.json'), 'r', encoding='utf-8') as f:
+        print(f"Model {json.load(f)['snapshot']} veri anlık görüntüsüyle eğitildi.")
+
 # Örnek haberler
 ornek_haberler = [
     "Fenerbahçe, Galatasaray'ı 3-0 yenerek şampiyonluk yolunda önemli bir adım attı.",
@@ -246,7 +255,7 @@ html_report = """
         <h2>1. Veri Seti Özeti</h2>
         <p>Bu projede web kazıma yöntemiyle farklı haber sitelerinden toplanan haber metinleri kullanılmıştır.</p>
         <ul>
-            <li>Toplam haber sayısı: """ + str(df.shape[0]) + """</li>
+            <li>Toplam haber sayısı: """ + str(toplam_haber) + """</li>
             <li>Filtrelenmiş haber sayısı (6 kategori): """ + str(df_filtered.shape[0]) + """</li>
             <li>Kategoriler: Dünya, Ekonomi, Spor, Eğitim, Magazin, Yaşam</li>
         </ul>
@@ -325,7 +334,7 @@ html_report = """
         <div class="conclusion">
             <h3>Proje Sonuçları:</h3>
             <ul>
-                <li>Web kazıma yöntemiyle """ + str(df.shape[0]) + """ haber metni elde edildi</li>
+                <li>Web kazıma yöntemiyle """ + str(toplam_haber) + """ haber metni elde edildi</li>
                 <li>6 farklı kategori için sınıflandırma yapıldı</li>
                 <li>En iyi model """ + f"{best_accuracy:.2%}" + """ doğruluk oranı sağladı</li>
                 <li>Bazı kategorilerde daha yüksek başarı (Spor: %95)</li>
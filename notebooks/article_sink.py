@@ -0,0 +1,127 @@
+import glob
+import json
+import os
+import shutil
+import threading
+
+import pandas as pd
+
+# Kaynakların haber akışlarının ana klasörü (data/stream/<kaynak>/part-00000.jsonl ...)
+STREAM_DIR = 'data/stream'
+
+
+class ArticleSink:
+    """
+    Çıkarılan haberlerin yazıldığı, yalnızca sona ekleyen parçalı JSONL akışı
+
+    Her haber çıkarıldığı anda bir satır olarak yazılır ve dosyaya aktarılır;
+    bellekte haber tutulmaz. Bir parça `chunk_size` satıra ulaşınca yeni bir
+    parça dosyasına geçilir. Var olan parçalara hiç dokunulmaz, bu yüzden
+    tarama sürerken `iter_articles` / `read_articles` ile o ana kadar yazılan
+    haberler okunabilir.
+
+    Args:
+        directory: Parça dosyalarının yazılacağı klasör
+        chunk_size: Bir parça dosyasındaki en fazla haber sayısı
+        reset: True ise klasördeki eski parçalar silinir (False ise yeni parçalarla devam edilir)
+    """
+
+    def __init__(self, directory, chunk_size=1000, reset=False):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        if reset:
+            shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._rows_in_part = 0
+        self._next_part = len(list_parts(directory))
+        self.written = 0
+
+    def _roll(self):
+        """Geçerli parçayı kapatıp yeni bir parça dosyası açar"""
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f'part-{self._next_part:05d}.jsonl')
+        self._file = open(path, 'a', encoding='utf-8')
+        self._next_part += 1
+        self._rows_in_part = 0
+
+    def write(self, article):
+        """Haberi akışa ekler"""
+        line = json.dumps(article, ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None or self._rows_in_part >= self.chunk_size:
+                self._roll()
+            self._file.write(line)
+            self._file.flush()
+            self._rows_in_part += 1
+            self.written += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self):
+        """Akışı kapatır ve tüm parçaları siler"""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def list_parts(directory):
+    """Akıştaki parça dosyalarını yazılma sırasına göre döndürür"""
+    return sorted(glob.glob(os.path.join(directory, 'part-*.jsonl')))
+
+
+def iter_articles(directory):
+    """
+    Akıştaki haberleri tek tek okur (tarama sürerken de kullanılabilir)
+
+    Yazılırken yarıda kalmış son satır atlanır.
+
+    Yields:
+        dict: Haber kaydı
+    """
+    for part in list_parts(directory):
+        with open(part, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def read_articles(directory, chunksize=None):
+    """
+    Akışı DataFrame olarak okur
+
+    Args:
+        directory: Akış klasörü
+        chunksize: Verilirse en fazla bu kadar satırlık DataFrame'ler döndüren bir üreteç döner
+
+    Returns:
+        pd.DataFrame veya DataFrame üreteci
+    """
+    if chunksize is None:
+        return pd.DataFrame(list(iter_articles(directory)))
+    return _read_chunks(directory, chunksize)
+
+
+def _read_chunks(directory, chunksize):
+    rows = []
+    for article in iter_articles(directory):
+        rows.append(article)
+        if len(rows) >= chunksize:
+            yield pd.DataFrame(rows)
+            rows = []
+    if rows:
+        yield pd.DataFrame(rows)
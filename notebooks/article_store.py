@@ -0,0 +1,242 @@
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from url_canon import canonical_url
+
+STORE_PATH = 'data/state/articles.sqlite'
+
+# Ham haber sütunları (veri setleri ve akışlarla aynı adlar)
+ARTICLE_COLUMNS = ['category', 'title', 'content', 'url', 'source', 'date', 'content_hash']
+
+# Ön işleme (05) sütun adları -> depodaki sütunlar
+CLEANED_COLUMNS = {
+    'kategori': 'category',
+    'baslik': 'title',
+    'icerik': 'content',
+    'url': 'url',
+    'kaynak': 'source',
+    'tarih': 'date',
+    'baslik_temiz': 'title_clean',
+    'icerik_temiz': 'content_clean'
+}
+
+# IN (...) sorgularında tek seferde gönderilen en fazla değer
+_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    title TEXT,
+    content TEXT,
+    date TEXT,
+    content_hash TEXT,
+    title_clean TEXT,
+    content_clean TEXT,
+    added REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_hash ON articles (content_hash);
+CREATE INDEX IF NOT EXISTS articles_subset ON articles (source, category, date);
+CREATE INDEX IF NOT EXISTS articles_category ON articles (category, date);
+CREATE INDEX IF NOT EXISTS articles_date ON articles (date);
+"""
+
+
+def _where(source=None, category=None, since=None, until=None, cleaned=False):
+    """Filtreleri SQL koşuluna çevirir; kaynak ve kategori tek değer veya liste olabilir"""
+    clauses, params = [], []
+    for column, value in (('source', source), ('category', category)):
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            clauses.append(f'{column} = ?')
+            params.append(value)
+    if since is not None:
+        clauses.append('date >= ?')
+        params.append(since)
+    if until is not None:
+        clauses.append('date <= ?')
+        params.append(until)
+    if cleaned:
+        clauses.append('content_clean IS NOT NULL')
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+class ArticleStore:
+    """
+    SQLite tabanlı, sunucusuz haber deposu
+
+    Haberler standart URL'leriyle tek tabloda tutulur; URL, içerik özeti
+    (content_hash), kaynak, kategori ve tarih sütunları indekslidir. Böylece
+    "bu haber zaten var mı?" sorusu ve kaynak / kategori / tarih alt kümelerinin
+    seçimi tüm veriyi okumadan indeksten yanıtlanır. Toplama betikleri haberleri
+    toplu olarak ekler (`add`), ön işleme ve eğitim aşamaları haberleri parça
+    parça okur (`iter_articles`); ön işlemenin temizlenmiş metinleri de aynı
+    satırlarda saklanır (`set_cleaned`).
+
+    Aynı makinedeki süreçler dosyayı birlikte kullanabilir (WAL kipi).
+
+    Args:
+        path: SQLite dosyası
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(_SCHEMA)
+
+    def _transaction(self, statements):
+        """Sorguları tek bir yazma işleminde (BEGIN IMMEDIATE) çalıştırır"""
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                result = statements(self._db)
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+            return result
+
+    def add(self, articles, replace=False):
+        """
+        Haberleri toplu olarak ekler
+
+        Args:
+            articles: Haber sözlükleri veya DataFrame (ARTICLE_COLUMNS sütunları)
+            replace: True ise depoda olan haberler yenileriyle değiştirilir (False ise atlanır)
+
+        Returns:
+            Eklenen (veya değiştirilen) haber sayısı
+        """
+        if isinstance(articles, pd.DataFrame):
+            articles = articles.reindex(columns=ARTICLE_COLUMNS)
+            articles = articles.astype(object).where(articles.notna(), None).to_dict('records')
+        now = time.time()
+        rows = [(canonical_url(article['url']), article.get('source'), article.get('category'), article.get('title'),
+                 article.get('content'), article.get('date'), article.get('content_hash'), now)
+                for article in articles if article.get('url')]
+        verb = 'INSERT OR REPLACE' if replace else 'INSERT OR IGNORE'
+
+        def insert(db):
+            before = db.total_changes
+            db.executemany(f'{verb} INTO articles (url, source, category, title, content, date, content_hash, added) '
+                           'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            return db.total_changes - before
+
+        return self._transaction(insert) if rows else 0
+
+    def remove(self, urls):
+        """Haberleri depodan siler"""
+        urls = [(canonical_url(url),) for url in urls]
+        if urls:
+            self._transaction(lambda db: db.executemany('DELETE FROM articles WHERE url = ?', urls))
+
+    def clear(self):
+        """Depodaki tüm haberleri siler"""
+        self._transaction(lambda db: db.execute('DELETE FROM articles'))
+
+    def has(self, url):
+        """Haber depoda var mı"""
+        with self._lock:
+            return self._db.execute('SELECT 1 FROM articles WHERE url = ?', (canonical_url(url),)).fetchone() is not None
+
+    def stored(self, urls):
+        """
+        Verilen URL'lerden depoda olanlar
+
+        Returns:
+            set: Depoda olan URL'lerin standart biçimleri
+        """
+        urls = list({canonical_url(url) for url in urls})
+        found = set()
+        with self._lock:
+            for start in range(0, len(urls), _BATCH):
+                batch = urls[start:start + _BATCH]
+                rows = self._db.execute(f"SELECT url FROM articles WHERE url IN ({', '.join('?' * len(batch))})", batch)
+                found.update(url for url, in rows)
+        return found
+
+    def find_hash(self, fingerprint):
+        """İçerik özeti aynı olan haberin URL'si (yoksa None)"""
+        with self._lock:
+            row = self._db.execute('SELECT url FROM articles WHERE content_hash = ? LIMIT 1', (fingerprint,)).fetchone()
+        return row[0] if row else None
+
+    def count(self, source=None, category=None, since=None, until=None, cleaned=False):
+        """Filtreye uyan haber sayısı (tarihler 'YYYY-AA-GG' biçiminde, iki uç dahil)"""
+        where, params = _where(source, category, since, until, cleaned)
+        with self._lock:
+            return self._db.execute(f'SELECT COUNT(*) FROM articles{where}', params).fetchone()[0]
+
+    def iter_articles(self, columns=None, chunksize=1000, source=None, category=None, since=None, until=None, cleaned=False):
+        """
+        Filtreye uyan haberleri parça parça okur
+
+        Args:
+            columns: Okunacak sütunlar (varsayılan: ARTICLE_COLUMNS)
+            chunksize: Parça başına en fazla satır
+            source, category: Tek değer veya liste
+            since, until: Tarih aralığı ('YYYY-AA-GG', iki uç dahil)
+            cleaned: True ise yalnızca ön işlemeden geçmiş haberler
+
+        Yields:
+            pd.DataFrame
+        """
+        columns = list(columns or ARTICLE_COLUMNS)
+        where, params = _where(source, category, since, until, cleaned)
+        # Okuma ayrı bir bağlantıdan yapılır; parçalar işlenirken depoya yazılabilir
+        db = sqlite3.connect(self.path, timeout=60)
+        try:
+            cursor = db.execute(f"SELECT {', '.join(columns)} FROM articles{where} ORDER BY rowid", params)
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                yield pd.DataFrame(rows, columns=columns)
+        finally:
+            db.close()
+
+    def read(self, columns=None, **filters):
+        """Filtreye uyan haberleri tek DataFrame olarak okur (iter_articles ile aynı filtreler)"""
+        chunks = list(self.iter_articles(columns, chunksize=10000, **filters))
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=list(columns or ARTICLE_COLUMNS))
+
+    def set_cleaned(self, urls, titles, contents, reset=True):
+        """
+        Ön işlemenin temizlenmiş başlık ve içeriklerini kaydeder
+
+        Args:
+            reset: True ise önceki ön işlemenin sonuçları silinir (listede olmayan haberler
+                temizlenmemiş sayılır)
+        """
+        rows = [(title, content, canonical_url(url)) for url, title, content in zip(urls, titles, contents)]
+
+        def update(db):
+            if reset:
+                db.execute('UPDATE articles SET title_clean = NULL, content_clean = NULL')
+            db.executemany('UPDATE articles SET title_clean = ?, content_clean = ? WHERE url = ?', rows)
+
+        self._transaction(update)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
@@ -0,0 +1,180 @@
+import copy
+import glob
+import importlib.util
+import json
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from extraction import Extractor
+from html_parsing import DEFAULT_PARSER, declared_charset, make_soup, parse_article, read_head_meta
+
+# Sunucu -> haber sayfasını ayrıştıran kazıyıcı betiği
+SCRAPERS = {
+    'www.cnnturk.com': "notebooks/01_cnn_scrapping.py",
+    'www.ntv.com.tr': "notebooks/04_ntv_scrapping.py",
+    'www.haberturk.com': "notebooks/03_haberturk_scrapping.py",
+    'www.sabah.com.tr': "notebooks/02_sabah_scrapping.py"
+}
+
+
+def import_module_from_file(module_name, file_path):
+    """Belirtilen dosya yolundan bir modül yükler"""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_cached_pages(cache_dir='data/cache/http', limit=200):
+    """
+    Disk önbelleğindeki haber sayfalarını okur
+
+    Returns:
+        list: (url, content_type, body) üçlüleri
+    """
+    pages = []
+    for meta_path in sorted(glob.glob(os.path.join(cache_dir, '*', '*.json'))):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if urlparse(meta['url']).hostname not in SCRAPERS:
+            continue
+        with open(meta_path[:-len('.json')] + '.body', 'rb') as f:
+            body = f.read()
+        pages.append((meta['url'], meta['headers'].get('Content-Type'), body))
+        if len(pages) >= limit:
+            break
+    return pages
+
+
+def benchmark_html_parsing(cache_dir='data/cache/http', limit=200, repeat=3):
+    """
+    Önbellekteki haber sayfalarında eski ayrıştırma yolunu yenisiyle karşılaştırır
+
+    Eski yol: BeautifulSoup(content, 'html.parser') ile tüm sayfa + soup içinden meta
+    Yeni yol: <head> meta akışı + DEFAULT_PARSER ile yalnızca <body> + bildirilen kodlama
+
+    Args:
+        cache_dir: HttpCache klasörü (önce kazıyıcıları önbellek açıkken çalıştırın)
+        limit: Kullanılacak en fazla sayfa sayısı
+        repeat: Her yolun kaç kez tekrarlanacağı (en iyi süre alınır)
+    """
+    pages = load_cached_pages(cache_dir, limit)
+    if not pages:
+        print(f"Error: {cache_dir} altında haber sayfası bulunamadı!")
+        return
+
+    parsers = {}
+    for url, _, _ in pages:
+        host = urlparse(url).hostname
+        if host not in parsers:
+            module = import_module_from_file(f"benchmark_{host.split('.')[1]}", SCRAPERS[host])
+            parsers[host] = module.parse_news
+
+    def old_path(url, content_type, body):
+        return parsers[urlparse(url).hostname](BeautifulSoup(body, 'html.parser'))
+
+    def new_path(url, content_type, body):
+        return parse_article(body, parsers[urlparse(url).hostname], DEFAULT_PARSER, content_type)
+
+    results = {}
+    timings = {}
+    for name, path in [('html.parser (eski)', old_path), (f'{DEFAULT_PARSER} + head meta (yeni)', new_path)]:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs = [path(*page) for page in pages]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = outputs
+        timings[name] = best
+
+    print(f"{len(pages)} sayfa, {sum(len(body) for _, _, body in pages) / 1024 / 1024:.1f} MB")
+    baseline = None
+    for name, elapsed in timings.items():
+        baseline = baseline or elapsed
+        print(f"  - {name}: {elapsed:.2f} sn ({elapsed / len(pages) * 1000:.1f} ms/sayfa, {baseline / elapsed:.2f}x)")
+
+    old_outputs, new_outputs = results.values()
+    same = sum(1 for old, new in zip(old_outputs, new_outputs) if old == new)
+    print(f"  - Aynı (başlık, içerik) sonucu: {same}/{len(pages)}")
+    for (url, _, _), old, new in zip(pages, old_outputs, new_outputs):
+        if old != new:
+            print(f"  ! Farklı sonuç: {url}")
+
+    return timings
+
+
+def benchmark_extraction(cache_dir='data/cache/http', limit=200, repeat=3):
+    """
+    Önbellekteki haber sayfalarında seçici tabanlı içerik çıkarmayı metin yoğunluğu motoruyla karşılaştırır
+
+    Her kaynağın EXTRACTION_SPEC'i iki şekilde çalıştırılır: 'container' (ilk eşleşen
+    konteynerdeki tüm paragraf/liste metinleri) ve 'density' (main_content). Sayfalar
+    önceden ayrıştırılır; ölçülen süre yalnızca başlık/içerik çıkarmadır.
+
+    Args:
+        cache_dir: HttpCache klasörü (önce kazıyıcıları önbellek açıkken çalıştırın)
+        limit: Kullanılacak en fazla sayfa sayısı
+        repeat: Her yolun kaç kez tekrarlanacağı (en iyi süre alınır)
+    """
+    pages = load_cached_pages(cache_dir, limit)
+    if not pages:
+        print(f"Error: {cache_dir} altında haber sayfası bulunamadı!")
+        return
+
+    specs = {}
+    for url, _, _ in pages:
+        host = urlparse(url).hostname
+        if host not in specs:
+            module = import_module_from_file(f"benchmark_{host.split('.')[1]}", SCRAPERS[host])
+            specs[host] = module.EXTRACTION_SPEC
+
+    documents = []
+    for url, content_type, body in pages:
+        encoding = declared_charset(body, content_type)
+        documents.append((urlparse(url).hostname, make_soup(body, encoding=encoding, body_only=True),
+                          read_head_meta(body, encoding)))
+
+    results = {}
+    timings = {}
+    for name, mode in [('seçici konteyner (eski)', 'container'), ('metin yoğunluğu (yeni)', 'density')]:
+        extractors = {}
+        for host, spec in specs.items():
+            spec = copy.copy(spec)
+            spec.content_mode = mode
+            extractors[host] = Extractor(spec)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs = [extractors[host](soup, meta) for host, soup, meta in documents]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = outputs
+        timings[name] = best
+
+    print(f"{len(pages)} sayfa")
+    baseline = None
+    for name, elapsed in timings.items():
+        baseline = baseline or elapsed
+        lengths = [len(content or '') for _, content in results[name]]
+        print(f"  - {name}: {elapsed:.2f} sn ({elapsed / len(pages) * 1000:.1f} ms/sayfa, {baseline / elapsed:.2f}x), "
+              f"ortalama içerik {sum(lengths) / len(lengths):.0f} karakter, toplam {sum(lengths) / 1024:.0f} KB")
+
+    old_outputs, new_outputs = results.values()
+    empty = sum(1 for _, content in new_outputs if not content)
+    shorter = sum(1 for (_, old), (_, new) in zip(old_outputs, new_outputs) if len(new or '') < len(old or ''))
+    print(f"  - Yoğunluk motorunun kısalttığı içerik: {shorter}/{len(pages)}, boş kalan: {empty}")
+
+    return timings
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'extraction':
+        benchmark_extraction()
+    else:
+        benchmark_html_parsing()
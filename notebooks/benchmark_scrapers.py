@@ -0,0 +1,151 @@
+import hashlib
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from crawl_checkpoint import CrawlCheckpoint
+from fetch_engine import FetchEngine
+from http_archive import ARCHIVE_DIR, ArchiveWriter, ReplayAdapter
+from http_client import HttpClient
+from rate_limiter import HostRateLimiter
+
+# Kaynak adı -> (kazıyıcı betiği, toplama fonksiyonu)
+SCRAPERS = {
+    'cnnturk': ("notebooks/01_cnn_scrapping.py", 'get_cnn_news'),
+    'ntv': ("notebooks/04_ntv_scrapping.py", 'get_ntv_news'),
+    'haberturk': ("notebooks/03_haberturk_scrapping.py", 'get_haberturk_news'),
+    'sabah': ("notebooks/02_sabah_scrapping.py", 'get_sabah_news')
+}
+
+
+def import_module_from_file(module_name, file_path):
+    """Belirtilen dosya yolundan bir modül yükler"""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def archive_path(source, archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, f'{source}.warc.gz')
+
+
+def run_scraper(source, client, target_per_category, limiter=None, max_workers=16, per_host=4, quiet=True):
+    """
+    Kazıyıcıyı verilen istemciyle geçici bir akış klasöründe çalıştırır
+
+    data/stream ve data/checkpoints altındaki gerçek taramalara dokunulmaz.
+    max_workers=1 ve per_host=1 ile istekler her çalıştırmada aynı sırayla tamamlanır.
+
+    Returns:
+        (DataFrame, süre - saniye)
+    """
+    script, function_name = SCRAPERS[source]
+    module = import_module_from_file(f"benchmark_{source}_scrapping", script)
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine = FetchEngine(max_workers=max_workers, per_host=per_host, client=client, limiter=limiter)
+        checkpoint = CrawlCheckpoint(source, checkpoint_dir=work_dir, stream_dir=work_dir)
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, redirect_stdout(devnull if quiet else sys.stdout):
+            start = time.perf_counter()
+            try:
+                df = getattr(module, function_name)(target_per_category=target_per_category, engine=engine, checkpoint=checkpoint)
+            finally:
+                engine.close()
+            elapsed = time.perf_counter() - start
+    return df, elapsed
+
+
+def output_fingerprint(df):
+    """Çıkan haberlerin sıradan bağımsız özeti (iki çalıştırmanın aynı sonucu verip vermediğini gösterir)"""
+    rows = sorted(f"{row.url}\t{row.content_hash}" for row in df.itertuples()) if len(df) else []
+    return hashlib.sha1('\n'.join(rows).encode('utf-8')).hexdigest()[:12]
+
+
+def record_scrapers(target_per_category=20, sources=None, archive_dir=ARCHIVE_DIR):
+    """
+    Kazıyıcıları canlı sitelere karşı çalıştırıp indirilen tüm yanıtları arşive kaydeder
+
+    Önbellek kapalıdır; böylece kazıyıcının ihtiyaç duyduğu her sayfa arşive girer.
+    Varolan arşivlerin üzerine yazılır.
+
+    Args:
+        target_per_category: Her kategoriden çekilecek hedef haber sayısı
+        sources: Kaydedilecek kaynaklar (varsayılan: SCRAPERS içindeki tüm kaynaklar)
+        archive_dir: Arşiv klasörü (kaynak başına <kaynak>.warc.gz)
+    """
+    for source in sources or SCRAPERS:
+        path = archive_path(source, archive_dir)
+        if os.path.exists(path):
+            os.remove(path)
+        with ArchiveWriter(path) as archive:
+            client = HttpClient(cache=None, archive=archive)
+            try:
+                df, elapsed = run_scraper(source, client, target_per_category)
+            finally:
+                client.close()
+        print(f"  - {source}: {len(df)} haber, {archive.records} yanıt kaydedildi "
+              f"({os.path.getsize(path) / 1024 / 1024:.1f} MB, {elapsed:.1f} sn) -> {path}")
+
+
+def benchmark_replay(target_per_category=20, sources=None, archive_dir=ARCHIVE_DIR, repeat=3):
+    """
+    Kazıyıcıları kayıtlı arşivden, ağa hiç çıkmadan ve hız sınırı olmadan çalıştırıp ölçer
+
+    Ağ gecikmesi olmadığı için istekler tek iş parçacığıyla sırayla yanıtlanır; böylece
+    aynı arşiv ve aynı hedefle her çalıştırma aynı haberleri üretir. Ölçülen süre
+    kazıyıcının kendi işidir (link çıkarma, ayrıştırma, tekilleştirme, yazma). Çıktı
+    özeti tekrarlar arasında değişirse uyarı verilir.
+
+    Args:
+        target_per_category: Kayıt sırasında kullanılan hedef haber sayısı
+        sources: Ölçülecek kaynaklar (varsayılan: arşivi bulunan tüm kaynaklar)
+        archive_dir: Arşiv klasörü
+        repeat: Her kaynağın kaç kez çalıştırılacağı (en iyi süre alınır)
+
+    Returns:
+        dict: kaynak -> {'articles', 'seconds', 'articles_per_second', 'fingerprint'}
+    """
+    results = {}
+    for source in sources or SCRAPERS:
+        path = archive_path(source, archive_dir)
+        if not os.path.exists(path):
+            print(f"  ! {source}: arşiv bulunamadı ({path}), önce record_scrapers() çalıştırın")
+            continue
+
+        replay = ReplayAdapter(path)
+        best = None
+        fingerprints = set()
+        for _ in range(repeat):
+            client = HttpClient(cache=None, replay=replay)
+            limiter = HostRateLimiter(initial_rate=1e6, max_rate=1e6, burst=1e6)
+            try:
+                df, elapsed = run_scraper(source, client, target_per_category, limiter=limiter, max_workers=1, per_host=1)
+            finally:
+                client.close()
+            fingerprints.add(output_fingerprint(df))
+            best = elapsed if best is None else min(best, elapsed)
+
+        results[source] = {
+            'articles': len(df),
+            'seconds': best,
+            'articles_per_second': len(df) / best if best else 0.0,
+            'fingerprint': fingerprints.pop() if len(fingerprints) == 1 else None
+        }
+        row = results[source]
+        print(f"  - {source}: {row['articles']} haber, {best:.2f} sn ({row['articles_per_second']:.1f} haber/sn), "
+              f"{replay.hits} isabet / {replay.misses} arşivde yok, çıktı {row['fingerprint'] or 'TUTARSIZ'}")
+        if row['fingerprint'] is None:
+            print(f"  ! {source}: tekrarlar farklı haberler üretti")
+
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'record':
+        record_scrapers()
+    else:
+        benchmark_replay()
@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import threading
+
+from article_sink import ArticleSink, STREAM_DIR, iter_articles
+from url_frontier import UrlFrontier
+
+
+class CrawlCheckpoint:
+    """
+    Bir kaynağın tarama durumunu adım adım diske yazan kontrol noktası
+
+    Tarama yarıda kesilirse (hata, Ctrl+C, elektrik kesintisi) aynı kontrol
+    noktasıyla yeniden başlatılan kazıyıcı kaldığı yerden devam eder:
+    tamamlanan kategoriler atlanır, daha önce çıkarılan haberler sayılır ve
+    işlenmiş URL'ler yeniden indirilmez.
+
+    Haberler kaynağın akışına (`data/stream/<kaynak>/`) yazılır; kontrol noktası
+    klasörü (`data/checkpoints/<kaynak>/`) yalnızca tarama durumunu tutar:
+        done_urls.txt: İşlenen (haber olsun olmasın) her URL
+        state.json: Kategori sayaçları, kuyruktaki linkler ve tamamlanan kategoriler
+
+    Args:
+        source: Kaynak adı ('cnnturk', 'ntv', ...)
+        checkpoint_dir: Kontrol noktalarının ana klasörü
+        stream_dir: Haber akışlarının ana klasörü
+    """
+
+    def __init__(self, source, checkpoint_dir='data/checkpoints', stream_dir=STREAM_DIR):
+        self.source = source
+        self.path = os.path.join(checkpoint_dir, source)
+        os.makedirs(self.path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._state_path = os.path.join(self.path, 'state.json')
+        self.frontier = UrlFrontier(os.path.join(self.path, 'done_urls.txt'))
+        self.sink = ArticleSink(os.path.join(stream_dir, source))
+
+        self.state = self._load_state()
+        # Sayaçlar her zaman akıştaki haberlerden yeniden hesaplanır
+        self.state['category_counts'] = {}
+        self.restored = 0
+        for article in iter_articles(self.sink.directory):
+            category = article['category']
+            self.state['category_counts'][category] = self.state['category_counts'].get(category, 0) + 1
+            # Haber yazılıp URL işaretlenmeden kesildiyse aynı haber tekrar eklenmesin
+            self.frontier.mark_done(article['url'])
+            self.restored += 1
+
+    @property
+    def resumed(self):
+        """Önceki bir çalışmadan kalan durum var mı"""
+        return bool(self.restored or self.state['finished_categories'] or self.state['pending'])
+
+    def _load_state(self):
+        state = {'category_counts': {}, 'pending': {}, 'finished_categories': []}
+        if os.path.exists(self._state_path):
+            try:
+                with open(self._state_path, 'r', encoding='utf-8') as f:
+                    state.update(json.load(f))
+            except ValueError:
+                pass
+        return state
+
+    def _save_state(self):
+        tmp_path = self._state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_path, self._state_path)
+
+    def append_article(self, article):
+        """Haberi hemen kaynağın akışına yazar"""
+        self.sink.write(article)
+        with self._lock:
+            counts = self.state['category_counts']
+            counts[article['category']] = counts.get(article['category'], 0) + 1
+
+    def mark_done(self, url):
+        """URL'nin işlendiğini kaydeder"""
+        self.frontier.mark_done(url)
+
+    def add_pending(self, category, urls):
+        """Kuyruğa alınan linkleri kaydeder (yeniden başlatmada önce bunlar tamamlanır)"""
+        with self._lock:
+            pending = self.state['pending'].setdefault(category, [])
+            known = set(pending)
+            pending.extend(url for url in urls if url not in known)
+            self._save_state()
+
+    def pending(self, category):
+        """Kuyruğa alınmış ama henüz işlenmemiş linkler"""
+        return [url for url in self.state['pending'].get(category, []) if not self.frontier.is_done(url)]
+
+    def finish_category(self, category):
+        """Kategoriyi tamamlandı olarak işaretler"""
+        with self._lock:
+            if category not in self.state['finished_categories']:
+                self.state['finished_categories'].append(category)
+            self.state['pending'].pop(category, None)
+            self._save_state()
+
+    def is_finished(self, category):
+        return category in self.state['finished_categories']
+
+    def clear(self):
+        """Sonuçlar kalıcı olarak kaydedildikten sonra kontrol noktasını ve haber akışını siler"""
+        self.sink.close()
+        shutil.rmtree(self.path, ignore_errors=True)
+        shutil.rmtree(self.sink.directory, ignore_errors=True)
+
+
+def clear_checkpoint(source, checkpoint_dir='data/checkpoints', stream_dir=STREAM_DIR):
+    """Kaynağın kontrol noktasını ve haber akışını (yüklemeden) siler"""
+    shutil.rmtree(os.path.join(checkpoint_dir, source), ignore_errors=True)
+    shutil.rmtree(os.path.join(stream_dir, source), ignore_errors=True)
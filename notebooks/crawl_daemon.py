@@ -0,0 +1,373 @@
+import glob
+import importlib.util
+import inspect
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from article_sink import STREAM_DIR, ArticleSink, iter_articles
+from crawl_metrics import CrawlMetrics
+from fetch_engine import FetchEngine
+from near_duplicates import NearDuplicateIndex
+from scraper_common import NewsCollector
+from url_frontier import UrlFrontier
+
+# Kaynak adı -> kazıyıcı betiği (CATEGORIES, extract_news_links, parse_news, CACHE_POLICY)
+SOURCES = {
+    'cnnturk': "notebooks/01_cnn_scrapping.py",
+    'ntv': "notebooks/04_ntv_scrapping.py",
+    'haberturk': "notebooks/03_haberturk_scrapping.py",
+    'sabah': "notebooks/02_sabah_scrapping.py"
+}
+
+# Sürekli toplayıcının durum dosyaları
+STATE_DIR = 'data/state'
+SCHEDULE_PATH = os.path.join(STATE_DIR, 'schedule.json')
+SEEN_URLS_PATH = os.path.join(STATE_DIR, 'seen_urls.txt')
+# Kaynakların sürekli toplayıcı akışları: data/stream/<kaynak>.daemon/
+STREAM_SUFFIX = '.daemon'
+LIVE_DATASET = 'data/processed/live_news_dataset.csv'
+
+# Liste sayfası yoklama aralığı sınırları (saniye)
+MIN_INTERVAL = 5 * 60
+MAX_INTERVAL = 6 * 60 * 60
+# Her yoklamada bulunması hedeflenen yeni haber sayısı; aralık yeni haber hızına göre buna ayarlanır
+TARGET_NEW_PER_POLL = 3
+# Yeni haber hızı ortalamasında son yoklamanın ağırlığı
+RATE_ALPHA = 0.3
+
+
+def import_module_from_file(module_name, file_path):
+    """Belirtilen dosya yolundan bir modül yükler"""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class PollSchedule:
+    """
+    Bir kategori liste sayfasının yoklama zamanlaması
+
+    Her yoklamada bulunan yeni haber sayısından kategorinin yeni haber hızı
+    (haber/sn, üstel ortalama) tahmin edilir ve bir sonraki yoklama, bu hızla
+    yaklaşık `target_new` yeni haber birikecek kadar sonraya planlanır. Yeni
+    haber çıkmayan sayfaların aralığı ikiye katlanır; listedeki linklerin
+    tamamı yeniyse (arada haber kaçırılmış olabilir) en kısa aralığa dönülür.
+
+    Args:
+        source: Kaynak adı
+        category: Kategori adı
+        url: Liste sayfası
+        interval: Başlangıç yoklama aralığı (saniye)
+    """
+
+    def __init__(self, source, category, url, interval=MIN_INTERVAL):
+        self.source = source
+        self.category = category
+        self.url = url
+        self.interval = interval
+        self.next_poll = 0.0
+        self.last_poll = None
+        self.rate = None
+        self.polls = 0
+        self.new_articles = 0
+
+    @property
+    def key(self):
+        return f'{self.source}/{self.category}'
+
+    def record_poll(self, now, found, new, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL, target_new=TARGET_NEW_PER_POLL):
+        """
+        Yoklama sonucuna göre yeni haber hızını ve bir sonraki yoklama zamanını günceller
+
+        Args:
+            now: Yoklama zamanı (time.time())
+            found: Liste sayfasında bulunan haber linki sayısı
+            new: Daha önce görülmemiş link sayısı
+        """
+        if self.last_poll is not None and now > self.last_poll:
+            observed = new / (now - self.last_poll)
+            self.rate = observed if self.rate is None else RATE_ALPHA * observed + (1 - RATE_ALPHA) * self.rate
+
+            if found and new >= found:
+                interval = min_interval
+            elif self.rate > 0:
+                interval = target_new / self.rate
+            else:
+                interval = self.interval * 2
+            self.interval = min(max(interval, min_interval), max_interval)
+
+        self.last_poll = now
+        self.polls += 1
+        self.new_articles += new
+        # Aynı aralıktaki sayfaların hep birlikte yoklanmaması için ±%10 sapma
+        self.next_poll = now + self.interval * random.uniform(0.9, 1.1)
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'interval': self.interval,
+            'next_poll': self.next_poll,
+            'last_poll': self.last_poll,
+            'rate': self.rate,
+            'polls': self.polls,
+            'new_articles': self.new_articles
+        }
+
+    def restore(self, state):
+        """Kaydedilmiş zamanlamayı geri yükler (liste sayfası adresi değiştiyse hemen yoklanır)"""
+        self.interval = state.get('interval', self.interval)
+        self.rate = state.get('rate')
+        self.polls = state.get('polls', 0)
+        self.new_articles = state.get('new_articles', 0)
+        if state.get('url') == self.url:
+            self.next_poll = state.get('next_poll', 0.0)
+            self.last_poll = state.get('last_poll')
+
+
+class RequestBudget:
+    """
+    Bir kaynağa son bir saatte yapılan istek sayısını sınırlar
+
+    Args:
+        per_hour: Saatte en fazla istek sayısı
+    """
+
+    def __init__(self, per_hour):
+        self.per_hour = per_hour
+        self._spent = deque()
+
+    def _expire(self, now):
+        while self._spent and self._spent[0] <= now - 3600:
+            self._spent.popleft()
+
+    def remaining(self, now):
+        self._expire(now)
+        return max(self.per_hour - len(self._spent), 0)
+
+    def spend(self, now, count=1):
+        self._spent.extend([now] * count)
+
+    def available_at(self, now):
+        """Yeni bir istek yapılabilecek en erken zaman"""
+        self._expire(now)
+        if len(self._spent) < self.per_hour:
+            return now
+        return self._spent[len(self._spent) - self.per_hour] + 3600
+
+
+class _SourceState:
+    """Sürekli toplayıcıda bir kaynağın modülü, toplayıcısı ve istek bütçesi"""
+
+    def __init__(self, source, module, collector, budget):
+        self.source = source
+        self.module = module
+        self.collector = collector
+        self.budget = budget
+        # Kaynakların extract_news_links fonksiyonlarının bir kısmı kategori adı da alır
+        self.link_takes_category = len(inspect.signature(module.extract_news_links).parameters) > 1
+
+    def extract_links(self, soup, category):
+        if self.link_takes_category:
+            return self.module.extract_news_links(soup, category)
+        return self.module.extract_news_links(soup)
+
+
+def load_schedules(sources, path=SCHEDULE_PATH, interval=MIN_INTERVAL):
+    """Kaynakların kategori liste sayfaları için zamanlamaları oluşturur, kayıtlıysa geri yükler"""
+    saved = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    schedules = []
+    for source, module in sources.items():
+        for category, url in module.CATEGORIES.items():
+            schedule = PollSchedule(source, category, url, interval=interval)
+            if schedule.key in saved:
+                schedule.restore(saved[schedule.key])
+            schedules.append(schedule)
+    return schedules
+
+
+def save_schedules(schedules, path=SCHEDULE_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({schedule.key: schedule.to_dict() for schedule in schedules}, f, ensure_ascii=False, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def daemon_streams():
+    """Sürekli toplayıcının kaynak akış klasörleri"""
+    return sorted(glob.glob(os.path.join(STREAM_DIR, '*' + STREAM_SUFFIX)))
+
+
+def export_live_dataset(window_days=30, output_file=LIVE_DATASET):
+    """
+    Sürekli toplayıcının akışlarından son `window_days` günün haberlerini tek bir CSV'ye yazar
+
+    Akışlar yalnızca sona eklendiği için veri seti her seferinde akışlardan yeniden
+    oluşturulur; eski haberler pencereden çıkar. Dosya önce geçici adla yazılır,
+    okuyucular hiçbir zaman yarım dosya görmez.
+
+    Returns:
+        Yazılan haber sayısı
+    """
+    since = (datetime.now() - timedelta(days=window_days)).strftime('%Y-%m-%d')
+    rows = []
+    seen = set()
+    for directory in daemon_streams():
+        for article in iter_articles(directory):
+            if article.get('date', '') >= since and article['url'] not in seen:
+                seen.add(article['url'])
+                rows.append(article)
+
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    df = pd.DataFrame(rows, columns=['category', 'title', 'content', 'url', 'source', 'date', 'content_hash'])
+    df.to_csv(output_file + '.part', index=False, encoding='utf-8')
+    os.replace(output_file + '.part', output_file)
+    print(f"Güncel veri seti: son {window_days} günün {len(df)} haberi {output_file} dosyasına yazıldı.")
+    return len(df)
+
+
+def poll(schedule, state, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL, max_new_per_poll=50):
+    """
+    Liste sayfasını yoklar ve yalnızca yeni haber linklerini çeker
+
+    Liste sayfası önbellekteki kopyasıyla koşullu istek (If-None-Match /
+    If-Modified-Since) gönderilerek indirilir; sayfa değişmediyse gövde aktarılmaz.
+
+    Returns:
+        Çekilen yeni link sayısı
+    """
+    collector = state.collector
+    now = time.time()
+    remaining = state.budget.remaining(now)
+    if remaining < 2:
+        # Saatlik bütçe doldu; bütçe açılınca tekrar dene
+        schedule.next_poll = state.budget.available_at(now) + 1
+        print(f"  ! {schedule.key}: saatlik istek bütçesi ({state.budget.per_hour}) doldu, "
+              f"yoklama {(schedule.next_poll - now) / 60:.0f} dk ertelendi")
+        return 0
+
+    try:
+        soup = collector.fetch_page(schedule.url, max_age=0)
+    except Exception as e:
+        state.budget.spend(now)
+        print(f"  ! {schedule.key} liste sayfası alınamadı: {str(e)}")
+        schedule.record_poll(now, 0, 0, min_interval, max_interval)
+        return 0
+
+    links = state.extract_links(soup, schedule.category)
+    new_links = [url for url in links if url not in collector.frontier]
+    # Bütçeye sığmayan linkler görülmedi sayılır, sonraki yoklamada çekilir
+    batch = new_links[:min(max_new_per_poll, remaining - 1)]
+    state.budget.spend(now, 1 + len(batch))
+    if batch:
+        collector.fetch_news(batch, schedule.category)
+
+    schedule.record_poll(now, len(links), len(new_links), min_interval, max_interval)
+    print(f"{datetime.now().strftime('%H:%M:%S')} {schedule.key}: {len(links)} link, {len(new_links)} yeni, "
+          f"{len(batch)} çekildi; sonraki yoklama {schedule.interval / 60:.1f} dk sonra")
+    return len(batch)
+
+
+def run_daemon(sources=None, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL, requests_per_hour=600,
+               max_new_per_poll=50, per_host=2, window_days=30, export_interval=60 * 60, duration=None):
+    """
+    Kaynakların kategori liste sayfalarını sürekli yoklayıp yalnızca yeni haberleri toplar
+
+    Her liste sayfası kendi aralığıyla yoklanır (bkz. PollSchedule): sık haber
+    çıkan kategoriler sık, durgun olanlar seyrek yoklanır. Daha önce işlenmiş
+    haberler data/state/seen_urls.txt üzerinden atlanır, yeni haberler
+    data/stream/<kaynak>.daemon/ akışına eklenir ve `export_interval` saniyede bir
+    son `window_days` günün haberleri data/processed/live_news_dataset.csv
+    dosyasına yazılır. Zamanlamalar data/state/schedule.json dosyasında saklanır;
+    toplayıcı yeniden başlatıldığında öğrendiği aralıklarla devam eder.
+    Ctrl+C ile durdurulur.
+
+    Args:
+        sources: Toplanacak kaynaklar (varsayılan: SOURCES içindeki tüm kaynaklar)
+        min_interval: Bir liste sayfasının en kısa yoklama aralığı (saniye)
+        max_interval: Bir liste sayfasının en uzun yoklama aralığı (saniye)
+        requests_per_hour: Kaynak başına saatte en fazla istek sayısı (liste + haber sayfaları)
+        max_new_per_poll: Bir yoklamada çekilecek en fazla yeni haber
+        per_host: Aynı siteye aynı anda gönderilecek en fazla istek sayısı
+        window_days: Güncel veri setinde tutulan gün sayısı
+        export_interval: Güncel veri setinin yeniden yazılma aralığı (saniye)
+        duration: Verilirse toplayıcı bu kadar saniye sonra durur
+    """
+    sources = list(sources or SOURCES)
+    modules = {source: import_module_from_file(f"{source}_scrapping", SOURCES[source]) for source in sources}
+    frontier = UrlFrontier(SEEN_URLS_PATH)
+
+    # Daha önce toplanan haberlerin yakın kopyaları tekrar kaydedilmez
+    duplicates = NearDuplicateIndex()
+    for directory in daemon_streams():
+        for article in iter_articles(directory):
+            duplicates.add(article['url'], article['content'], fingerprint=article.get('content_hash'))
+
+    states = {}
+    for source, module in modules.items():
+        engine = FetchEngine(max_workers=per_host, per_host=per_host, metrics=CrawlMetrics(source))
+        sink = ArticleSink(os.path.join(STREAM_DIR, source + STREAM_SUFFIX))
+        collector = NewsCollector(source, module.parse_news, float('inf'), engine=engine, cache_policy=module.CACHE_POLICY,
+                                  frontier=frontier, duplicates=duplicates, sink=sink)
+        states[source] = _SourceState(source, module, collector, RequestBudget(requests_per_hour))
+
+    schedules = load_schedules(modules, interval=min_interval)
+    print(f"Sürekli toplama başladı: {len(sources)} kaynak, {len(schedules)} liste sayfası, "
+          f"{len(frontier)} görülmüş haber ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})")
+
+    started = time.time()
+    last_export = started
+    try:
+        while duration is None or time.time() - started < duration:
+            due = sorted((schedule for schedule in schedules if schedule.next_poll <= time.time()), key=lambda s: s.next_poll)
+            for schedule in due:
+                try:
+                    poll(schedule, states[schedule.source], min_interval, max_interval, max_new_per_poll)
+                except Exception as e:
+                    print(f"  ! {schedule.key} yoklanırken hata oluştu: {str(e)}")
+                    schedule.next_poll = time.time() + min_interval
+            if due:
+                save_schedules(schedules)
+
+            if time.time() - last_export >= export_interval:
+                export_live_dataset(window_days)
+                last_export = time.time()
+
+            wake = min(min(schedule.next_poll for schedule in schedules), last_export + export_interval)
+            if duration is not None:
+                wake = min(wake, started + duration)
+            time.sleep(max(wake - time.time(), 0.1))
+    except KeyboardInterrupt:
+        print("\nSürekli toplama durduruluyor...")
+    finally:
+        save_schedules(schedules)
+        for source, state in states.items():
+            state.collector.close()
+            state.collector.engine.close()
+            state.collector.sink.close()
+            state.collector.metrics.save(f'data/logs/{source}_daemon_metrics.json')
+        export_live_dataset(window_days)
+
+    for schedule in sorted(schedules, key=lambda s: s.interval):
+        print(f"  - {schedule.key}: {schedule.polls} yoklama, {schedule.new_articles} yeni haber, "
+              f"aralık {schedule.interval / 60:.1f} dk")
+
+
+if __name__ == "__main__":
+    # python notebooks/crawl_daemon.py [kaynak ...]
+    unknown = [source for source in sys.argv[1:] if source not in SOURCES]
+    if unknown:
+        print(f"Kullanım: python notebooks/crawl_daemon.py [{'|'.join(SOURCES)} ...]")
+        sys.exit(1)
+    run_daemon(sys.argv[1:] or None)
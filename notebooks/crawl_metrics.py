@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+# Yanıt süresi histogramının üst sınırları (saniye); son kova sınırsız
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0]
+
+
+class _HostMetrics:
+    """Tek bir sunucunun istek sayaçları"""
+
+    def __init__(self):
+        self.requests = 0
+        self.cache_hits = 0
+        self.bytes = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.sleep = 0.0
+
+
+def _error_class(error):
+    if isinstance(error, str):
+        return error
+    return type(error).__name__
+
+
+def _response_bytes(response):
+    """Ağdan okunan (sıkıştırılmış) bayt sayısı; bilinmiyorsa gövde uzunluğu"""
+    raw = getattr(response, 'raw', None)
+    try:
+        read = raw.tell() if raw is not None else 0
+    except (AttributeError, OSError, ValueError):
+        read = 0
+    return read or len(response.content or b'')
+
+
+class CrawlMetrics:
+    """
+    Bir taramanın yapılandırılmış ölçümleri
+
+    İndirme motoru sunucu bazında yanıt süresi histogramını, aktarılan baytı,
+    durum kodlarını, hata sınıflarını ve hız sınırlayıcıda beklenen süreyi;
+    NewsCollector ise ayrıştırma sürelerini ('parse': haber sayfasının tamamı,
+    'extract': bunun içindeki başlık/içerik çıkarma, 'listing_parse': liste
+    sayfaları), olay sayılarını ('article', 'extract_miss', 'duplicate', ...)
+    ve seçici istatistiklerini (`details`) kaydeder. `save` ile JSON çalışma
+    özeti olarak yazılır.
+
+    Args:
+        source: Kaynak adı (özette gösterilir)
+    """
+
+    def __init__(self, source=None):
+        self.source = source
+        self.started_at = datetime.now()
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self.stages = Counter()
+        self.stage_counts = Counter()
+        self.events = Counter()
+        self.details = {}
+
+    def _host(self, host):
+        metrics = self._hosts.get(host)
+        if metrics is None:
+            metrics = self._hosts[host] = _HostMetrics()
+        return metrics
+
+    def record_response(self, host, response, latency=None, cached=False):
+        """
+        Alınan yanıtı kaydeder
+
+        Args:
+            latency: İstek süresi (saniye)
+            cached: Yanıt hiç istek yapılmadan önbellekten verildiyse True
+        """
+        # 304 ile doğrulanan önbellek kayıtlarının gövdesi ağdan gelmez
+        size = 0 if cached or getattr(response, 'from_cache', False) else _response_bytes(response)
+        with self._lock:
+            metrics = self._host(host)
+            metrics.statuses[response.status_code] += 1
+            if cached:
+                metrics.cache_hits += 1
+                return
+            metrics.requests += 1
+            metrics.bytes += size
+            if latency is not None:
+                metrics.latency_sum += latency
+                metrics.latency_max = max(metrics.latency_max, latency)
+                bucket = next((i for i, limit in enumerate(LATENCY_BUCKETS) if latency <= limit), len(LATENCY_BUCKETS))
+                metrics.histogram[bucket] += 1
+
+    def record_error(self, host, error):
+        """Başarısız isteği hata sınıfıyla kaydeder (istisna veya 'HTTP 503' gibi metin)"""
+        with self._lock:
+            self._host(host).errors[_error_class(error)] += 1
+
+    def record_sleep(self, host, seconds):
+        """Hız sınırlayıcı / geri çekilme nedeniyle beklenen süreyi kaydeder"""
+        if seconds > 0:
+            with self._lock:
+                self._host(host).sleep += seconds
+
+    def record_stage(self, stage, seconds):
+        """'parse' / 'extract' gibi bir işlem adımının süresini ekler"""
+        with self._lock:
+            self.stages[stage] += seconds
+            self.stage_counts[stage] += 1
+
+    @contextmanager
+    def timed(self, stage):
+        """Blok süresini `stage` adımına ekler"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - started)
+
+    def record_event(self, name, count=1):
+        """'article', 'extract_miss', 'duplicate' gibi olayları sayar"""
+        with self._lock:
+            self.events[name] += count
+
+    def summary(self):
+        """
+        Returns:
+            dict: JSON'a yazılabilir çalışma özeti
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            hosts = {}
+            for host, metrics in sorted(self._hosts.items()):
+                timed = sum(metrics.histogram)
+                hosts[host] = {
+                    'requests': metrics.requests,
+                    'cache_hits': metrics.cache_hits,
+                    'bytes': metrics.bytes,
+                    'latency_avg': metrics.latency_sum / timed if timed else None,
+                    'latency_max': metrics.latency_max if timed else None,
+                    'latency_histogram': {
+                        (f'<={limit}' if limit is not None else f'>{LATENCY_BUCKETS[-1]}'): count
+                        for limit, count in zip(LATENCY_BUCKETS + [None], metrics.histogram)
+                    },
+                    'statuses': {str(status): count for status, count in sorted(metrics.statuses.items())},
+                    'errors': dict(metrics.errors),
+                    'sleep_seconds': round(metrics.sleep, 3)
+                }
+            articles = self.events['article']
+            return {
+                'source': self.source,
+                'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'elapsed_seconds': round(elapsed, 3),
+                'articles': articles,
+                'articles_per_minute': articles / elapsed * 60 if elapsed > 0 else 0.0,
+                'requests': sum(row['requests'] for row in hosts.values()),
+                'bytes': sum(row['bytes'] for row in hosts.values()),
+                'errors': sum(sum(row['errors'].values()) for row in hosts.values()),
+                'sleep_seconds': round(sum(row['sleep_seconds'] for row in hosts.values()), 3),
+                'stages': {
+                    stage: {'seconds': round(seconds, 3), 'count': self.stage_counts[stage]}
+                    for stage, seconds in self.stages.items()
+                },
+                'events': dict(self.events),
+                'hosts': hosts,
+                **self.details
+            }
+
+    def save(self, output_file):
+        """Çalışma özetini JSON dosyasına yazar"""
+        summary = self.summary()
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"Çalışma özeti {output_file} dosyasına kaydedildi.")
+        return summary
+
+    def print_summary(self):
+        """Özetin okunabilir kısa halini yazdırır"""
+        summary = self.summary()
+        print(f"Ölçümler: {summary['articles']} haber, {summary['articles_per_minute']:.1f} haber/dk, "
+              f"{summary['requests']} istek, {summary['bytes'] / 1024 / 1024:.1f} MB, "
+              f"{summary['errors']} hata, {summary['sleep_seconds']:.1f} sn bekleme")
+        for stage, row in summary['stages'].items():
+            print(f"  - {stage}: {row['seconds']:.2f} sn ({row['count']} kez)")
+        for host, row in summary['hosts'].items():
+            latency = f", ort. {row['latency_avg']:.2f} sn" if row['latency_avg'] is not None else ""
+            errors = ", ".join(f"{name}: {count}" for name, count in row['errors'].items())
+            print(f"  - {host}: {row['requests']} istek{latency}" + (f", hatalar ({errors})" if errors else ""))
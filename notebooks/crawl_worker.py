@@ -0,0 +1,73 @@
+import importlib.util
+import os
+import socket
+import sys
+
+from crawl_metrics import CrawlMetrics
+from fetch_engine import FetchEngine
+from work_queue import QUEUE_PATH, open_queue, print_queue_stats
+
+# Kaynak adı -> (kazıyıcı betiği, toplama fonksiyonu)
+SCRAPERS = {
+    'cnnturk': ("notebooks/01_cnn_scrapping.py", 'get_cnn_news'),
+    'ntv': ("notebooks/04_ntv_scrapping.py", 'get_ntv_news'),
+    'haberturk': ("notebooks/03_haberturk_scrapping.py", 'get_haberturk_news'),
+    'sabah': ("notebooks/02_sabah_scrapping.py", 'get_sabah_news')
+}
+
+
+def import_module_from_file(module_name, file_path):
+    """Belirtilen dosya yolundan bir modül yükler"""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_worker(source, queue_location=QUEUE_PATH, target_per_category=200, per_host=4):
+    """
+    Bir kaynağı paylaşılan tarama kuyruğundan çalışan bir işçi olarak tarar
+
+    Aynı kaynak için istenilen sayıda işçi (aynı makinede ayrı süreçler veya farklı
+    makineler) aynı kuyruğu kullanarak birlikte çalışabilir: her işçi bulduğu linkleri
+    kuyruğa ekler ve kuyruktan kiraladığı linkleri çeker. Kategori hedefi tüm
+    işçilerin toplamıdır. Haberler data/stream/<kaynak>.<işçi>/ akışına yazılır;
+    04_combine_datasets.combine_news_datasets(include_streams=True) ile birleştirilir.
+
+    Args:
+        source: Kaynak adı (SCRAPERS anahtarlarından biri)
+        queue_location: Kuyruk dosyası veya servis adresi (ör. http://10.0.0.5:8700)
+        target_per_category: Her kategoriden toplam hedef haber sayısı
+        per_host: Bu işçinin siteye aynı anda gönderebileceği en fazla istek sayısı
+
+    Returns:
+        Bu işçinin kaydettiği haber sayısı
+    """
+    script, function_name = SCRAPERS[source]
+    module = import_module_from_file(f"{source}_scrapping", script)
+    queue = open_queue(queue_location)
+    engine = FetchEngine(per_host=per_host, metrics=CrawlMetrics(source))
+
+    try:
+        df = getattr(module, function_name)(target_per_category=target_per_category, engine=engine, queue=queue)
+    finally:
+        engine.close()
+        engine.print_stats()
+        print_queue_stats(queue, source)
+        queue.close()
+
+    # İşçi adı NewsCollector'ın varsayılanıyla aynı: <makine>-<süreç no>
+    engine.metrics.save(f'data/logs/{source}.{socket.gethostname()}-{os.getpid()}_metrics.json')
+    print(f"İşçi {len(df)} haber kaydetti.")
+    return len(df)
+
+
+if __name__ == "__main__":
+    # python notebooks/crawl_worker.py <kaynak> [kuyruk dosyası veya adresi] [kategori başına hedef]
+    if len(sys.argv) < 2 or sys.argv[1] not in SCRAPERS:
+        print(f"Kullanım: python notebooks/crawl_worker.py <{'|'.join(SCRAPERS)}> [kuyruk] [hedef]")
+        sys.exit(1)
+    run_worker(sys.argv[1],
+               sys.argv[2] if len(sys.argv) > 2 else QUEUE_PATH,
+               int(sys.argv[3]) if len(sys.argv) > 3 else 200)
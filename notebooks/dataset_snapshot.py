@@ -0,0 +1,204 @@
+import glob
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+# Anlık görüntülerin ana klasörü: <id>.json kayıtları ve objects/<ö>/<özet>.jsonl.gz parça dosyaları
+SNAPSHOT_DIR = 'data/snapshots'
+
+# Parça sınırları satır anahtarının özetinden belirlenir: ortalama parça boyu ve en fazla satır
+TARGET_CHUNK_ROWS = 256
+MAX_CHUNK_ROWS = 4 * TARGET_CHUNK_ROWS
+
+
+def _row_line(values):
+    """Satırın değişmez metin biçimi (özet ve depolama için)"""
+    return json.dumps([None if pd.isna(value) else str(value) for value in values], ensure_ascii=False)
+
+
+def _key_hash(key):
+    return int.from_bytes(hashlib.sha1(str(key).encode('utf-8')).digest()[:4], 'big')
+
+
+def _object_path(digest, snapshot_dir):
+    return os.path.join(snapshot_dir, 'objects', digest[:2], digest + '.jsonl.gz')
+
+
+def _write_object(digest, data, snapshot_dir):
+    """Parçayı içerik özeti adıyla yazar; aynı içerik daha önce yazıldıysa dokunulmaz"""
+    path = _object_path(digest, snapshot_dir)
+    if os.path.exists(path):
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path + '.part', 'wb') as f:
+        f.write(data)
+    os.replace(path + '.part', path)
+    return True
+
+
+def _read_object(digest, snapshot_dir):
+    """Parçanın satırlarını (sütunlar, satır listesi) olarak okur"""
+    with gzip.open(_object_path(digest, snapshot_dir), 'rt', encoding='utf-8') as f:
+        columns = json.loads(f.readline())
+        return columns, [json.loads(line) for line in f]
+
+
+def create_snapshot(df, key='url', label=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    DataFrame'in değişmez, içerik adresli anlık görüntüsünü oluşturur
+
+    Satırlar `key` sütununa göre sıralanıp parçalara bölünür. Parça sınırları
+    anahtarın özetinden belirlendiği için bir haberin eklenmesi veya silinmesi
+    yalnızca o haberin parçasını değiştirir. Her parça içeriğinin SHA-256
+    özetiyle saklanır; önceki görüntülerde olan parçalar yeniden yazılmaz.
+    Görüntünün kimliği parça özetlerinin özetidir: aynı veri her zaman aynı
+    kimliği verir.
+
+    Args:
+        df: Görüntüsü alınacak veri
+        key: Satırları tanımlayan sütun (farkların hesaplanması için)
+        label: Görüntünün açıklaması (ör. eğitim verisinin kaynağı)
+
+    Returns:
+        Görüntü kimliği
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    columns = [str(column) for column in df.columns]
+    header = json.dumps(columns, ensure_ascii=False) + '\n'
+    order = df[key].astype(str).argsort(kind='stable')
+    rows = df.iloc[order]
+
+    chunks = []
+    lines, first = [], None
+
+    def flush(last):
+        data = (header + '\n'.join(lines) + '\n').encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        new = _write_object(digest, data, snapshot_dir)
+        chunks.append({'hash': digest, 'rows': len(lines), 'first': first, 'last': last, 'new': new})
+
+    key_position = columns.index(key)
+    for values in rows.itertuples(index=False, name=None):
+        row_key = None if pd.isna(values[key_position]) else str(values[key_position])
+        if not lines:
+            first = row_key
+        lines.append(_row_line(values))
+        if _key_hash(row_key) % TARGET_CHUNK_ROWS == 0 or len(lines) >= MAX_CHUNK_ROWS:
+            flush(row_key)
+            lines = []
+    if lines:
+        flush(row_key)
+
+    new_chunks = sum(chunk.pop('new') for chunk in chunks)
+    content = json.dumps({'columns': columns, 'key': key, 'chunks': [chunk['hash'] for chunk in chunks]})
+    snapshot_id = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+
+    path = os.path.join(snapshot_dir, snapshot_id + '.json')
+    if not os.path.exists(path):
+        record = {
+            'id': snapshot_id,
+            'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'label': label,
+            'columns': columns,
+            'key': key,
+            'rows': len(rows),
+            'chunks': chunks
+        }
+        with open(path + '.part', 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, indent=1)
+        os.replace(path + '.part', path)
+    print(f"  - Veri anlık görüntüsü {snapshot_id}: {len(rows)} satır, {len(chunks)} parça ({new_chunks} yeni parça yazıldı)")
+    return snapshot_id
+
+
+def snapshot_info(snapshot_id, snapshot_dir=SNAPSHOT_DIR):
+    """Görüntünün kaydı (kimliğin baştan benzersiz bir kısmı da verilebilir)"""
+    matches = glob.glob(os.path.join(snapshot_dir, snapshot_id + '*.json'))
+    if len(matches) != 1:
+        raise KeyError(f"{snapshot_id} anlık görüntüsü {'bulunamadı' if not matches else 'birden fazla görüntüyle eşleşiyor'}")
+    with open(matches[0], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def list_snapshots(snapshot_dir=SNAPSHOT_DIR):
+    """Görüntülerin özeti (oluşturulma sırasıyla)"""
+    records = []
+    for path in glob.glob(os.path.join(snapshot_dir, '*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            record = json.load(f)
+        records.append({key: record[key] for key in ('id', 'created', 'label', 'rows')} | {'chunks': len(record['chunks'])})
+    return pd.DataFrame(records, columns=['id', 'created', 'label', 'rows', 'chunks']).sort_values('created', ignore_index=True)
+
+
+def load_snapshot(snapshot_id, columns=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Görüntüdeki veriyi okur
+
+    Args:
+        columns: Yalnızca bu sütunlar (varsayılan: tümü)
+
+    Returns:
+        pd.DataFrame (anahtar sırasıyla; değerler metin olarak)
+    """
+    record = snapshot_info(snapshot_id, snapshot_dir)
+    positions = [record['columns'].index(column) for column in (columns or record['columns'])]
+    rows = []
+    for chunk in record['chunks']:
+        rows.extend([row[i] for i in positions] for row in _read_object(chunk['hash'], snapshot_dir)[1])
+    return pd.DataFrame(rows, columns=[record['columns'][i] for i in positions])
+
+
+def _chunk_rows(hashes, key_position, snapshot_dir):
+    """Parçalardaki satırlar: anahtar -> satır özeti"""
+    rows = {}
+    for digest in hashes:
+        for row in _read_object(digest, snapshot_dir)[1]:
+            rows[row[key_position]] = hashlib.sha1(_row_line(row).encode('utf-8')).hexdigest()
+    return rows
+
+
+def diff_snapshots(old_id, new_id, snapshot_dir=SNAPSHOT_DIR):
+    """
+    İki görüntü arasındaki eklenen, silinen ve değişen satırların anahtarları
+
+    Aynı özetli parçalar karşılaştırılmadan atlanır; yalnızca iki görüntüden
+    birinde olan parçalar okunur.
+
+    Returns:
+        dict: 'added', 'removed', 'changed' anahtar listeleri ve 'unchanged' satır sayısı
+    """
+    old, new = snapshot_info(old_id, snapshot_dir), snapshot_info(new_id, snapshot_dir)
+    if old['columns'] != new['columns'] or old['key'] != new['key']:
+        raise ValueError("Görüntülerin sütunları farklı; satır bazında karşılaştırılamaz")
+    key_position = old['columns'].index(old['key'])
+    old_hashes = {chunk['hash'] for chunk in old['chunks']}
+    new_hashes = {chunk['hash'] for chunk in new['chunks']}
+
+    old_rows = _chunk_rows(old_hashes - new_hashes, key_position, snapshot_dir)
+    new_rows = _chunk_rows(new_hashes - old_hashes, key_position, snapshot_dir)
+    changed = sorted(key for key in old_rows.keys() & new_rows.keys() if old_rows[key] != new_rows[key])
+    return {
+        'added': sorted(new_rows.keys() - old_rows.keys()),
+        'removed': sorted(old_rows.keys() - new_rows.keys()),
+        'changed': changed,
+        'unchanged': new['rows'] - len(new_rows.keys() - old_rows.keys()) - len(changed)
+    }
+
+
+if __name__ == "__main__":
+    # Kullanım: dataset_snapshot.py            -> görüntüleri listeler
+    #           dataset_snapshot.py <id> <id>  -> iki görüntünün farkını yazdırır
+    if len(sys.argv) == 3:
+        diff = diff_snapshots(sys.argv[1], sys.argv[2])
+        print(f"Eklenen: {len(diff['added'])}, silinen: {len(diff['removed'])}, "
+              f"değişen: {len(diff['changed'])}, aynı kalan: {diff['unchanged']} satır")
+        for label in ('added', 'removed', 'changed'):
+            for key in diff[label][:20]:
+                print(f"  {label}: {key}")
+    else:
+        print(list_snapshots().to_string(index=False))
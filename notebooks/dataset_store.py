@@ -0,0 +1,406 @@
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+
+# pyarrow kuruluysa veri setleri bölümlenmiş Parquet olarak, değilse tek CSV dosyası olarak saklanır
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# Veri setlerinin ana klasörü: data/dataset/<ad>/<bölüm>=<değer>/.../part-*.parquet
+DATASET_DIR = 'data/dataset'
+
+# Ham haber veri setinin bölüm sütunları (kaynak / kategori / tarama günü)
+RAW_PARTITIONS = ['source', 'category', 'date']
+# Ön işlenmiş veri setinin bölüm sütunları
+CLEANED_PARTITIONS = ['kaynak', 'kategori', 'tarih']
+
+# Ham haber veri setinin sütunları (parça parça eklenen dosyaların şeması aynı kalsın diye sabit)
+RAW_COLUMNS = ['category', 'title', 'content', 'url', 'source', 'date', 'content_hash']
+
+# Veri setine eklenen girdi dosyalarının kaydı: data/dataset/<ad>.manifest.json
+MANIFEST_SUFFIX = '.manifest.json'
+
+
+def dataset_path(name, dataset_dir=DATASET_DIR):
+    """Veri setinin klasörü (pyarrow yoksa .csv uzantılı dosyası)"""
+    path = os.path.join(dataset_dir, name)
+    return path if HAS_ARROW else path + '.csv'
+
+
+def dataset_exists(name, dataset_dir=DATASET_DIR):
+    return os.path.exists(dataset_path(name, dataset_dir))
+
+
+def _expression(filters):
+    """{'sütun': değer veya değer listesi} sözlüğünü pyarrow filtre ifadesine çevirir"""
+    expression = None
+    for column, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            condition = ds.field(column).isin(list(value))
+        else:
+            condition = ds.field(column) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _apply_filters(df, filters):
+    for column, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            df = df[df[column].isin(list(value))]
+        else:
+            df = df[df[column] == value]
+    return df
+
+
+class DatasetWriter:
+    """
+    Haberleri parça parça bölümlenmiş bir veri setine yazar
+
+    pyarrow varsa her parça `partition_cols` değerlerine göre (ör.
+    source=ntv/category=spor/date=2025-05-20/) ayrı Parquet dosyalarına yazılır;
+    okurken yalnızca gereken bölümler ve sütunlar okunur. pyarrow yoksa veri
+    seti tek bir CSV dosyasıdır. Yazma geçici bir konumda yapılır ve `close`
+    ile eski veri setinin yerine geçer; okuyucular yarım veri seti görmez.
+
+    Args:
+        name: Veri setinin adı (ör. 'all_news')
+        partition_cols: Bölümleme sütunları
+        dataset_dir: Veri setlerinin ana klasörü
+    """
+
+    def __init__(self, name, partition_cols, dataset_dir=DATASET_DIR):
+        self.path = dataset_path(name, dataset_dir)
+        self.partition_cols = list(partition_cols)
+        self.rows = 0
+        self._parts = 0
+        self._schema = None
+        self._partial = self.path + '.part'
+        if os.path.isdir(self._partial):
+            shutil.rmtree(self._partial)
+        elif os.path.exists(self._partial):
+            os.remove(self._partial)
+        os.makedirs(dataset_dir, exist_ok=True)
+        if HAS_ARROW:
+            self._partitioning = ds.partitioning(
+                pa.schema([(column, pa.string()) for column in self.partition_cols]), flavor='hive')
+
+    def _table(self, df):
+        # Bölüm değerleri metin olarak saklanır; ilk parçanın şeması sonraki parçalara da uygulanır
+        df = df.copy()
+        for column in self.partition_cols:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+        if self._schema is None:
+            fields = []
+            for column in df.columns:
+                if df[column].dtype == object or df[column].isna().all():
+                    fields.append(pa.field(column, pa.string()))
+                else:
+                    fields.append(pa.Schema.from_pandas(df[[column]], preserve_index=False).field(column))
+            self._schema = pa.schema(fields)
+        return pa.Table.from_pandas(df[self._schema.names], schema=self._schema, preserve_index=False)
+
+    def write(self, df):
+        """DataFrame parçasını veri setine ekler"""
+        if len(df) == 0:
+            return
+        if HAS_ARROW:
+            ds.write_dataset(self._table(df), self._partial, format='parquet', partitioning=self._partitioning,
+                             basename_template=f'part-{self._parts:05d}-{{i}}.parquet',
+                             existing_data_behavior='overwrite_or_ignore')
+        else:
+            df.to_csv(self._partial, mode='a', header=not os.path.exists(self._partial), index=False, encoding='utf-8')
+        self._parts += 1
+        self.rows += len(df)
+
+    def close(self):
+        """Yazılan veri setini eskisinin yerine koyar (hiç satır yazılmadıysa eskisi korunur)"""
+        if not self.rows:
+            return None
+        # Veri seti bütünüyle değişti; girdi kaydı (DatasetManifest) artık geçerli değil
+        if os.path.exists(self.path + MANIFEST_SUFFIX):
+            os.remove(self.path + MANIFEST_SUFFIX)
+        if HAS_ARROW:
+            old = self.path + '.old'
+            if os.path.exists(self.path):
+                os.replace(self.path, old)
+            os.replace(self._partial, self.path)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.replace(self._partial, self.path)
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+def file_digest(path, size=None, block_size=1 << 20):
+    """Dosyanın (size verilirse ilk `size` baytının) SHA-1 özeti"""
+    digest = hashlib.sha1()
+    remaining = os.path.getsize(path) if size is None else size
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+
+class DatasetManifest:
+    """
+    Bir Parquet veri setine eklenmiş girdi dosyalarının kaydı
+
+    Her girdi dosyası için boyutu, değişiklik zamanı, içerik özeti (SHA-1),
+    eklenen satır sayısı ve veri setine yazılan Parquet dosyaları tutulur.
+    Böylece bir sonraki eklemede yalnızca yeni, sonuna eklenmiş veya içeriği
+    değişmiş girdiler okunur: boyutu ve zamanı aynı olan girdi hiç açılmaz,
+    sonuna eklenmiş girdinin yalnızca yeni baytları okunur, içeriği değişen
+    girdinin eski dosyaları silinip girdi baştan eklenir.
+
+    Args:
+        name: Veri setinin adı
+        settings: Veri setinin oluşturulma ayarları (ör. kopya eşiği); kayıttakilerden
+            farklıysa kayıt geçersiz sayılır ve veri seti baştan oluşturulmalıdır
+        dataset_dir: Veri setlerinin ana klasörü
+    """
+
+    def __init__(self, name, settings=None, dataset_dir=DATASET_DIR):
+        self.name = name
+        self.dataset_dir = dataset_dir
+        self.root = dataset_path(name, dataset_dir)
+        self.path = self.root + MANIFEST_SUFFIX
+        self.settings = dict(settings or {})
+        self.inputs = {}
+        self.valid = False
+        if os.path.exists(self.path) and os.path.isdir(self.root):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('settings') == self.settings:
+                self.inputs = data['inputs']
+                self.valid = True
+
+    def reset(self):
+        """Veri setini ve kaydı siler (baştan oluşturmak için)"""
+        shutil.rmtree(self.root, ignore_errors=True)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.inputs = {}
+        self.valid = True
+
+    def check(self, input_path):
+        """
+        Girdinin son eklemeden bu yana durumu
+
+        Returns:
+            (durum, başlangıç baytı): durum 'new', 'unchanged', 'appended' veya 'changed';
+            başlangıç baytı girdinin okunmaya başlanacağı konum
+        """
+        entry = self.inputs.get(input_path)
+        if entry is None:
+            return 'new', 0
+        stat = os.stat(input_path)
+        if stat.st_size == entry['size'] and stat.st_mtime == entry['mtime']:
+            return 'unchanged', entry['size']
+        # Boyut veya zaman değişti: eklenmiş kısmın özeti aynıysa girdi yalnızca sonuna eklenmiştir
+        if stat.st_size >= entry['size'] and file_digest(input_path, entry['size']) == entry['sha1']:
+            return ('unchanged' if stat.st_size == entry['size'] else 'appended'), entry['size']
+        return 'changed', 0
+
+    def record(self, input_path, size, files=(), rows=0, **info):
+        """Girdinin ilk `size` baytının eklendiğini kaydeder; `files` bu eklemede yazılan dosyalar"""
+        entry = self.inputs.setdefault(input_path, {'files': [], 'rows': 0, 'parts': 0})
+        entry.update(info)
+        entry['size'] = size
+        entry['mtime'] = os.stat(input_path).st_mtime
+        entry['sha1'] = file_digest(input_path, size)
+        entry['files'].extend(files)
+        entry['rows'] += rows
+        entry['parts'] += 1 if files else 0
+
+    def touch(self, input_path):
+        """İçeriği değişmemiş girdinin yeni değişiklik zamanını kaydeder"""
+        self.inputs[input_path]['mtime'] = os.stat(input_path).st_mtime
+
+    def forget(self, input_path):
+        """Girdiyi kayıttan çıkarır; girdinin veri setindeki dosyalarını döndürür"""
+        entry = self.inputs.pop(input_path, None)
+        return entry['files'] if entry else []
+
+    def orphans(self):
+        """Veri setinde olup hiçbir girdiye ait olmayan dosyalar (yarıda kalmış eklemelerden)"""
+        known = {file for entry in self.inputs.values() for file in entry['files']}
+        found = []
+        for directory, _, files in os.walk(self.root):
+            for file in files:
+                relative = os.path.relpath(os.path.join(directory, file), self.root).replace(os.sep, '/')
+                if relative not in known:
+                    found.append(relative)
+        return found
+
+    def rows(self):
+        return sum(entry['rows'] for entry in self.inputs.values())
+
+    def save(self):
+        os.makedirs(self.dataset_dir, exist_ok=True)
+        with open(self.path + '.part', 'w', encoding='utf-8') as f:
+            json.dump({'settings': self.settings, 'inputs': self.inputs}, f, ensure_ascii=False, indent=1)
+        os.replace(self.path + '.part', self.path)
+
+
+def _string_table(df, columns):
+    """Tüm sütunları metin olarak saklayan, sütunları `columns` sırasında olan pyarrow tablosu"""
+    df = df.reindex(columns=columns)
+    df = df.astype(object).where(df.notna(), None)
+    for column in columns:
+        df[column] = df[column].map(lambda value: value if value is None else str(value))
+    return pa.Table.from_pandas(df, schema=pa.schema([(column, pa.string()) for column in columns]), preserve_index=False)
+
+
+def append_files(df, name, partition_cols, basename_template, columns, dataset_dir=DATASET_DIR):
+    """
+    DataFrame'i var olan Parquet veri setine yeni dosyalar olarak ekler
+
+    Veri setindeki diğer dosyalara dokunulmaz; aynı bölüme sonradan eklenen
+    satırlar o bölümde ayrı bir dosyada durur.
+
+    Args:
+        basename_template: Yazılacak dosyaların adı ('{i}' içermeli; veri setinde benzersiz olmalı)
+        columns: Veri setinin sütunları (tüm dosyalarda aynı şema için; hepsi metin olarak saklanır)
+
+    Returns:
+        Yazılan dosyaların veri seti klasörüne göre yolları
+    """
+    if len(df) == 0:
+        return []
+    root = dataset_path(name, dataset_dir)
+    written = []
+    ds.write_dataset(_string_table(df, columns), root, format='parquet',
+                     partitioning=ds.partitioning(pa.schema([(column, pa.string()) for column in partition_cols]), flavor='hive'),
+                     basename_template=basename_template, existing_data_behavior='overwrite_or_ignore',
+                     file_visitor=lambda file: written.append(os.path.relpath(file.path, root).replace(os.sep, '/')))
+    return written
+
+
+def read_files(name, files, columns=None, dataset_dir=DATASET_DIR):
+    """Veri setinin yalnızca verilen dosyalarını okur"""
+    root = dataset_path(name, dataset_dir)
+    paths = [os.path.join(root, file) for file in files if os.path.exists(os.path.join(root, file))]
+    if not paths:
+        return pd.DataFrame(columns=columns)
+    return ds.dataset(paths, format='parquet').to_table(columns=columns).to_pandas()
+
+
+def delete_files(name, files, dataset_dir=DATASET_DIR):
+    """Veri setinden verilen dosyaları (ve boşalan bölüm klasörlerini) siler"""
+    root = dataset_path(name, dataset_dir)
+    for file in files:
+        path = os.path.join(root, file)
+        if os.path.exists(path):
+            os.remove(path)
+        directory = os.path.dirname(path)
+        while os.path.abspath(directory) != os.path.abspath(root) and os.path.isdir(directory) and not os.listdir(directory):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+
+
+def write_dataset(df, name, partition_cols, dataset_dir=DATASET_DIR):
+    """
+    DataFrame'i bölümlenmiş veri seti olarak yazar (varsa eskisinin yerine)
+
+    Returns:
+        Veri setinin yolu
+    """
+    with DatasetWriter(name, partition_cols, dataset_dir) as writer:
+        writer.write(df)
+    return writer.path
+
+
+def read_dataset(name, columns=None, filters=None, csv_path=None, dataset_dir=DATASET_DIR):
+    """
+    Veri setini yalnızca istenen sütunlar ve satırlarla okur
+
+    Parquet veri setinde filtreler okumadan önce uygulanır: bölüm sütunlarına
+    (kaynak, kategori, tarih) ait filtreler eşleşmeyen klasörleri hiç açmaz,
+    diğer sütunlardaki filtreler dosya istatistikleriyle eşleşmeyen satır
+    gruplarını atlar. Yalnızca `columns` sütunları diskten okunur.
+
+    Args:
+        name: Veri setinin adı
+        columns: Okunacak sütunlar (None ise tümü)
+        filters: {'sütun': değer veya değer listesi}; tüm koşullar sağlanmalı
+        csv_path: Veri seti henüz oluşturulmadıysa okunacak eski CSV dosyası
+
+    Returns:
+        pd.DataFrame
+    """
+    path = dataset_path(name, dataset_dir)
+    if HAS_ARROW and os.path.isdir(path):
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        return dataset.to_table(columns=columns, filter=_expression(filters)).to_pandas()
+
+    if not os.path.exists(path):
+        if csv_path is None or not os.path.exists(csv_path):
+            raise FileNotFoundError(f"{path} veri seti bulunamadı")
+        path = csv_path
+
+    # CSV: parça parça oku, her parçada filtreyi uygula ve yalnızca istenen sütunları tut
+    usecols = None
+    if columns is not None:
+        usecols = list(dict.fromkeys(list(columns) + list(filters or {})))
+    chunks = [_apply_filters(chunk, filters)
+              for chunk in pd.read_csv(path, usecols=usecols, encoding='utf-8', chunksize=10000)]
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=usecols)
+    return df[list(columns)] if columns is not None else df
+
+
+def iter_dataset(name, columns=None, filters=None, chunksize=10000, csv_path=None, dataset_dir=DATASET_DIR):
+    """
+    Veri setini read_dataset ile aynı sütun ve filtre seçimiyle parça parça okur
+
+    Yields:
+        En fazla `chunksize` satırlık DataFrame'ler
+    """
+    path = dataset_path(name, dataset_dir)
+    if HAS_ARROW and os.path.isdir(path):
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        for batch in dataset.to_batches(columns=columns, filter=_expression(filters), batch_size=chunksize):
+            if batch.num_rows:
+                yield batch.to_pandas()
+        return
+
+    if not os.path.exists(path):
+        if csv_path is None or not os.path.exists(csv_path):
+            raise FileNotFoundError(f"{path} veri seti bulunamadı")
+        path = csv_path
+
+    usecols = None
+    if columns is not None:
+        usecols = list(dict.fromkeys(list(columns) + list(filters or {})))
+    for chunk in pd.read_csv(path, usecols=usecols, encoding='utf-8', chunksize=chunksize):
+        chunk = _apply_filters(chunk, filters)
+        if len(chunk):
+            yield chunk[list(columns)] if columns is not None else chunk
+
+
+def count_rows(name, filters=None, csv_path=None, dataset_dir=DATASET_DIR):
+    """
+    Veri setindeki (filtreye uyan) satır sayısı
+
+    Parquet veri setinde sayım dosya üst verilerinden yapılır, satırlar okunmaz.
+    """
+    path = dataset_path(name, dataset_dir)
+    if HAS_ARROW and os.path.isdir(path):
+        return ds.dataset(path, format='parquet', partitioning='hive').count_rows(filter=_expression(filters))
+    return len(read_dataset(name, columns=list(filters or {}) or None, filters=filters, csv_path=csv_path, dataset_dir=dataset_dir))
@@ -0,0 +1,179 @@
+import io
+import xml.etree.ElementTree as ET
+from contextlib import closing
+from urllib.parse import urljoin, urlparse
+
+# Türkçe karakterler -> kategori anahtarlarında kullanılan ASCII karşılıkları
+_ASCII = str.maketrans('çğıöşüÇĞİÖŞÜ', 'cgiosucgiosu')
+
+# Site haritası / RSS kaydında okunan alt elemanlar (ad alanı atılmış haliyle)
+_ENTRY_TAGS = {'sitemap', 'url', 'item', 'entry'}
+
+
+class DiscoverySpec:
+    """
+    Bir kaynağın site haritası ve RSS üzerinden link bulma tanımı
+
+    Args:
+        base_url: Sitenin kök adresi (robots.txt buradan okunur)
+        category_feeds: Kategori -> o kategoriye ait RSS / site haritası adresleri
+        sitemaps: robots.txt dışında okunacak genel site haritaları
+        category_paths: Kategori -> haber URL yolunun başlayabileceği önekler
+            (verilmeyen kategoriler için '/<kategori>/' kullanılır)
+        use_robots: robots.txt içindeki Sitemap: satırları okunsun mu
+        max_sitemaps: Site haritası dizinlerinden açılacak en fazla alt harita sayısı
+    """
+
+    def __init__(self, base_url, category_feeds=None, sitemaps=None, category_paths=None, use_robots=True, max_sitemaps=5):
+        self.base_url = base_url.rstrip('/')
+        self.category_feeds = category_feeds or {}
+        self.sitemaps = list(sitemaps or [])
+        self.category_paths = category_paths or {}
+        self.use_robots = use_robots
+        self.max_sitemaps = max_sitemaps
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1].lower()
+
+
+def iter_feed_entries(content):
+    """
+    Site haritası, site haritası dizini, RSS veya Atom belgesini akışla okur
+
+    Her kayıt okunduktan sonra bellekten atılır; bozuk belgelerde o ana kadar
+    okunan kayıtlar döndürülür.
+
+    Yields:
+        dict: {'kind': 'sitemap' | 'url', 'loc', 'lastmod', 'categories'}
+    """
+    entry = None
+    try:
+        for event, elem in ET.iterparse(io.BytesIO(content), events=('start', 'end')):
+            name = _local_name(elem.tag)
+            if event == 'start':
+                if name in _ENTRY_TAGS:
+                    entry = {'kind': 'sitemap' if name == 'sitemap' else 'url', 'loc': None, 'lastmod': '', 'categories': []}
+                    guid = None
+                continue
+
+            if entry is not None:
+                text = (elem.text or '').strip()
+                if name == 'loc' and text:
+                    entry['loc'] = text
+                elif name == 'link' and not entry['loc'] and elem.get('rel', 'alternate') == 'alternate':
+                    entry['loc'] = elem.get('href') or text or None
+                elif name == 'guid' and text.startswith('http'):
+                    guid = text
+                elif name in ('lastmod', 'pubdate', 'publication_date', 'updated') and text:
+                    entry['lastmod'] = text
+                elif name in ('category', 'keywords', 'section') and (text or elem.get('term')):
+                    entry['categories'].extend(part.strip() for part in (text or elem.get('term')).split(','))
+                elif name in _ENTRY_TAGS:
+                    entry['loc'] = entry['loc'] or guid
+                    if entry['loc']:
+                        yield entry
+                    entry = None
+            elem.clear()
+    except ET.ParseError:
+        return
+
+
+def _normalize(text):
+    return text.translate(_ASCII).lower().strip()
+
+
+class FeedDiscovery:
+    """
+    Site haritaları ve RSS beslemelerinden kategori bazında haber linkleri çıkarır
+
+    Liste sayfalarının tamamını indirmek yerine sitenin makine okunur dizinleri
+    okunur: kategori beslemeleri doğrudan o kategoriye, genel site haritalarındaki
+    kayıtlar ise URL yolu veya <category>/<news:keywords> değerlerine göre
+    kategorilere atanır.
+
+    Args:
+        engine: İndirmelerde kullanılacak FetchEngine
+        spec: Kaynağın DiscoverySpec'i
+        categories: Projede kullanılan kategori adları
+        max_age: Beslemeler için önbellek tazelik süresi (saniye)
+    """
+
+    def __init__(self, engine, spec, categories, max_age=0):
+        self.engine = engine
+        self.spec = spec
+        self.categories = list(categories)
+        self.max_age = max_age
+        self.requests = 0
+
+    def _fetch_all(self, urls):
+        self.requests += len(urls)
+        with closing(self.engine.fetch_all(urls, max_age=self.max_age)) as results:
+            for url, response, error in results:
+                if error is not None or response.status_code != 200:
+                    print(f"  ! Besleme alınamadı: {url} ({error or response.status_code})")
+                    continue
+                yield url, response
+
+    def robots_sitemaps(self):
+        """robots.txt içindeki Sitemap: satırları"""
+        sitemaps = []
+        for _, response in self._fetch_all([self.spec.base_url + '/robots.txt']):
+            for line in response.text.splitlines():
+                if line.lower().startswith('sitemap:'):
+                    sitemaps.append(urljoin(self.spec.base_url, line.split(':', 1)[1].strip()))
+        return sitemaps
+
+    def category_for(self, url, labels=()):
+        """Kaydı URL yoluna veya besleme kategorilerine göre proje kategorisine atar (yoksa None)"""
+        path = urlparse(url).path.lower()
+        for category in self.categories:
+            for prefix in self.spec.category_paths.get(category, ['/' + category + '/']):
+                if path.startswith(prefix):
+                    return category
+        for label in labels:
+            label = _normalize(label)
+            if label in self.categories:
+                return label
+        return None
+
+    def discover(self):
+        """
+        Returns:
+            dict: Kategori -> haber URL'leri (bulunma sırasıyla, tekrarsız)
+        """
+        links = {category: {} for category in self.categories}
+
+        # Kategori beslemeleri: kayıtlar doğrudan ilgili kategoriye
+        feed_categories = {}
+        for category, feeds in self.spec.category_feeds.items():
+            if category in links:
+                for feed in feeds:
+                    feed_categories[feed] = category
+
+        sitemaps = list(self.spec.sitemaps)
+        if self.spec.use_robots:
+            sitemaps.extend(url for url in self.robots_sitemaps() if url not in sitemaps)
+
+        pending = list(feed_categories) + sitemaps
+        opened_indexes = 0
+        while pending:
+            nested = []
+            for feed_url, response in self._fetch_all(pending):
+                for entry in iter_feed_entries(response.content):
+                    if entry['kind'] == 'sitemap':
+                        nested.append(entry)
+                        continue
+                    url = urljoin(feed_url, entry['loc'])
+                    category = feed_categories.get(feed_url) or self.category_for(url, entry['categories'])
+                    if category is not None and urlparse(url).netloc == urlparse(self.spec.base_url).netloc:
+                        links[category].setdefault(url, None)
+
+            # Site haritası dizinlerinden önce haber haritalarını, sonra en yenileri aç
+            nested.sort(key=lambda entry: entry['lastmod'], reverse=True)
+            nested.sort(key=lambda entry: 'news' not in entry['loc'].lower())
+            remaining = max(self.spec.max_sitemaps - opened_indexes, 0)
+            pending = [entry['loc'] for entry in nested[:remaining]]
+            opened_indexes += len(pending)
+
+        return {category: list(urls) for category, urls in links.items()}
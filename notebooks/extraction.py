@@ -0,0 +1,368 @@
+import re
+import threading
+
+import soupsieve
+from bs4.element import NavigableString, PreformattedString, Tag
+
+from html_parsing import soup_meta
+
+# Konteyner içinden metni toplanan etiketler
+PARAGRAPH_TAGS = ['p', 'h2', 'h3', 'h4', 'li', 'blockquote']
+
+# Metin yoğunluğu puanlaması: metni ayrı bir blok oluşturan etiketler
+BLOCK_TAGS = frozenset(PARAGRAPH_TAGS + ['h5', 'h6', 'pre', 'div', 'section', 'article', 'main', 'body',
+                                         'ul', 'ol', 'dl', 'dd', 'dt', 'table', 'tr', 'td', 'th'])
+# Metni hiç okunmayan etiketler (kod, gömülü içerik, menüler, başlık ve altbilgi, görsel altyazıları)
+SKIPPED_TAGS = frozenset(['script', 'style', 'noscript', 'template', 'svg', 'iframe', 'object', 'form', 'button',
+                          'select', 'nav', 'header', 'footer', 'aside', 'figure', 'h1'])
+# Kısa olsa da haber metninden sayılan blok etiketleri
+HEADING_TAGS = frozenset(['h2', 'h3', 'h4'])
+# class / id değerinde geçtiğinde alt ağacı atlanan kalıplar (ilgili haberler, paylaşım, oynatıcı, reklam...)
+BOILERPLATE_HINTS = re.compile(
+    r'related|ilgili|share|paylas|social|comment|yorum|breadcrumb|newsletter|subscribe|advert|reklam|banner|'
+    r'promo|sponsor|popular|recommend|oneri|tags|etiket|player|playlist|sidebar|widget|menu|cookie|modal|popup',
+    re.I)
+# Puanlamaya giren bloğun en az karakter sayısı
+MIN_BLOCK_CHARS = 25
+# Metninin bu oranından fazlası link olan bloklar içerikten sayılmaz
+MAX_LINK_DENSITY = 0.5
+
+
+class ExtractionSpec:
+    """
+    Bir kaynağın haber sayfasından başlık ve içerik çıkarma tanımı
+
+    Args:
+        title_selectors: Başlık için sırayla denenen CSS seçicileri
+        content_selectors: İçerik için sırayla denenen CSS seçicileri
+        title_meta: Başlık için önce bakılacak meta alanı (None ise yalnızca seçiciler kullanılır)
+        content_mode: 'container' ise ilk eşleşen konteynerdeki PARAGRAPH_TAGS metinleri,
+            'paragraphs' ise seçicinin eşleştiği tüm elemanların metinleri birleştirilir,
+            'density' ise ilk eşleşen konteyner (yoksa tüm sayfa) içinde ana metin bloğu
+            metin/link yoğunluğuna göre seçilir (bkz. main_content)
+        fallback_meta: İçerik yetersizse kullanılacak meta alanı
+        min_content_length: İçerik bu uzunluktan kısaysa fallback_meta kullanılır
+        stop_markers: Sayfada haber metninden sonra gelen bölümlerin başlangıçları
+            (ör. '<footer'); verilirse haber sayfası bunlardan biri görülünce indirilmeyi bırakır
+    """
+
+    def __init__(self, title_selectors, content_selectors, title_meta='og:title', content_mode='container',
+                 fallback_meta='og:description', min_content_length=1, stop_markers=None):
+        self.title_selectors = list(title_selectors)
+        self.content_selectors = list(content_selectors)
+        self.title_meta = title_meta
+        self.content_mode = content_mode
+        self.fallback_meta = fallback_meta
+        self.min_content_length = min_content_length
+        self.stop_markers = list(stop_markers or [])
+
+
+class SelectorCascade:
+    """
+    Sırayla denenen, bir kez derlenmiş CSS seçicileri
+
+    Her seçicinin isabet/ıska sayısı tutulur ve en çok eşleşen seçici öne
+    alınır; böylece aynı sitede her sayfada tekrarlanan ıskalar azalır.
+    İsabet sayısı eşit olan seçiciler tanımdaki öncelik sırasını korur.
+
+    Args:
+        selectors: CSS seçicileri (öncelik sırasına göre)
+    """
+
+    def __init__(self, selectors):
+        self.selectors = list(selectors)
+        self._compiled = [soupsieve.compile(selector) for selector in self.selectors]
+        self._lock = threading.Lock()
+        self._order = list(range(len(self.selectors)))
+        self.hits = [0] * len(self.selectors)
+        self.misses = [0] * len(self.selectors)
+
+    def _record(self, index, hit):
+        with self._lock:
+            if not hit:
+                self.misses[index] += 1
+                return
+            self.hits[index] += 1
+            # Eşleşen seçiciyi daha az isabet alan öncüllerinin önüne kaydır
+            position = self._order.index(index)
+            while position > 0 and self.hits[self._order[position - 1]] < self.hits[index]:
+                self._order[position - 1], self._order[position] = self._order[position], self._order[position - 1]
+                position -= 1
+
+    def select_one(self, soup):
+        """İlk eşleşen seçicinin ilk elemanını döndürür (yoksa None)"""
+        for index in list(self._order):
+            element = self._compiled[index].select_one(soup)
+            self._record(index, element is not None)
+            if element is not None:
+                return element
+        return None
+
+    def select(self, soup):
+        """İlk eşleşen seçicinin tüm elemanlarını döndürür (yoksa boş liste)"""
+        for index in list(self._order):
+            elements = self._compiled[index].select(soup)
+            self._record(index, bool(elements))
+            if elements:
+                return elements
+        return []
+
+    def stats(self):
+        """
+        Returns:
+            list: Denenme sırasına göre {'selector', 'hits', 'misses', 'hit_rate'} sözlükleri
+        """
+        with self._lock:
+            result = []
+            for index in self._order:
+                tried = self.hits[index] + self.misses[index]
+                result.append({
+                    'selector': self.selectors[index],
+                    'hits': self.hits[index],
+                    'misses': self.misses[index],
+                    'hit_rate': self.hits[index] / tried if tried else 0.0
+                })
+            return result
+
+
+class _Node:
+    """main_content geçişinde bir elemanın sayaçları"""
+
+    __slots__ = ('tag', 'parent', 'block', 'skip', 'link', 'start', 'end', 'text_len', 'link_len', 'score')
+
+    def __init__(self, tag, parent, start, skip=False):
+        self.tag = tag
+        self.parent = parent
+        self.block = self if tag.name in BLOCK_TAGS or parent is None else parent.block
+        self.skip = skip
+        self.link = tag.name == 'a' or (parent is not None and parent.link)
+        self.start = start
+        self.end = None
+        self.text_len = 0
+        self.link_len = 0
+        self.score = 0.0
+
+
+class _Segment:
+    """Aynı blok elemanına ait, arada başka blok olmayan ardışık metin parçaları"""
+
+    __slots__ = ('owner', 'position', 'parts', 'link_len', 'text')
+
+    def __init__(self, owner, position):
+        self.owner = owner
+        self.position = position
+        self.parts = []
+        self.link_len = 0
+        self.text = None
+
+
+def _skipped(tag):
+    """Etiket ve alt ağacı içerikten hariç tutulacak mı"""
+    if tag.name in SKIPPED_TAGS:
+        return True
+    attrs = tag.attrs
+    if not attrs:
+        return False
+    if 'hidden' in attrs or attrs.get('aria-hidden') == 'true':
+        return True
+    hints = attrs.get('class') or []
+    if isinstance(hints, str):
+        hints = [hints]
+    if 'id' in attrs:
+        hints = list(hints) + [attrs['id']]
+    return bool(hints) and BOILERPLATE_HINTS.search(' '.join(hints)) is not None
+
+
+def main_content(root, min_block_chars=MIN_BLOCK_CHARS, max_link_density=MAX_LINK_DENSITY):
+    """
+    Sayfanın ana metnini metin ve link yoğunluğuna göre bulur
+
+    DOM tek geçişte dolaşılır: her elemanın alt ağacındaki metin ve link metni
+    uzunluğu toplanır, metin blok elemanlarına (p, li, div...) göre parçalara
+    ayrılır. Yeterince uzun ve linkleri az olan her blok, içinde bulunduğu
+    konteynere puan verir (virgül sayısı ve uzunlukla artar; üst konteynere
+    yarısı). Konteyner puanı link yoğunluğuyla azaltılır ve en yüksek puanlı
+    konteyner (aynı seviyede yeterince puan alan kardeşleriyle) ana metin kabul
+    edilir. Bu bölgedeki bloklardan linkten oluşanlar (ilgili haberler, etiketler)
+    ve cümle içermeyen kısa parçalar ('SONRAKİ VİDEO' gibi arayüz yazıları) atılır.
+    Betikler, menüler, oynatıcı/paylaşım/reklam alanları (SKIPPED_TAGS,
+    BOILERPLATE_HINTS) hiç okunmaz.
+
+    Args:
+        root: Aranacak BeautifulSoup elemanı (sayfa veya seçicinin bulduğu konteyner)
+        min_block_chars: Puanlamaya giren bloğun en az karakter sayısı
+        max_link_density: Bloğun/konteynerin en fazla link metni oranı
+
+    Returns:
+        Ana metin (bulunamazsa boş metin)
+    """
+    # Açılan/kapanan her eleman sayacı artırır; bir elemanın alt ağacındaki metin
+    # parçalarının konumu (start, end) aralığına düşer
+    counter = 1
+    block_event = 0
+    top = _Node(root, None, 0)
+    stack = [top]
+    nodes = []
+    segments = []
+
+    def close(node):
+        nonlocal counter, block_event
+        counter += 1
+        node.end = counter
+        if node.block is node:
+            block_event = counter
+        parent = node.parent
+        if parent is not None:
+            parent.text_len += node.text_len
+            parent.link_len += node.link_len
+
+    for element in root.descendants:
+        parent = element.parent
+        while stack[-1].tag is not parent:
+            close(stack.pop())
+        current = stack[-1]
+
+        if isinstance(element, Tag):
+            node = _Node(element, current, counter, skip=current.skip or _skipped(element))
+            counter += 1
+            if node.block is node:
+                block_event = counter
+            stack.append(node)
+            nodes.append(node)
+        elif isinstance(element, NavigableString) and not isinstance(element, PreformattedString) and not current.skip:
+            block = current.block
+            segment = segments[-1] if segments else None
+            if segment is None or segment.owner is not block or segment.position < block_event:
+                if not element.strip():
+                    continue
+                segment = _Segment(block, counter)
+                segments.append(segment)
+            segment.parts.append(element)
+            length = len(element.strip())
+            current.text_len += length
+            if current.link:
+                current.link_len += length
+                segment.link_len += length
+
+    while stack:
+        close(stack.pop())
+
+    # Blok puanları: paragraf benzeri blok üst konteynerine, gevşek metin taşıyan
+    # konteyner (ör. doğrudan metin içeren div) kendisine puan verir
+    for segment in segments:
+        segment.text = ' '.join(''.join(segment.parts).split())
+        length = len(segment.text)
+        if length < min_block_chars or segment.link_len > length * max_link_density:
+            continue
+        score = 1 + segment.text.count(',') + min(length // 100, 3)
+        owner = segment.owner
+        target = owner.parent if owner.tag.name in PARAGRAPH_TAGS and owner.parent is not None else owner
+        target.score += score
+        if target.parent is not None:
+            target.parent.score += score / 2
+
+    def final_score(node):
+        if not node.score or not node.text_len:
+            return 0.0
+        return node.score * (1 - min(node.link_len / node.text_len, 1.0))
+
+    best = max([top] + nodes, key=final_score)
+    best_score = final_score(best)
+    if not best_score:
+        return ''
+
+    # İçeriği bölünmüş haberler için yeterince puan alan kardeş konteynerler de eklenir
+    regions = [best]
+    if best.parent is not None:
+        regions += [node for node in nodes
+                    if node.parent is best.parent and node is not best and final_score(node) >= best_score * 0.2]
+
+    paragraphs = []
+    for segment in segments:
+        if not any(region.start < segment.position < region.end for region in regions):
+            continue
+        length = len(segment.text)
+        if not length or segment.link_len > length * max_link_density:
+            continue
+        name = segment.owner.tag.name
+        if length < min_block_chars and not (name in HEADING_TAGS or
+                                             (name in PARAGRAPH_TAGS and any(mark in segment.text for mark in '.!?'))):
+            continue
+        paragraphs.append(segment.text)
+    return ' '.join(paragraphs)
+
+
+class Extractor:
+    """
+    ExtractionSpec'i uygulayan ortak çıkarma motoru
+
+    Kaynak betiklerinde `parse_news` olarak kullanılır: `parse_news(news_soup, meta)`
+    çağrısı (title, content) döndürür.
+
+    Args:
+        spec: Kaynağın ExtractionSpec'i
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.title_cascade = SelectorCascade(spec.title_selectors)
+        self.content_cascade = SelectorCascade(spec.content_selectors)
+
+    def __call__(self, news_soup, meta=None):
+        """
+        Haber sayfasından başlık ve içeriği çıkarır
+
+        Args:
+            news_soup: Haber sayfasının (en azından <body>) BeautifulSoup nesnesi
+            meta: <head> meta alanları (read_head_meta); verilmezse news_soup içinden okunur
+
+        Returns:
+            (title, content): Bulunamayan alanlar None döner
+        """
+        if meta is None:
+            meta = soup_meta(news_soup)
+        spec = self.spec
+
+        # Haber başlığı - önce meta alanı, yoksa seçiciler
+        title = meta.get(spec.title_meta) if spec.title_meta else None
+        if not title:
+            title_elem = self.title_cascade.select_one(news_soup)
+            if title_elem:
+                title = title_elem.text.strip()
+
+        # Haber metni
+        content = ""
+        if spec.content_mode == 'paragraphs':
+            content_parts = self.content_cascade.select(news_soup)
+            content = ' '.join([p.text.strip() for p in content_parts])
+        elif spec.content_mode == 'density':
+            # Seçiciler yalnızca aramayı daraltır; hiçbiri eşleşmezse tüm sayfa puanlanır
+            content_container = self.content_cascade.select_one(news_soup) if spec.content_selectors else None
+            content = main_content(content_container if content_container is not None else news_soup)
+        else:
+            content_container = self.content_cascade.select_one(news_soup)
+            if content_container:
+                # Önce paragrafları bul, bulunamadıysa tüm metni al
+                paragraphs = content_container.find_all(PARAGRAPH_TAGS)
+                if paragraphs:
+                    content = ' '.join([p.text.strip() for p in paragraphs])
+                if not content:
+                    content = content_container.text.strip()
+
+        # İçerik yetersizse meta açıklamasını kullan
+        if len(content) < spec.min_content_length and spec.fallback_meta:
+            content = meta.get(spec.fallback_meta, content)
+
+        return title or None, content or None
+
+    def stats(self):
+        """Başlık ve içerik seçicilerinin isabet istatistikleri"""
+        return {'title': self.title_cascade.stats(), 'content': self.content_cascade.stats()}
+
+    def print_stats(self):
+        """Seçici isabet istatistiklerini denenme sırasıyla yazdırır"""
+        print("Seçici istatistikleri (isabet / ıska):")
+        for field, rows in self.stats().items():
+            for row in rows:
+                if row['hits'] or row['misses']:
+                    print(f"  - {field} {row['selector']}: {row['hits']} / {row['misses']} (%{row['hit_rate'] * 100:.0f})")
@@ -0,0 +1,220 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from urllib.parse import urlparse
+
+import requests
+
+from crawl_metrics import CrawlMetrics
+from http_client import get_client
+from rate_limiter import get_limiter
+
+# Hız sınırlayıcıya hata olarak bildirilen ve yeniden denenen durum kodları
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class _HostSlot:
+    """Tek bir sunucu için eşzamanlılık durumunu tutar"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.pending = deque()
+
+
+def _retry_after(response):
+    """Retry-After başlığındaki saniye değeri (yoksa None)"""
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+class FetchEngine:
+    """
+    Haber kaynaklarının ortak kullandığı eşzamanlı indirme katmanı
+
+    İstekler sunucu (host) bazında kuyruklanır: her sunucuya aynı anda en fazla
+    `per_host` istek gönderilir ve istek hızı sunucu bazında HostRateLimiter ile
+    ayarlanır. 429, 5xx ve zaman aşımlarında istek geri çekilme süresi sonunda
+    `max_retries` kez yeniden denenir; devre kesicisi açık sunuculara istek
+    yapılmaz. Bir sunucu için beklenirken diğer sunucuların istekleri ve gelen
+    sayfaların işlenmesi durmaz.
+
+    Args:
+        max_workers: Toplam iş parçacığı (thread) sayısı
+        per_host: Aynı sunucuya aynı anda gönderilebilecek en fazla istek sayısı
+        headers: Her isteğe eklenecek ek HTTP başlıkları
+        client: Kullanılacak HttpClient (verilmezse süreç içinde paylaşılan istemci)
+        limiter: Kullanılacak HostRateLimiter (verilmezse süreç içinde paylaşılan sınırlayıcı)
+        max_retries: 429 / 5xx / zaman aşımı sonrası en fazla yeniden deneme sayısı
+        metrics: İstek ölçümlerinin yazılacağı CrawlMetrics (verilmezse yenisi oluşturulur)
+    """
+
+    def __init__(self, max_workers=16, per_host=4, headers=None, client=None, limiter=None, max_retries=2, metrics=None):
+        self.per_host = per_host
+        self.headers = headers
+        self.max_retries = max_retries
+        self.metrics = metrics if metrics is not None else CrawlMetrics()
+        self.client = client if client is not None else get_client()
+        self.limiter = limiter if limiter is not None else get_limiter()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def submit(self, url, headers=None, max_age=0, max_bytes=None, stop_when=None):
+        """
+        Bir URL'yi indirme kuyruğuna ekler
+
+        Args:
+            url: İndirilecek adres
+            headers: Bu isteğe özel ek başlıklar
+            max_age: Önbellekteki kaydın istek yapılmadan kullanılabileceği en fazla yaş (saniye)
+            max_bytes: Gövdeden okunacak en fazla bayt (aşan sayfalar kesilir ve bildirilir)
+            stop_when: Gereken kısım okunduğunda True döndüren fonksiyon (bkz. HttpClient.get)
+
+        Returns:
+            concurrent.futures.Future: Sonucu `requests.Response` olan future
+        """
+        future = Future()
+        host = urlparse(url).netloc
+        task = (future, url, headers or self.headers, max_age, max_bytes, stop_when)
+
+        with self._lock:
+            slot = self._hosts.setdefault(host, _HostSlot())
+            if slot.in_flight < self.per_host:
+                slot.in_flight += 1
+            else:
+                slot.pending.append(task)
+                task = None
+
+        if task is not None:
+            self._executor.submit(self._run, host, *task)
+        return future
+
+    def fetch(self, url, headers=None, max_age=0):
+        """Bir URL'yi indirir ve yanıtı döndürür (kategori sayfaları gibi tekil istekler için)"""
+        return self.submit(url, headers=headers, max_age=max_age).result()
+
+    def fetch_all(self, urls, headers=None, max_age=0, max_bytes=None, stop_when=None):
+        """
+        URL listesini eşzamanlı indirir, yanıtları tamamlanma sırasına göre döndürür
+
+        Üreteç (generator) erken kapatılırsa (ör. hedef sayıya ulaşıldığında `break`)
+        henüz başlamamış istekler iptal edilir.
+
+        Yields:
+            (url, response, error): Başarılı isteklerde error None, hatalı isteklerde response None
+        """
+        futures = {self.submit(url, headers=headers, max_age=max_age, max_bytes=max_bytes, stop_when=stop_when): url
+                   for url in urls}
+        try:
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    yield url, future.result(), None
+                except Exception as e:
+                    yield url, None, e
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _get(self, host, url, headers, max_age, max_bytes=None, stop_when=None):
+        """İsteği hız sınırlayıcıdan izin alarak yapar; geçici hatalarda geri çekilip yeniden dener"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.metrics.record_sleep(host, self.limiter.acquire(host))
+            except Exception as e:
+                self.metrics.record_error(host, e)
+                raise
+            started = time.monotonic()
+            try:
+                response = self.client.get(url, headers=headers, max_age=max_age, max_bytes=max_bytes, stop_when=stop_when)
+            except requests.RequestException as e:
+                self.limiter.record_failure(host)
+                self.metrics.record_error(host, e)
+                if attempt == self.max_retries:
+                    raise
+                continue
+            except BaseException as e:
+                # Sonucu kaydedilmeyen istek (ör. stop_when, önbellek/arşiv yazma hatası) de başarısız
+                # sayılır; devre kesicinin deneme isteği açık kalıp sunucuyu kalıcı olarak kapatmasın
+                self.limiter.record_failure(host)
+                self.metrics.record_error(host, e)
+                raise
+
+            latency = time.monotonic() - started
+            self.metrics.record_response(host, response, latency)
+            if response.status_code in RETRY_STATUSES:
+                self.limiter.record_failure(host, _retry_after(response))
+                self.metrics.record_error(host, f'HTTP {response.status_code}')
+                # Gövde kullanılmayacak: bağlantı havuza hemen geri verilsin
+                response.close()
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+                continue
+
+            self.limiter.record_success(host, latency)
+            truncated = getattr(response, 'truncated', None)
+            if truncated == 'max_bytes':
+                print(f"  ! Sayfa {max_bytes // 1024} KB sınırını aştı, kalanı indirilmedi: {url}")
+                self.metrics.record_event('oversized')
+            elif truncated == 'complete':
+                self.metrics.record_event('early_stop')
+            return response
+
+    def _run(self, host, future, url, headers, max_age, max_bytes=None, stop_when=None):
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    # Önbellekten verilebilen yanıtlar için hız sınırı uygulanmaz
+                    response = self.client.get_cached(url, max_age)
+                    if response is None:
+                        response = self._get(host, url, headers, max_age, max_bytes, stop_when)
+                    else:
+                        self.metrics.record_response(host, response, cached=True)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(response)
+        finally:
+            self._release(host)
+
+    def _release(self, host):
+        """Biten isteğin yerine aynı sunucunun kuyruğundaki bir sonraki isteği başlatır"""
+        next_task = None
+        with self._lock:
+            slot = self._hosts[host]
+            while slot.pending:
+                task = slot.pending.popleft()
+                if not task[0].cancelled():
+                    next_task = task
+                    break
+            if next_task is None:
+                slot.in_flight -= 1
+
+        if next_task is not None:
+            self._executor.submit(self._run, host, *next_task)
+
+    def print_stats(self):
+        """Bağlantı, hız sınırlayıcı, önbellek ve ölçüm özetlerini yazdırır"""
+        self.client.print_stats()
+        self.limiter.print_stats()
+        if self.client.cache is not None:
+            self.client.cache.print_stats()
+        self.metrics.print_summary()
+
+    def close(self):
+        """Bekleyen istekleri iptal eder ve iş parçacıklarını kapatır"""
+        with self._lock:
+            for slot in self._hosts.values():
+                for task in slot.pending:
+                    task[0].cancel()
+                slot.pending.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
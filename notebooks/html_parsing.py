@@ -0,0 +1,162 @@
+import codecs
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml kuruluysa C tabanlı ayrıştırıcı kullanılır (html.parser'dan birkaç kat hızlı)
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+# <head> içinden okunan meta alanları
+HEAD_META_KEYS = ('og:title', 'og:description', 'description')
+
+_CONTENT_TYPE_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.I)
+
+
+def declared_charset(content, content_type=None):
+    """
+    Sayfanın bildirdiği karakter kodlamasını bulur
+
+    Önce Content-Type başlığındaki charset, yoksa sayfanın ilk 2 KB'ındaki
+    <meta charset> etiketi kullanılır. Kodlama tahmin edilmez.
+
+    Returns:
+        Kodlama adı veya None
+    """
+    for match in (_CONTENT_TYPE_CHARSET.search(content_type or ''), _META_CHARSET.search(content[:2048])):
+        if match:
+            charset = match.group(1)
+            if isinstance(charset, bytes):
+                charset = charset.decode('ascii', 'ignore')
+            try:
+                return codecs.lookup(charset).name
+            except LookupError:
+                continue
+    return None
+
+
+def article_end_reached(markers):
+    """
+    Akışla indirilen sayfada haber bölümünün bittiğini anlayan fonksiyon üretir
+
+    Dönen fonksiyon `(body, start)` ile çağrılır: `body` o ana kadar okunan gövde,
+    `start` son okunan parçanın başladığı konumdur. </head> okunduktan (meta
+    alanları tamamlandıktan) sonra işaretlerden biri görülürse True döner. Yalnızca
+    yeni okunan kısım aranır; her istek için aynı fonksiyon kullanılabilir.
+
+    Args:
+        markers: Haber metninden sonra gelen bölümlerin başlangıcı (ör. '<footer', 'class="comments')
+    """
+    markers = [marker.encode('utf-8').lower() if isinstance(marker, str) else marker.lower() for marker in markers]
+    overlap = max(len(marker) for marker in markers + [b'</head>'])
+
+    def reached(body, start):
+        head_end = body.find(b'</head>')
+        if head_end < 0:
+            head_end = body.find(b'</HEAD>')
+            if head_end < 0:
+                return False
+        window = bytes(body[max(start - overlap, head_end):]).lower()
+        return any(marker in window for marker in markers)
+
+    return reached
+
+
+def make_soup(content, parser=None, encoding=None, body_only=False):
+    """
+    Sayfadan BeautifulSoup nesnesi oluşturur
+
+    Args:
+        content: Sayfanın ham baytları
+        parser: BeautifulSoup ayrıştırıcısı (varsayılan: DEFAULT_PARSER)
+        encoding: Bilinen kodlama; verilirse kodlama tespiti atlanır
+        body_only: True ise yalnızca <body> ağacı kurulur (<head> atlanır)
+    """
+    return BeautifulSoup(
+        content,
+        parser or DEFAULT_PARSER,
+        from_encoding=encoding,
+        parse_only=SoupStrainer('body') if body_only else None
+    )
+
+
+class _HeadFinished(Exception):
+    pass
+
+
+class _HeadMetaParser(HTMLParser):
+    """<head> içindeki meta etiketlerini toplar, <body> başlayınca durur"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'meta':
+            attrs = dict(attrs)
+            key = (attrs.get('property') or attrs.get('name') or '').lower()
+            if key in HEAD_META_KEYS and key not in self.meta and attrs.get('content'):
+                self.meta[key] = attrs['content']
+        elif tag == 'body':
+            raise _HeadFinished()
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            raise _HeadFinished()
+
+
+def read_head_meta(content, encoding=None, chunk_size=8192):
+    """
+    Sayfanın <head> bölümünden og:title / og:description / description değerlerini okur
+
+    Sayfa parça parça akıtılır ve <head> bitince durulur; gövde için DOM kurulmaz.
+
+    Returns:
+        dict: Bulunan meta anahtarları -> değerleri
+    """
+    parser = _HeadMetaParser()
+    decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    try:
+        for start in range(0, len(content), chunk_size):
+            parser.feed(decoder.decode(content[start:start + chunk_size]))
+    except _HeadFinished:
+        pass
+    return parser.meta
+
+
+def soup_meta(soup):
+    """Tam sayfa soup nesnesinden read_head_meta ile aynı sözlüğü üretir"""
+    meta = {}
+    for key in HEAD_META_KEYS:
+        attribute = 'name' if key == 'description' else 'property'
+        tag = soup.find('meta', attrs={attribute: key})
+        if tag and tag.get('content'):
+            meta[key] = tag['content']
+    return meta
+
+
+def parse_article(content, parse_news, parser=None, content_type=None):
+    """
+    Haber sayfasını hızlı yoldan ayrıştırır
+
+    Meta alanları <head> üzerinden akışla okunur, yalnızca <body> için DOM kurulur
+    ve bildirilen kodlama doğrudan ayrıştırıcıya verilir.
+
+    Args:
+        content: Sayfanın ham baytları
+        parse_news: (news_soup, meta) alıp (title, content) döndüren kaynak fonksiyonu
+        parser: BeautifulSoup ayrıştırıcısı (varsayılan: DEFAULT_PARSER)
+        content_type: Yanıtın Content-Type başlığı
+    """
+    encoding = declared_charset(content, content_type)
+    meta = read_head_meta(content, encoding)
+    news_soup = make_soup(content, parser, encoding, body_only=True)
+    if news_soup.find() is None:
+        # <body> etiketi olmayan sayfa parçası: tüm sayfayı ayrıştır
+        news_soup = make_soup(content, parser, encoding)
+    return parse_news(news_soup, meta)
@@ -0,0 +1,180 @@
+import gzip
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.client import responses as HTTP_REASONS
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from http_cache import normalize_url
+
+ARCHIVE_DIR = 'data/archive'
+
+# Gövde çözülmüş halde saklandığı için aktarıma özel başlıklar arşive yazılmaz
+_SKIPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+
+class ArchiveWriter:
+    """
+    İndirilen yanıtları WARC benzeri, sıkıştırılmış bir arşiv dosyasına ekler
+
+    Her yanıt ayrı bir gzip üyesi olarak yazılan bir WARC/1.0 'response' kaydıdır
+    (kayıt başlıkları + HTTP durum satırı, başlıklar ve gövde); dosya standart
+    .warc.gz araçlarıyla da okunabilir. Birden fazla iş parçacığı aynı arşive yazabilir.
+
+    Args:
+        path: Arşiv dosyası (ör. data/archive/cnnturk.warc.gz); varsa sonuna eklenir
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.records = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'ab')
+
+    def record(self, url, response):
+        """Yanıtı `url` adresiyle arşive yazar"""
+        reason = response.reason or HTTP_REASONS.get(response.status_code, '')
+        lines = [f'HTTP/1.1 {response.status_code} {reason}']
+        for name, value in response.headers.items():
+            if name.lower() not in _SKIPPED_HEADERS:
+                lines.append(f'{name}: {value}')
+        body = response.content or b''
+        lines.append(f'Content-Length: {len(body)}')
+        block = ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8') + body
+
+        warc_headers = [
+            'WARC/1.0',
+            'WARC-Type: response',
+            f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>',
+            f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}",
+            f'WARC-Target-URI: {url}',
+            'Content-Type: application/http; msgtype=response',
+            f'Content-Length: {len(block)}'
+        ]
+        record = ('\r\n'.join(warc_headers) + '\r\n\r\n').encode('utf-8') + block + b'\r\n\r\n'
+        data = gzip.compress(record, compresslevel=6)
+        with self._lock:
+            self._file.write(data)
+            self._file.flush()
+            self.records += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _read_headers(stream):
+    """Boş satıra kadar 'Ad: değer' satırlarını okur"""
+    headers = CaseInsensitiveDict()
+    while True:
+        line = stream.readline()
+        if not line or line in (b'\r\n', b'\n'):
+            return headers
+        name, _, value = line.decode('utf-8', 'replace').partition(':')
+        headers[name.strip()] = value.strip()
+
+
+def iter_archive(path):
+    """
+    Arşivdeki yanıt kayıtlarını sırayla okur
+
+    Yields:
+        dict: {'url', 'status', 'reason', 'headers', 'body'}
+    """
+    with gzip.open(path, 'rb') as stream:
+        while True:
+            line = stream.readline()
+            if not line:
+                return
+            if not line.startswith(b'WARC/'):
+                continue
+            warc = _read_headers(stream)
+            block = stream.read(int(warc.get('Content-Length', 0)))
+            if warc.get('WARC-Type') != 'response':
+                continue
+
+            status_line, _, rest = block.partition(b'\r\n')
+            head, _, body = rest.partition(b'\r\n\r\n')
+            parts = status_line.decode('utf-8', 'replace').split(' ', 2)
+            headers = CaseInsensitiveDict()
+            for header in head.decode('utf-8', 'replace').split('\r\n'):
+                if ':' in header:
+                    name, _, value = header.partition(':')
+                    headers[name.strip()] = value.strip()
+            yield {
+                'url': warc.get('WARC-Target-URI'),
+                'status': int(parts[1]),
+                'reason': parts[2] if len(parts) > 2 else '',
+                'headers': headers,
+                'body': body
+            }
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    İstekleri ağ yerine kayıtlı arşivden yanıtlayan requests taşıma katmanı
+
+    Kazıyıcılar canlı sitelere hiç bağlanmadan, her çalıştırmada aynı sayfalarla
+    ve ağ gecikmesi olmadan çalıştırılabilir. Arşivde bulunmayan adresler için
+    404 döndürülür. Aynı adres birden fazla kez kaydedildiyse son kayıt kullanılır.
+
+    Args:
+        paths: Arşiv dosyası veya dosyaları
+    """
+
+    def __init__(self, paths):
+        super().__init__()
+        if isinstance(paths, str):
+            paths = [paths]
+        self._lock = threading.Lock()
+        self._records = {}
+        for path in paths:
+            for record in iter_archive(path):
+                self._records[normalize_url(record['url'])] = record
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    def send(self, request, **kwargs):
+        record = self._records.get(normalize_url(request.url))
+        with self._lock:
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if record is None:
+            response.status_code = 404
+            response.reason = 'Not Found'
+            response._content = b''
+            response.headers = CaseInsensitiveDict({'X-Replay-Miss': '1'})
+        else:
+            response.status_code = record['status']
+            response.reason = record['reason']
+            response._content = record['body']
+            response.headers = CaseInsensitiveDict(record['headers'])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def close(self):
+        pass
+
+    def print_stats(self):
+        """Arşivden karşılanan / bulunamayan istek sayılarını yazdırır"""
+        print(f"Arşiv: {len(self)} kayıt, {self.hits} isabet, {self.misses} bulunamadı")
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Yanıtla birlikte saklanan başlıklar (gövde çözülmüş halde saklandığı için
+# Content-Encoding / Content-Length saklanmaz)
+STORED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date']
+
+FOREVER = math.inf
+
+
+class CachePolicy:
+    """
+    Bir kaynak için önbellek tazelik süreleri (saniye)
+
+    Süresi dolmamış kayıtlar hiç istek yapılmadan önbellekten verilir; süresi dolan
+    kayıtlar ETag / Last-Modified ile koşullu istekle doğrulanır.
+
+    Args:
+        listing_ttl: Kategori / liste sayfaları için tazelik süresi
+        article_ttl: Haber sayfaları için tazelik süresi (yayınlanan haberler değişmediği için varsayılan sınırsız)
+    """
+
+    def __init__(self, listing_ttl=15 * 60, article_ttl=FOREVER):
+        self.listing_ttl = listing_ttl
+        self.article_ttl = article_ttl
+
+
+def normalize_url(url):
+    """Önbellek anahtarı için URL'yi normalleştirir (küçük harf şema/sunucu, sıralı sorgu, parçasız)"""
+    parts = urlsplit(url.strip())
+    netloc = parts.netloc.lower()
+    if parts.scheme == 'https' and netloc.endswith(':443'):
+        netloc = netloc[:-4]
+    elif parts.scheme == 'http' and netloc.endswith(':80'):
+        netloc = netloc[:-3]
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path or '/', query, ''))
+
+
+class CacheStats:
+    """Önbellek isabet sayaçları"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stored = 0
+
+    def record(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def summary(self):
+        with self._lock:
+            total = self.hits + self.revalidated + self.misses
+            return {
+                'requests': total,
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'stored': self.stored,
+                'hit_rate': (self.hits + self.revalidated) / total if total else 0.0
+            }
+
+
+class HttpCache:
+    """
+    Normalleştirilmiş URL ile anahtarlanan kalıcı (disk üzerinde) HTTP yanıt önbelleği
+
+    Her kayıt iki dosyadan oluşur: `<anahtar>.json` (URL, durum kodu, başlıklar,
+    zaman bilgisi) ve `<anahtar>.body` (çözülmüş yanıt gövdesi).
+
+    Args:
+        cache_dir: Önbellek klasörü
+    """
+
+    def __init__(self, cache_dir='data/cache/http'):
+        self.cache_dir = cache_dir
+        self.stats = CacheStats()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()
+        folder = os.path.join(self.cache_dir, key[:2])
+        return os.path.join(folder, key + '.json'), os.path.join(folder, key + '.body')
+
+    def _load_meta(self, url):
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _build_response(self, url, meta):
+        _, body_path = self._paths(url)
+        with open(body_path, 'rb') as f:
+            body = f.read()
+        response = requests.Response()
+        response.status_code = meta['status']
+        response._content = body
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.url = meta.get('final_url', url)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def get_fresh(self, url, max_age):
+        """
+        Tazelik süresi dolmamış bir kayıt varsa istek yapmadan yanıtı döndürür
+
+        Returns:
+            requests.Response veya None
+        """
+        if not max_age:
+            return None
+        meta = self._load_meta(url)
+        if meta is None or time.time() - meta['validated_at'] > max_age:
+            return None
+        try:
+            response = self._build_response(url, meta)
+        except OSError:
+            return None
+        self.stats.record('hits')
+        return response
+
+    def conditional_headers(self, url):
+        """Önbellekteki kayıt için If-None-Match / If-Modified-Since başlıklarını üretir"""
+        meta = self._load_meta(url)
+        if meta is None:
+            return {}
+        headers = {}
+        stored = CaseInsensitiveDict(meta['headers'])
+        if stored.get('ETag'):
+            headers['If-None-Match'] = stored['ETag']
+        if stored.get('Last-Modified'):
+            headers['If-Modified-Since'] = stored['Last-Modified']
+        return headers
+
+    def revalidated(self, url):
+        """304 yanıtı sonrası kaydın doğrulama zamanını günceller ve önbellekteki yanıtı döndürür"""
+        meta = self._load_meta(url)
+        if meta is None:
+            return None
+        meta['validated_at'] = time.time()
+        self._write_meta(url, meta)
+        self.stats.record('revalidated')
+        return self._build_response(url, meta)
+
+    def store(self, url, response):
+        """200 yanıtını önbelleğe yazar"""
+        self.stats.record('misses')
+        if response.status_code != 200:
+            return
+
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        now = time.time()
+        meta = {
+            'url': url,
+            'final_url': response.url,
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+            'stored_at': now,
+            'validated_at': now
+        }
+
+        tmp_path = f'{body_path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(response.content)
+        os.replace(tmp_path, body_path)
+        self._write_meta(url, meta)
+        self.stats.record('stored')
+
+    def _write_meta(self, url, meta):
+        meta_path, _ = self._paths(url)
+        tmp_path = f'{meta_path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    def print_stats(self):
+        """Önbellek isabet oranı özetini yazdırır"""
+        summary = self.stats.summary()
+        if not summary['requests']:
+            return
+        print(
+            f"Önbellek: {summary['requests']} istek, {summary['hits']} doğrudan isabet, "
+            f"{summary['revalidated']} doğrulama (304), {summary['misses']} indirme "
+            f"- isabet oranı %{summary['hit_rate'] * 100:.1f}"
+        )
@@ -0,0 +1,243 @@
+import requests
+import threading
+from collections import defaultdict
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib.parse import urlparse
+
+from http_cache import HttpCache
+
+# brotli kuruluysa urllib3 'br' kodlamasını otomatik çözer
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive'
+}
+
+# (bağlantı kurma, okuma) zaman aşımları - saniye
+DEFAULT_TIMEOUT = (5, 20)
+
+# Sınırlı indirmede gövdenin okunduğu parça boyutu (bayt)
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+class ConnectionStats:
+    """Açılan ve yeniden kullanılan bağlantı sayılarını sunucu bazında tutar"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.connections_opened = defaultdict(int)
+
+    def record_request(self, host):
+        with self._lock:
+            self.requests[host] += 1
+
+    def record_new_connection(self, host):
+        with self._lock:
+            self.connections_opened[host] += 1
+
+    def summary(self):
+        """
+        Returns:
+            dict: host -> {'requests', 'opened', 'reused'}
+        """
+        with self._lock:
+            hosts = set(self.requests) | set(self.connections_opened)
+            result = {}
+            for host in sorted(hosts):
+                opened = self.connections_opened[host]
+                total = self.requests[host]
+                result[host] = {
+                    'requests': total,
+                    'opened': opened,
+                    'reused': max(total - opened, 0)
+                }
+            return result
+
+
+def _counting_pool(base_class, stats):
+    """Yeni bağlantı açıldığında sayacı artıran bir urllib3 havuz sınıfı üretir"""
+
+    class CountingPool(base_class):
+        def _new_conn(self):
+            stats.record_new_connection(self.host)
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class _PooledAdapter(HTTPAdapter):
+    """Bağlantı sayaçlarını tutan, yeniden deneme yapmayan HTTPAdapter"""
+
+    def __init__(self, stats, pool_maxsize):
+        self._stats = stats
+        super().__init__(pool_connections=32, pool_maxsize=pool_maxsize, max_retries=0, pool_block=False)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool(HTTPConnectionPool, self._stats),
+            'https': _counting_pool(HTTPSConnectionPool, self._stats)
+        }
+
+
+def _read_bounded(response, max_bytes=None, stop_when=None):
+    """
+    Yanıt gövdesini parça parça okur; sınır aşılınca veya `stop_when` True dönünce durur
+
+    Okuma erken biterse bağlantı kapatılır (kalan gövde hiç aktarılmaz) ve yanıt
+    `truncated` özelliğiyle işaretlenir: 'max_bytes' (boyut sınırı aşıldı) veya
+    'complete' (gereken kısım okundu). Tamamı okunan yanıtlarda `truncated` None'dır.
+    """
+    if response.raw is None or not hasattr(response.raw, 'read'):
+        # Bellekteki yanıtlar (ör. arşivden oynatılanlar) aynı kurallarla kesilir
+        chunks = requests.utils.iter_slices(response.content, STREAM_CHUNK_SIZE)
+    else:
+        chunks = response.iter_content(STREAM_CHUNK_SIZE)
+
+    body = bytearray()
+    truncated = None
+    for chunk in chunks:
+        start = len(body)
+        body += chunk
+        if max_bytes is not None and len(body) > max_bytes:
+            del body[max_bytes:]
+            truncated = 'max_bytes'
+            break
+        if stop_when is not None and stop_when(body, start):
+            truncated = 'complete'
+            break
+
+    if truncated is not None and response.raw is not None:
+        response.close()
+    response._content = bytes(body)
+    response._content_consumed = True
+    response.truncated = truncated
+    return response
+
+
+class HttpClient:
+    """
+    Tüm kazıyıcıların paylaştığı, bağlantı havuzlu (keep-alive) HTTP istemcisi
+
+    Aynı sunucuya yapılan istekler havuzdaki açık bağlantıları yeniden kullanır;
+    böylece TCP ve TLS el sıkışması her haber için tekrarlanmaz. Sıkıştırılmış
+    aktarım (gzip/deflate, kuruluysa brotli) istenir ve her isteğe zaman aşımı uygulanır.
+    Önbellek verilirse taze kayıtlar istek yapılmadan döndürülür, eski kayıtlar
+    koşullu istekle (If-None-Match / If-Modified-Since) doğrulanır.
+
+    Args:
+        pool_maxsize: Her sunucu için havuzda tutulacak en fazla bağlantı sayısı
+        host_pool_sizes: Belirli sunucular için havuz boyutu ({'www.sabah.com.tr': 8} gibi)
+        timeout: (bağlantı, okuma) zaman aşımı - saniye
+        headers: Oturumun varsayılan HTTP başlıkları
+        cache: Kullanılacak HttpCache (None ise önbellek kullanılmaz)
+        archive: Verilirse ağdan gelen her yanıt bu ArchiveWriter'a kaydedilir
+        replay: Verilirse istekler ağa gitmeden bu ReplayAdapter'dan (kayıtlı arşivden) yanıtlanır
+    """
+
+    def __init__(self, pool_maxsize=8, host_pool_sizes=None, timeout=DEFAULT_TIMEOUT, headers=None, cache=None,
+                 archive=None, replay=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.archive = archive
+        self.replay = replay
+        self.stats = ConnectionStats()
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+
+        adapter = _PooledAdapter(self.stats, pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Sunucuya özel havuz boyutları (requests en uzun eşleşen öneki seçer)
+        for host, size in (host_pool_sizes or {}).items():
+            host_adapter = _PooledAdapter(self.stats, size)
+            self.session.mount(f'https://{host}/', host_adapter)
+            self.session.mount(f'http://{host}/', host_adapter)
+
+        if replay is not None:
+            self.session.adapters.clear()
+            self.session.mount('http://', replay)
+            self.session.mount('https://', replay)
+
+    def get_cached(self, url, max_age):
+        """Önbellekte `max_age` saniyeden yeni bir kayıt varsa onu döndürür, yoksa None"""
+        if self.cache is None:
+            return None
+        return self.cache.get_fresh(url, max_age)
+
+    def get(self, url, headers=None, timeout=None, max_age=0, max_bytes=None, stop_when=None, **kwargs):
+        """
+        Havuzdaki bir bağlantı üzerinden GET isteği yapar
+
+        Args:
+            max_age: Önbellekteki kaydın istek yapılmadan kullanılabileceği en fazla yaş (saniye)
+            max_bytes: Verilirse gövdenin en fazla bu kadar baytı okunur; aşan yanıtlar
+                `truncated = 'max_bytes'` ile işaretlenir
+            stop_when: `(body, start)` alıp gereken kısım okunduğunda True döndüren fonksiyon
+                (ör. html_parsing.article_end_reached); True dönünce okuma durdurulur
+
+        Yarıda kesilen (`truncated` None olmayan) yanıtlar önbelleğe yazılmaz: eksik gövde
+        sayfanın tamamını veya başka bir `stop_when` noktasını isteyen çağrılara verilmemeli.
+        """
+        if self.cache is not None:
+            cached = self.cache.get_fresh(url, max_age)
+            if cached is not None:
+                return cached
+            conditional = self.cache.conditional_headers(url)
+            if conditional:
+                headers = {**(headers or {}), **conditional}
+
+        self.stats.record_request(urlparse(url).hostname)
+        bounded = max_bytes is not None or stop_when is not None
+        response = self.session.get(url, headers=headers, timeout=timeout or self.timeout, stream=bounded, **kwargs)
+        if bounded:
+            _read_bounded(response, max_bytes, stop_when)
+        if self.archive is not None and response.status_code != 304:
+            self.archive.record(url, response)
+
+        if self.cache is not None:
+            if response.status_code == 304:
+                cached = self.cache.revalidated(url)
+                if cached is not None:
+                    return cached
+            elif getattr(response, 'truncated', None) is None:
+                self.cache.store(url, response)
+        return response
+
+    def print_stats(self):
+        """Bağlantı sayaçlarını yazdırır"""
+        summary = self.stats.summary()
+        if not summary:
+            return
+        print("Bağlantı istatistikleri (açılan / yeniden kullanılan):")
+        for host, counts in summary.items():
+            print(f"  - {host}: {counts['requests']} istek, {counts['opened']} yeni bağlantı, {counts['reused']} yeniden kullanım")
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client():
+    """Süreç içinde paylaşılan varsayılan HttpClient'ı döndürür (ilk çağrıda oluşturulur)"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient(cache=HttpCache())
+        return _default_client
@@ -0,0 +1,226 @@
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from url_canon import content_hash
+
+# MinHash permütasyonları için Mersenne asal sayısı (2^61 - 1)
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_WORD = re.compile(r'\w+')
+
+
+def shingles(text, size=5):
+    """Metni küçük harfli kelime `size`-gram'larının 32 bitlik özetlerine çevirir"""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.array(sorted({zlib.crc32(gram.encode('utf-8')) for gram in grams}), dtype=np.uint64)
+
+
+def _lsh_bands(threshold, num_perm):
+    """Eşik benzerliğe en yakın S-eğrisini veren (bant sayısı, bant genişliği) ikilisini seçer"""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH ile yakın kopya haber dizini
+
+    Her haber kelime shingle'larının MinHash imzasıyla temsil edilir. İmza
+    bantlara bölünüp kovalara yazılır; yeni bir haber yalnızca en az bir
+    bandı ortak olan adaylarla karşılaştırılır, bu yüzden arama süresi dizindeki
+    haber sayısıyla doğrusal artmaz. Adayların tahmini Jaccard benzerliği
+    `threshold` değerine ulaşırsa haber yakın kopya sayılır. Metin parmak izi
+    (content_hash) aynı olan haberler imza hesaplanmadan doğrudan kopya sayılır.
+
+    Args:
+        threshold: Yakın kopya sayılacak en düşük benzerlik (0-1)
+        num_perm: MinHash permütasyon sayısı
+        shingle_size: Shingle başına kelime sayısı
+        seed: Permütasyonların rastgele tohumu (süreçler arasında aynı imzalar için sabit)
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=5, seed=42):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = _lsh_bands(threshold, num_perm)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = {}
+        self._fingerprints = {}
+        self.duplicates = []
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def signature(self, text):
+        """Metnin MinHash imzası"""
+        hashes = shingles(text, self.shingle_size)
+        if not len(hashes):
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        values = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return values.min(axis=1) & _MAX_HASH
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def query(self, text, signature=None):
+        """
+        Metne en çok benzeyen dizindeki haberi bulur
+
+        Returns:
+            (anahtar, benzerlik) veya eşiği geçen aday yoksa None
+        """
+        if signature is None:
+            signature = self.signature(text)
+        with self._lock:
+            candidates = set()
+            for bucket, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(bucket.get(key, ()))
+            best = None
+            for candidate in candidates:
+                similarity = float(np.mean(self._signatures[candidate] == signature))
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (candidate, similarity)
+            return best
+
+    def add(self, key, text, signature=None, fingerprint=None):
+        """Haberi dizine ekler (fingerprint=False ise metin parmak izi kaydedilmez)"""
+        if signature is None:
+            signature = self.signature(text)
+        with self._lock:
+            if fingerprint is not False:
+                self._fingerprints.setdefault(fingerprint or content_hash(text), key)
+            self._signatures[key] = signature
+            for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+                bucket.setdefault(band_key, []).append(key)
+
+    def check(self, key, text, fingerprint=None):
+        """
+        Haber dizindeki bir haberin yakın kopyasıysa bunu kaydedip (kopya_anahtarı, benzerlik)
+        döndürür; değilse haberi dizine ekleyip None döndürür
+
+        Args:
+            fingerprint: Haberin kayıtlı content_hash değeri (verilmezse metinden hesaplanır)
+        """
+        if not _WORD.search(text):
+            return None
+        fingerprint = fingerprint or content_hash(text)
+        with self._lock:
+            match = self._fingerprints.get(fingerprint)
+        if match is not None:
+            match = (match, 1.0)
+        else:
+            signature = self.signature(text)
+            match = self.query(text, signature)
+        if match is not None:
+            with self._lock:
+                self.duplicates.append({'key': key, 'duplicate_of': match[0], 'similarity': round(match[1], 3)})
+            return match
+        self.add(key, text, signature, fingerprint)
+        return None
+
+    def remove(self, keys):
+        """Haberleri dizinden çıkarır (ör. değişen bir veri seti yeniden eklenmeden önce)"""
+        keys = set(keys)
+        with self._lock:
+            for key in keys:
+                signature = self._signatures.pop(key, None)
+                if signature is None:
+                    continue
+                for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+                    members = bucket.get(band_key)
+                    if members and key in members:
+                        members.remove(key)
+                        if not members:
+                            del bucket[band_key]
+            self._fingerprints = {fingerprint: key for fingerprint, key in self._fingerprints.items() if key not in keys}
+
+    def save(self, path):
+        """Dizini (imzalar ve parmak izleri) sıkıştırılmış .npz dosyasına yazar"""
+        with self._lock:
+            keys = list(self._signatures)
+            signatures = np.array([self._signatures[key] for key in keys], dtype=np.uint64).reshape(len(keys), self.num_perm)
+            fingerprints = list(self._fingerprints.items())
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.part', 'wb') as f:
+            np.savez_compressed(
+                f,
+                params=np.array([self.threshold, self.num_perm, self.shingle_size, self.seed]),
+                keys=np.array(keys, dtype=str),
+                signatures=signatures,
+                fingerprints=np.array([fingerprint for fingerprint, _ in fingerprints], dtype=str),
+                fingerprint_keys=np.array([key for _, key in fingerprints], dtype=str)
+            )
+        os.replace(path + '.part', path)
+
+    @classmethod
+    def load(cls, path):
+        """save ile yazılmış dizini okur"""
+        with np.load(path) as data:
+            threshold, num_perm, shingle_size, seed = data['params'].tolist()
+            index = cls(threshold=threshold, num_perm=int(num_perm), shingle_size=int(shingle_size), seed=int(seed))
+            for key, signature in zip(data['keys'].tolist(), data['signatures']):
+                index.add(key, None, signature=signature, fingerprint=False)
+            index._fingerprints = dict(zip(data['fingerprints'].tolist(), data['fingerprint_keys'].tolist()))
+        return index
+
+    def report(self):
+        """Atılan yakın kopyaların listesi (DataFrame)"""
+        with self._lock:
+            return pd.DataFrame(self.duplicates, columns=['key', 'duplicate_of', 'similarity'])
+
+    def save_report(self, output_file, append=False):
+        """Atılan yakın kopyaları CSV'ye yazar (append=True ise dosyanın sonuna ekler) ve özetini yazdırır"""
+        report = self.report()
+        if append and os.path.exists(output_file):
+            report.to_csv(output_file, mode='a', header=False, index=False, encoding='utf-8')
+        else:
+            report.to_csv(output_file, index=False, encoding='utf-8')
+        print(f"{len(report)} yakın kopya haber atıldı (eşik {self.threshold}); liste: {output_file}")
+        return report
+
+
+def drop_near_duplicates(df, index, key_column='url', text_column='content'):
+    """
+    DataFrame'deki satırları dizine karşı kontrol eder, yakın kopyaları atar
+
+    Kopya olmayan satırlar dizine eklenir; böylece parça parça okunan veri
+    setlerinde sonraki parçalar öncekilerle de karşılaştırılır. Veri setinde
+    content_hash sütunu varsa birebir kopyalar bu parmak izleriyle bulunur.
+
+    Returns:
+        Yakın kopyaları atılmış DataFrame
+    """
+    if 'content_hash' in df.columns:
+        fingerprints = df['content_hash'].where(df['content_hash'].notna(), None)
+    else:
+        fingerprints = [None] * len(df)
+    keep = [
+        index.check(str(key), str(text), fingerprint) is None
+        for key, text, fingerprint in zip(df[key_column], df[text_column].fillna(''), fingerprints)
+    ]
+    return df[keep]
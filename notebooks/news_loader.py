@@ -0,0 +1,180 @@
+import os
+import resource
+import threading
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from article_store import ARTICLE_COLUMNS, CLEANED_COLUMNS, STORE_PATH, ArticleStore
+from dataset_store import HAS_ARROW, iter_dataset
+
+# Az sayıda farklı değer alan sütunlar kategori (category) tipinde tutulur
+CATEGORY_COLUMNS = ['kategori', 'kaynak', 'tarih', 'category', 'source', 'date']
+
+# Metin sütunları: pyarrow varsa Arrow tabanlı metin (satır başına Python nesnesi yok), değilse object
+STRING_DTYPE = pd.StringDtype('pyarrow') if HAS_ARROW else object
+
+RAW_CSV = 'data/raw/all_news_dataset.csv'
+CLEANED_CSV = 'data/processed/news_cleaned.csv'
+
+
+def _rss():
+    """Sürecin o anki bellek kullanımı (bayt); /proc yoksa şimdiye kadarki en yüksek değer"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class PeakMemory:
+    """
+    Bir blok süresince sürecin en yüksek bellek kullanımını ölçer
+
+    Bellek kullanımı arka planda kısa aralıklarla örneklenir; pandas, numpy ve
+    Arrow'un ayırdığı bellek de sayılır.
+
+    Args:
+        interval: Örnekleme aralığı (saniye)
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start = self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss())
+
+    def __enter__(self):
+        self.start = self.peak = _rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss())
+
+    @property
+    def growth(self):
+        """Blok süresince en yüksek bellek artışı (bayt)"""
+        return self.peak - self.start
+
+
+def optimize_dtypes(df):
+    """Kategori sütunlarını category, diğer metin sütunlarını STRING_DTYPE tipine çevirir"""
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS:
+            if not isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype('category')
+        elif df[column].dtype == object or (HAS_ARROW and isinstance(df[column].dtype, pd.ArrowDtype)):
+            df[column] = df[column].astype(STRING_DTYPE)
+    return df
+
+
+def _concat(chunks, columns):
+    """Parçaları birleştirir; kategori sütunlarının kategorileri birleştirilir (object'e dönmez)"""
+    if not chunks:
+        return optimize_dtypes(pd.DataFrame(columns=columns))
+    df = pd.concat(chunks, ignore_index=True)
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = pd.Categorical(union_categoricals([chunk[column] for chunk in chunks], ignore_order=True))
+    return df
+
+
+def report(label, df, memory):
+    """Yüklemenin satır sayısını, DataFrame boyutunu ve en yüksek bellek artışını yazdırır"""
+    size = df.memory_usage(deep=True).sum()
+    print(f"  - {label}: {len(df)} satır, {df.shape[1]} sütun; DataFrame {size / 2 ** 20:.1f} MB, "
+          f"yükleme sırasında en yüksek bellek artışı {memory.growth / 2 ** 20:.1f} MB "
+          f"(süreç {memory.peak / 2 ** 20:.1f} MB)")
+
+
+def iter_news(columns=None, chunksize=10000, store_path=STORE_PATH):
+    """
+    Ham haberleri (İngilizce sütun adlarıyla) parça parça, tipleri küçültülmüş olarak okur
+
+    Haber deposu doluysa depodan, değilse birleşik veri setinden (o da yoksa
+    eski data/raw/all_news_dataset.csv dosyasından) okunur.
+
+    Yields:
+        pd.DataFrame
+    """
+    columns = list(columns or ARTICLE_COLUMNS)
+    if os.path.exists(store_path):
+        with ArticleStore(store_path) as store:
+            if store.count():
+                for chunk in store.iter_articles(columns, chunksize=chunksize):
+                    yield optimize_dtypes(chunk)
+                return
+    for chunk in iter_dataset('all_news', columns=columns, chunksize=chunksize, csv_path=RAW_CSV):
+        yield optimize_dtypes(chunk)
+
+
+def iter_cleaned(columns, categories=None, chunksize=10000, text_column=None, store_path=STORE_PATH):
+    """
+    Ön işlenmiş haberleri (05'in Türkçe sütun adlarıyla) parça parça okur
+
+    Haber deposunda ön işleme sonuçları varsa kategori indeksinden, yoksa
+    temizlenmiş veri setinin yalnızca istenen kategori bölümlerinden okunur.
+
+    Args:
+        columns: Okunacak sütunlar (ör. ['kategori', 'kaynak'])
+        categories: Yalnızca bu kategoriler
+        chunksize: Parça başına en fazla satır
+        text_column: Verilirse başlık ve içerik parça parça bu adlı tek sütunda birleştirilir
+            ("baslik_temiz icerik_temiz"); `columns` içinde istenmeyen başlık/içerik sütunları tutulmaz
+
+    Yields:
+        pd.DataFrame
+    """
+    columns = list(columns)
+    needed = list(dict.fromkeys(columns + (['baslik_temiz', 'icerik_temiz'] if text_column else [])))
+
+    if os.path.exists(store_path) and _store_has_cleaned(store_path):
+        chunks = _store_chunks(store_path, needed, categories, chunksize)
+    else:
+        filters = {'kategori': list(categories)} if categories is not None else None
+        chunks = iter_dataset('news_cleaned', columns=needed, filters=filters, chunksize=chunksize, csv_path=CLEANED_CSV)
+
+    for chunk in chunks:
+        if text_column:
+            chunk[text_column] = chunk['baslik_temiz'] + ' ' + chunk['icerik_temiz']
+            chunk = chunk[columns + [text_column]]
+        yield optimize_dtypes(chunk)
+
+
+def _store_has_cleaned(store_path):
+    with ArticleStore(store_path) as store:
+        return store.count(cleaned=True) > 0
+
+
+def _store_chunks(store_path, columns, categories, chunksize):
+    with ArticleStore(store_path) as store:
+        for chunk in store.iter_articles([CLEANED_COLUMNS[column] for column in columns], chunksize=chunksize,
+                                         category=categories, cleaned=True):
+            chunk.columns = columns
+            yield chunk
+
+
+def load_news(columns=None, label='Ham haberler', store_path=STORE_PATH):
+    """iter_news parçalarını tek DataFrame'de toplar ve bellek kullanımını yazdırır"""
+    with PeakMemory() as memory:
+        df = _concat(list(iter_news(columns, store_path=store_path)), list(columns or ARTICLE_COLUMNS))
+    report(label, df, memory)
+    return df
+
+
+def load_cleaned(columns, categories=None, text_column=None, label='Ön işlenmiş haberler', store_path=STORE_PATH):
+    """iter_cleaned parçalarını tek DataFrame'de toplar ve bellek kullanımını yazdırır"""
+    with PeakMemory() as memory:
+        chunks = list(iter_cleaned(columns, categories, text_column=text_column, store_path=store_path))
+        df = _concat(chunks, list(columns) + ([text_column] if text_column else []))
+    report(label, df, memory)
+    return df
@@ -0,0 +1,194 @@
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """Devre kesicisi açık olan sunucuya istek yapılmak istendiğinde fırlatılır"""
+
+    def __init__(self, host, remaining):
+        super().__init__(f"{host} için devre kesici açık ({remaining:.0f} sn sonra yeniden denenecek)")
+        self.host = host
+        self.remaining = remaining
+
+
+class _HostState:
+    """Tek bir sunucunun hız, geri çekilme ve devre kesici durumu"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.next_allowed = 0.0
+        self.failures = 0
+        self.open_until = 0.0
+        self.open_count = 0
+        self.probing = False
+        self.requests = 0
+        self.errors = 0
+        self.latency = None
+
+
+class HostRateLimiter:
+    """
+    Sunucu bazında uyarlanabilir token-bucket hız sınırlayıcı
+
+    Her sunucu için saniyede `rate` istek izni (token) üretilir; `burst` kadar
+    izin biriktirilebilir. Yanıt süresi `target_latency` altında kaldıkça hız
+    `increase` kadar artırılır, yavaşlayan sunucuda hafifçe düşürülür. 429, 5xx ve
+    zaman aşımlarında hız `decrease` ile çarpılır ve istekler üstel artan
+    sürelerle (Retry-After varsa en az o kadar) ertelenir. Art arda
+    `failure_threshold` hata alan sunucu için devre kesici açılır: `open_seconds`
+    boyunca istekler beklemeden CircuitOpenError ile reddedilir, süre dolunca
+    tek bir deneme isteğine izin verilir.
+
+    Args:
+        initial_rate: Başlangıç hızı (istek/sn)
+        min_rate: En düşük hız
+        max_rate: En yüksek hız
+        burst: Biriktirilebilecek en fazla izin
+        target_latency: Hızın artırılacağı en yüksek yanıt süresi (sn)
+        increase: Başarılı istek başına hız artışı (istek/sn)
+        decrease: Hata durumunda hızın çarpıldığı katsayı
+        backoff_base: İlk hatadan sonraki bekleme (sn); her ardışık hatada ikiye katlanır
+        backoff_max: En uzun bekleme (sn)
+        failure_threshold: Devre kesiciyi açan ardışık hata sayısı
+        open_seconds: Devre kesicinin açık kalma süresi (sn); her yeniden açılışta ikiye katlanır
+    """
+
+    def __init__(self, initial_rate=2.0, min_rate=0.2, max_rate=10.0, burst=2, target_latency=1.5,
+                 increase=0.2, decrease=0.5, backoff_base=1.0, backoff_max=60.0,
+                 failure_threshold=5, open_seconds=60.0):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.initial_rate, self.burst)
+        return state
+
+    def acquire(self, host):
+        """
+        Sunucuya istek için bir izin ayırır ve izin zamanı gelene kadar bekler
+
+        Returns:
+            Beklenen süre (saniye)
+
+        Raises:
+            CircuitOpenError: Sunucunun devre kesicisi açıksa (beklemeden)
+        """
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            if state.open_until:
+                if now < state.open_until or state.probing:
+                    raise CircuitOpenError(host, max(state.open_until - now, 0))
+                # Süre doldu: tek bir deneme isteğine izin ver
+                state.probing = True
+
+            state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+            state.updated = now
+            state.tokens -= 1
+            wait = -state.tokens / state.rate if state.tokens < 0 else 0.0
+            wait = max(wait, state.next_allowed - now)
+            state.requests += 1
+
+        if wait > 0:
+            time.sleep(wait)
+            return wait
+        return 0.0
+
+    def record_success(self, host, latency):
+        """Başarılı isteği kaydeder; hızlı yanıtlarda hızı artırır"""
+        with self._lock:
+            state = self._state(host)
+            state.failures = 0
+            if state.probing:
+                print(f"  - {host} için devre kesici kapandı")
+                state.probing = False
+                state.open_until = 0.0
+                state.open_count = 0
+            state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+            if state.latency <= self.target_latency:
+                state.rate = min(self.max_rate, state.rate + self.increase)
+            else:
+                state.rate = max(self.min_rate, state.rate * 0.9)
+
+    def record_failure(self, host, retry_after=None):
+        """
+        429, 5xx veya zaman aşımını kaydeder: hızı düşürür, sonraki isteği erteler ve
+        gerekirse devre kesiciyi açar
+
+        Args:
+            retry_after: Sunucunun Retry-After başlığında istediği bekleme (sn)
+        """
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            state.errors += 1
+            state.failures += 1
+            state.rate = max(self.min_rate, state.rate * self.decrease)
+            backoff = min(self.backoff_max, self.backoff_base * 2 ** (state.failures - 1))
+            if retry_after:
+                backoff = max(backoff, min(retry_after, self.backoff_max))
+            state.next_allowed = max(state.next_allowed, now + backoff)
+
+            if state.probing or state.failures >= self.failure_threshold:
+                open_for = self.open_seconds * 2 ** state.open_count
+                state.open_until = now + open_for
+                state.open_count += 1
+                state.probing = False
+                print(f"  ! {host} için devre kesici açıldı: {state.failures} ardışık hata, {open_for:.0f} sn istek yapılmayacak")
+
+    def stats(self):
+        """
+        Returns:
+            dict: host -> {'rate', 'requests', 'errors', 'latency', 'circuit_open'}
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                host: {
+                    'rate': state.rate,
+                    'requests': state.requests,
+                    'errors': state.errors,
+                    'latency': state.latency,
+                    'circuit_open': state.open_until > now
+                }
+                for host, state in sorted(self._hosts.items())
+            }
+
+    def print_stats(self):
+        """Sunucu bazında hız ve hata özetini yazdırır"""
+        stats = self.stats()
+        if not stats:
+            return
+        print("Hız sınırlayıcı (son hız / istek / hata):")
+        for host, row in stats.items():
+            latency = f", ort. yanıt {row['latency']:.2f} sn" if row['latency'] is not None else ""
+            circuit = ", devre kesici açık" if row['circuit_open'] else ""
+            print(f"  - {host}: {row['rate']:.1f} istek/sn, {row['requests']} istek, {row['errors']} hata{latency}{circuit}")
+
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    """Süreç içinde paylaşılan varsayılan HostRateLimiter'ı döndürür (ilk çağrıda oluşturulur)"""
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = HostRateLimiter()
+        return _default_limiter
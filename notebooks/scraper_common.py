@@ -0,0 +1,485 @@
+from datetime import datetime
+from collections import deque
+from concurrent.futures import as_completed
+from contextlib import closing
+import os
+import re
+import socket
+
+from article_sink import ArticleSink, STREAM_DIR, iter_articles, read_articles
+from discovery import FeedDiscovery
+from fetch_engine import FetchEngine
+from html_parsing import DEFAULT_PARSER, article_end_reached, declared_charset, make_soup, parse_article
+from near_duplicates import NearDuplicateIndex
+from url_canon import content_hash
+from http_cache import CachePolicy
+from url_frontier import UrlFrontier
+
+# Haber sayfalarından okunacak en fazla bayt (galeri / video gömülü çok büyük sayfalar kesilir)
+DEFAULT_MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Haber deposuna (ArticleStore) tek seferde eklenen haber sayısı
+STORE_BATCH = 100
+
+# Süreç genelinde haber/hata olaylarını bildiren fonksiyon (ör. paralel toplamada ilerleme kuyruğu)
+_progress_callback = None
+
+
+def set_progress_callback(callback):
+    """
+    Haber eklendiğinde veya bir haber çekilemediğinde çağrılacak fonksiyonu ayarlar
+
+    Args:
+        callback: callback(source, event, category) biçiminde fonksiyon; event 'article' veya 'error'
+            (None verilirse bildirim kapatılır)
+    """
+    global _progress_callback
+    _progress_callback = callback
+
+
+def _report_progress(source, event, category):
+    if _progress_callback is not None:
+        _progress_callback(source, event, category)
+
+
+class NewsCollector:
+    """
+    Bir haber kaynağından toplanan haberleri ve kategori sayaçlarını tutan ortak yardımcı
+
+    Kaynak betikleri link bulma işini kendileri yapar; bulunan haber linkleri
+    `fetch_news` ile paylaşılan FetchEngine'e gönderilir ve gelen sayfalar
+    tamamlanma sırasına göre işlenir. Çıkarılan haberler bellekte tutulmaz,
+    kaynağın ArticleSink akışına (`data/stream/<kaynak>/`) hemen yazılır.
+
+    Args:
+        source: Kaynak adı ('cnnturk', 'ntv', ...)
+        parse_news: Haber sayfasının BeautifulSoup nesnesinden ve <head> meta alanlarından
+            (title, content) döndüren fonksiyon (genellikle kaynağın Extractor'ı)
+        target_per_category: Her kategoriden çekilecek hedef haber sayısı
+        engine: Paylaşılan FetchEngine (verilmezse yenisi oluşturulur ve close() ile kapatılır)
+        cache_policy: Kaynağın önbellek tazelik süreleri (CachePolicy)
+        frontier: Görülen URL dizini (UrlFrontier); verilmezse bu çalışmaya özel bir dizin oluşturulur
+        checkpoint: Kaynağın CrawlCheckpoint'i; verilirse önceki çalışmanın sayaçları ve işlenmiş
+            URL'leri geri yüklenir, haberler kontrol noktasının akışına eklenir (verilmezse haberler
+            bu çalışmaya özel data/stream/<kaynak>.adhoc akışına yazılır; akış her çalışmada sıfırlanır)
+        parser: BeautifulSoup ayrıştırıcısı (varsayılan: kuruluysa 'lxml', değilse 'html.parser')
+        duplicates: Yakın kopya dizini (NearDuplicateIndex); verilmezse kaynağa özel bir dizin
+            oluşturulur ve daha önce eklenmiş bir haberin yakın kopyası olan haberler kaydedilmez
+        max_page_bytes: Haber sayfası başına okunacak en fazla bayt (None ise sınırsız); haber
+            sayfaları akışla indirilir, ExtractionSpec'te stop_markers varsa haber bölümü
+            bittiğinde sayfanın kalanı indirilmez
+        queue: Paylaşılan tarama kuyruğu (WorkQueue / RemoteWorkQueue); verilirse haber linkleri
+            kuyruğa eklenip oradan kiralanarak çekilir, kategori hedefi tüm işçilerin toplamıdır
+            ve haberler işçiye özel data/stream/<kaynak>.<işçi> akışına yazılır
+        worker_id: Kuyruktaki işçi adı (varsayılan: <makine>-<süreç no>)
+        sink: Haberlerin yazılacağı ArticleSink (ör. sürekli toplayıcının kalıcı akışı); verilirse
+            varsayılan akış oluşturulmaz ve close() ile kapatılmaz
+        store: Haber deposu (ArticleStore); verilirse depoda zaten olan haberlerin linkleri
+            indirilmez ve yeni haberler depoya STORE_BATCH'lik gruplar hâlinde eklenir
+    """
+
+    def __init__(self, source, parse_news, target_per_category, engine=None, cache_policy=None, frontier=None, checkpoint=None, parser=None, duplicates=None,
+                 max_page_bytes=DEFAULT_MAX_PAGE_BYTES, queue=None, worker_id=None, sink=None, store=None):
+        self.source = source
+        self.parse_news = parse_news
+        self.target_per_category = target_per_category
+        self.parser = parser or DEFAULT_PARSER
+        self.max_page_bytes = max_page_bytes
+        spec = getattr(parse_news, 'spec', None)
+        self.stop_when = article_end_reached(spec.stop_markers) if spec is not None and spec.stop_markers else None
+        self.cache_policy = cache_policy or CachePolicy()
+        self.frontier = frontier if frontier is not None else UrlFrontier()
+        self._own_engine = engine is None
+        self.engine = engine if engine is not None else FetchEngine()
+        self.metrics = self.engine.metrics
+        self.metrics.source = self.metrics.source or source
+        self.category_counts = {}
+        self.duplicates = duplicates if duplicates is not None else NearDuplicateIndex()
+        self.checkpoint = checkpoint
+        self.queue = queue
+        self.store = store
+        self._store_batch = []
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+        self._own_sink = sink is None
+        if sink is not None:
+            self.sink = sink
+        elif checkpoint is not None:
+            self.sink = checkpoint.sink
+        elif queue is not None:
+            self.sink = ArticleSink(os.path.join(STREAM_DIR, f'{source}.{self.worker_id}'))
+        else:
+            # Kontrol noktasının akışından (data/stream/<kaynak>) ayrı: duraklatılmış bir taramanın
+            # haberleri kontrol noktasız bir çalışmayla silinmesin
+            self.sink = ArticleSink(os.path.join(STREAM_DIR, f'{source}.adhoc'), reset=True)
+
+        if checkpoint is not None and checkpoint.resumed:
+            # Önceki çalışmanın sayaçlarını ve işlenmiş URL'lerini geri yükle
+            self.category_counts = dict(checkpoint.state['category_counts'])
+            for url in checkpoint.frontier.done_urls():
+                self.frontier.add(url)
+            for article in iter_articles(self.sink.directory):
+                self.duplicates.add(article['url'], article['content'], fingerprint=article.get('content_hash'))
+            print(f"Kontrol noktasından devam ediliyor: {checkpoint.restored} haber, "
+                  f"{len(checkpoint.state['finished_categories'])} tamamlanmış kategori")
+
+    def count(self, category):
+        """Kategoriden şimdiye kadar eklenen haber sayısı (kuyruk varsa tüm işçilerin toplamı)"""
+        if self.queue is not None:
+            return self.queue.stored(self.source, category)
+        return self.category_counts.get(category, 0)
+
+    def is_done(self, category):
+        """Kategori için hedef sayıya ulaşıldı mı"""
+        return self.count(category) >= self.target_per_category
+
+    def is_finished(self, category):
+        """Kategori önceki bir çalışmada tamamlandı mı (kontrol noktası varsa)"""
+        return self.checkpoint is not None and self.checkpoint.is_finished(category)
+
+    def resume_pending(self, category):
+        """Önceki çalışmada kuyruğa alınmış ama işlenmemiş linkleri tamamlar"""
+        if self.checkpoint is None:
+            return self.count(category)
+        pending = self.checkpoint.pending(category)
+        if pending:
+            print(f"  - Önceki çalışmadan kalan {len(pending)} link tamamlanıyor...")
+            self.fetch_news(pending, category)
+        return self.count(category)
+
+    def finish_category(self, category):
+        """Kategorinin tamamlandığını kontrol noktasına yazar"""
+        if self.checkpoint is not None:
+            self.checkpoint.finish_category(category)
+
+    def discover_links(self, spec, categories):
+        """
+        Site haritası ve RSS beslemelerinden kategori bazında haber linklerini bulur
+
+        Args:
+            spec: Kaynağın DiscoverySpec'i
+            categories: Kategori adları (veya kategori -> URL sözlüğü)
+
+        Returns:
+            dict: Kategori -> haber URL'leri (hata olursa boş sözlük)
+        """
+        discovery = FeedDiscovery(self.engine, spec, categories, max_age=self.cache_policy.listing_ttl)
+        try:
+            links = discovery.discover()
+        except Exception as e:
+            print(f"  ! Site haritası/RSS okunurken hata oluştu: {str(e)}")
+            return {}
+        found = ', '.join(f"{category}: {len(urls)}" for category, urls in links.items())
+        print(f"Site haritası/RSS: {discovery.requests} istekle {sum(len(urls) for urls in links.values())} haber linki bulundu ({found})")
+        return links
+
+    def fetch_page(self, url, max_age=None):
+        """
+        Kategori/liste sayfasını indirir ve BeautifulSoup nesnesi döndürür
+
+        Args:
+            max_age: Önbellek tazelik süresi (varsayılan: cache_policy.listing_ttl; 0 ise önbellekteki
+                sayfa sunucuya koşullu istekle doğrulatılır)
+        """
+        response = self.engine.fetch(url, max_age=self.cache_policy.listing_ttl if max_age is None else max_age)
+        return self._make_soup(response)
+
+    def fetch_pages(self, urls):
+        """
+        Liste sayfalarını eşzamanlı indirir
+
+        Yields:
+            (url, soup, error): Hatalı isteklerde soup None
+        """
+        with closing(self.engine.fetch_all(urls, max_age=self.cache_policy.listing_ttl)) as results:
+            for url, response, error in results:
+                if error is not None:
+                    yield url, None, error
+                else:
+                    yield url, self._make_soup(response), None
+
+    def prefetch_pages(self, urls, prefetch=3):
+        """
+        Liste sayfalarını sırayla döndürürken sonraki `prefetch` sayfayı arka planda indirir
+
+        Bir sayfanın haberleri çekilirken sonraki liste sayfaları zaten iniyor olur;
+        liste tarama ve haber çekme aşamaları sırayla beklemek yerine üst üste biner.
+        Üreteç erken kapatılırsa (hedefe ulaşıldı, liste bitti) henüz başlamamış
+        sayfa istekleri iptal edilir.
+
+        Yields:
+            (url, soup, error): Sayfa sırasıyla; hatalı isteklerde soup None
+        """
+        urls = iter(urls)
+        window = deque()
+
+        # Aynı anda en fazla `prefetch` liste isteği: bu istekler haber istekleriyle aynı
+        # per_host yuvalarını paylaşır
+        def fill():
+            while len(window) < prefetch:
+                url = next(urls, None)
+                if url is None:
+                    return
+                window.append((url, self.engine.submit(url, max_age=self.cache_policy.listing_ttl)))
+
+        try:
+            fill()
+            while window:
+                url, future = window.popleft()
+                try:
+                    response = future.result()
+                except Exception as e:
+                    fill()
+                    yield url, None, e
+                    continue
+                # Sayfa indi; yerine sıradaki sayfa istenir (sayfa işlenirken sonraki `prefetch` sayfa iner)
+                fill()
+                yield url, self._make_soup(response), None
+        finally:
+            for _, future in window:
+                future.cancel()
+
+    def _make_soup(self, response):
+        with self.metrics.timed('listing_parse'):
+            encoding = declared_charset(response.content, response.headers.get('Content-Type'))
+            return make_soup(response.content, self.parser, encoding)
+
+    def _extract(self, news_soup, meta=None):
+        with self.metrics.timed('extract'):
+            return self.parse_news(news_soup, meta)
+
+    def fetch_news(self, news_links, category):
+        """
+        Haber linklerini eşzamanlı indirir, gelen sayfaları sırayla işleyip akışa ekler
+
+        Returns:
+            Kategorinin güncel haber sayısı
+        """
+        if self.is_done(category):
+            return self.count(category)
+        if self.queue is not None:
+            return self._fetch_queued(news_links, category)
+
+        # Daha önce görülen (bu çalışmada kuyruğa alınmış veya önceki çalışmalarda
+        # tamamlanmış) linkleri ele
+        news_links = self.frontier.filter_new(news_links)
+        if self.store is not None and news_links:
+            # Depoda zaten olan haberleri indirme
+            stored = self.store.stored(news_links)
+            news_links = [url for url in news_links if url not in stored]
+        if self.checkpoint is not None and news_links:
+            self.checkpoint.add_pending(category, news_links)
+
+        with closing(self.engine.fetch_all(news_links, max_age=self.cache_policy.article_ttl,
+                                           max_bytes=self.max_page_bytes, stop_when=self.stop_when)) as results:
+            for news_url, news_response, error in results:
+                # Hedef sayıya ulaşıldıysa döngüyü kır (bekleyen istekler iptal edilir)
+                if self.is_done(category):
+                    break
+
+                if error is not None:
+                    print(f"  ! Haber çekilirken hata oluştu: {str(error)}")
+                    self.metrics.record_event('fetch_error')
+                    _report_progress(self.source, 'error', category)
+                    continue
+
+                try:
+                    article = self._read_article(news_url, news_response)
+                except Exception as e:
+                    print(f"  ! Haber işlenirken hata oluştu: {str(e)}")
+                    self.metrics.record_event('parse_error')
+                    _report_progress(self.source, 'error', category)
+                    continue
+
+                if article is not None:
+                    self.add_news(category, *article, news_url)
+                self.mark_done(news_url)
+
+        return self.count(category)
+
+    def _read_article(self, news_url, news_response):
+        """
+        İndirilen haber sayfasından başlık ve içeriği çıkarır
+
+        Returns:
+            (title, content) veya başlık/içerik bulunamadıysa ya da sayfa daha önce
+            eklenen bir haberin yakın kopyasıysa None
+        """
+        print(f"  - Haber çekildi: {news_url}")
+        with self.metrics.timed('parse'):
+            title, content = parse_article(news_response.content, self._extract, self.parser,
+                                           news_response.headers.get('Content-Type'))
+
+        if not (title and content):
+            print(f"  ! Başlık veya içerik bulunamadı: {news_url}")
+            self.metrics.record_event('extract_miss')
+            return None
+
+        duplicate = self.duplicates.check(news_url, content)
+        if duplicate is not None:
+            print(f"  ! Yakın kopya atlandı: {news_url} (≈ {duplicate[0]}, benzerlik {duplicate[1]:.2f})")
+            self.metrics.record_event('duplicate')
+            return None
+        return title, content
+
+    def _fetch_queued(self, news_links, category):
+        """
+        Linkleri paylaşılan kuyruğa ekler, kuyruktan kiralanan linkleri çeker
+
+        Aynı kaynağı tarayan tüm işçiler aynı kuyruktan kiralar; bir link aynı anda
+        tek bir işçiye verilir ve haber yalnızca kira hâlâ bu işçideyse kaydedilir.
+        """
+        added = self.queue.add(news_links, self.source, category)
+        if added:
+            print(f"  - {added} yeni link kuyruğa eklendi.")
+
+        batch = max(self.engine.per_host * 2, 1)
+        while not self.is_done(category):
+            # Hedefe kalan haber sayısından fazlası kiralanmaz; kalan linkler diğer işçilere açık kalır
+            remaining = self.target_per_category - self.count(category)
+            leased = self.queue.lease(self.worker_id, limit=min(batch, remaining), source=self.source, category=category)
+            if not leased:
+                break
+
+            futures = {self.engine.submit(row['url'], max_age=self.cache_policy.article_ttl, max_bytes=self.max_page_bytes,
+                                          stop_when=self.stop_when): row['url'] for row in leased}
+            waiting = set(futures)
+            for future in as_completed(futures):
+                waiting.discard(future)
+                news_url = futures[future]
+                # Hedefe diğer işçilerle birlikte ulaşıldıysa: inen sayfa kaydedilmeden bitmiş sayılır
+                # (başka bir işçiye verilip yeniden indirilmez), henüz başlamamış istekler bırakılır
+                if self.is_done(category):
+                    self.queue.complete(news_url, self.worker_id, stored=False)
+                    self._drop_leases(futures, waiting)
+                    break
+
+                try:
+                    news_response = future.result()
+                except Exception as error:
+                    print(f"  ! Haber çekilirken hata oluştu: {str(error)}")
+                    self.metrics.record_event('fetch_error')
+                    _report_progress(self.source, 'error', category)
+                    self.queue.fail(news_url, self.worker_id, error)
+                    continue
+
+                try:
+                    article = self._read_article(news_url, news_response)
+                except Exception as e:
+                    print(f"  ! Haber işlenirken hata oluştu: {str(e)}")
+                    self.metrics.record_event('parse_error')
+                    _report_progress(self.source, 'error', category)
+                    self.queue.fail(news_url, self.worker_id, e)
+                    continue
+
+                if not self.queue.complete(news_url, self.worker_id, stored=article is not None):
+                    print(f"  ! Kira süresi dolmuş, haber başka bir işçiye bırakıldı: {news_url}")
+                elif article is not None:
+                    self.add_news(category, *article, news_url)
+
+        return self.count(category)
+
+    def _drop_leases(self, futures, waiting):
+        """
+        Sonucu beklenmeyecek kiraları kapatır: başlamamış istekler iptal edilip kuyruğa geri
+        verilir, indirilmeye başlanmış veya inmiş sayfalar kaydedilmeden bitmiş sayılır
+        """
+        cancelled = []
+        for future in waiting:
+            if future.cancel():
+                cancelled.append(futures[future])
+            else:
+                self.queue.complete(futures[future], self.worker_id, stored=False)
+        if cancelled:
+            self.queue.release(self.worker_id, cancelled)
+
+    def fetch_subcategory_news(self, subcategory_links, category, extract_news_links, limit=5):
+        """
+        Alt kategori sayfalarını eşzamanlı indirir ve içlerindeki haberleri çeker
+
+        Args:
+            subcategory_links: Alt kategori URL'leri
+            category: Haberlerin ekleneceği kategori
+            extract_news_links: Alt kategori sayfasının soup nesnesinden haber linklerini döndüren fonksiyon
+            limit: İncelenecek en fazla alt kategori sayısı
+        """
+        with closing(self.fetch_pages(subcategory_links[:limit])) as sub_pages:
+            for sub_url, sub_soup, error in sub_pages:
+                if self.is_done(category):
+                    break
+
+                print(f"  - Alt kategori inceleniyor: {sub_url}")
+                if error is not None:
+                    print(f"  ! Alt kategori sayfası çekilirken hata oluştu: {str(error)}")
+                    continue
+
+                try:
+                    # Alt kategorideki haber linklerini bul
+                    sub_news_links = extract_news_links(sub_soup)
+                    print(f"  - Alt kategoride {len(sub_news_links)} adet haber linki bulundu.")
+
+                    # Alt kategorideki haberleri çek
+                    self.fetch_news(sub_news_links, category)
+                except Exception as e:
+                    print(f"  ! Alt kategori sayfası işlenirken hata oluştu: {str(e)}")
+                    continue
+
+        return self.count(category)
+
+    def mark_done(self, news_url):
+        """URL'nin işlendiğini görülen URL dizinine ve kontrol noktasına yazar"""
+        self.frontier.mark_done(news_url)
+        if self.checkpoint is not None:
+            self.checkpoint.mark_done(news_url)
+
+    def add_news(self, category, title, content, news_url):
+        """Haberi temizleyip kaynağın akışına yazar"""
+        # Metin temizleme
+        content = re.sub(r'\s+', ' ', content).strip()
+
+        article = {
+            'category': category,
+            'title': title,
+            'content': content,
+            'url': news_url,
+            'source': self.source,
+            'date': datetime.now().strftime("%Y-%m-%d"),
+            'content_hash': content_hash(content)
+        }
+        if self.checkpoint is not None:
+            self.checkpoint.append_article(article)
+        else:
+            self.sink.write(article)
+        if self.store is not None:
+            self._store_batch.append(article)
+            if len(self._store_batch) >= STORE_BATCH:
+                self.flush_store()
+        self.category_counts[category] = self.count(category) + 1
+        self.metrics.record_event('article')
+        _report_progress(self.source, 'article', category)
+        print(f"  - '{title[:50]}...' haberi eklendi. ({category}: {self.count(category)}/{self.target_per_category})")
+
+    def flush_store(self):
+        """Bekleyen haberleri depoya ekler"""
+        if self.store is not None and self._store_batch:
+            self.store.add(self._store_batch)
+            self._store_batch = []
+
+    def to_dataframe(self):
+        """Akışa yazılan tüm haberleri DataFrame olarak okur"""
+        return read_articles(self.sink.directory)
+
+    def close(self):
+        """Akışı kapatır, seçici istatistiklerini yazdırır; kendi oluşturduğu FetchEngine'i kapatır"""
+        self.flush_store()
+        if self._own_sink:
+            self.sink.close()
+        if self.queue is not None:
+            self.queue.release(self.worker_id)
+        if self.duplicates.duplicates:
+            print(f"{len(self.duplicates.duplicates)} yakın kopya haber atlandı.")
+        if hasattr(self.parse_news, 'print_stats'):
+            self.parse_news.print_stats()
+            self.metrics.details['selectors'] = self.parse_news.stats()
+        if self._own_engine:
+            self.engine.close()
+            self.engine.print_stats()
@@ -0,0 +1,74 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Sayfanın içeriğini değiştirmeyen izleme / kampanya parametreleri
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'spm', '_ga', '_gl', 'cmpid'
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'ga_')
+
+_DEFAULT_PORTS = {'http': '80', 'https': '443'}
+_SLASHES = re.compile(r'/{2,}')
+_WORD = re.compile(r'\w+')
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonical_url(url, base_url=None):
+    """
+    Aynı sayfaya giden link varyantlarını tek bir standart URL'ye indirger
+
+    Göreli linkler `base_url`'ye göre çözülür; şema ve sunucu küçük harfe çevrilir,
+    varsayılan port, #parça, izleme parametreleri (utm_*, fbclid, ...) ve yoldaki
+    tekrarlanan / sondaki '/' atılır, kalan sorgu parametreleri sıralanır.
+    `base_url` ile aynı sunucudaki linkler sitenin şemasıyla yazılır.
+
+    Args:
+        url: Mutlak veya göreli link
+        base_url: Göreli linklerin çözüleceği adres (ör. sitenin kök adresi)
+    """
+    url = url.strip()
+    if base_url:
+        url = urljoin(base_url, url)
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    if parts.port and str(parts.port) != _DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+
+    if base_url:
+        base = urlsplit(base_url)
+        if base.hostname and base.hostname.lower() == host:
+            scheme = base.scheme.lower()
+
+    path = _SLASHES.sub('/', parts.path)
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(name)
+    ))
+    return urlunsplit((scheme, host, path or '/', query, ''))
+
+
+def unique_urls(urls, base_url=None):
+    """Linkleri standart biçime getirip tekrarları sırayı koruyarak atar"""
+    return list(dict.fromkeys(canonical_url(url, base_url) for url in urls))
+
+
+def content_hash(text):
+    """
+    Haber metninin parmak izi
+
+    Büyük/küçük harf, noktalama ve boşluk farkları yok sayılır; aynı metin farklı
+    sayfalardan gelse de aynı değeri verir.
+
+    Returns:
+        40 karakterlik SHA-1 özeti
+    """
+    normalized = ' '.join(_WORD.findall(text.lower()))
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
@@ -0,0 +1,82 @@
+import os
+import threading
+
+from url_canon import canonical_url
+
+
+class UrlFrontier:
+    """
+    Görülen haber URL'lerinin sabit zamanlı (hash set) dizini
+
+    `filter_new` ile bir çalışma içinde aynı URL'nin iki kez kuyruğa alınması
+    engellenir. `store_path` verilirse tamamlanan URL'ler bu dosyaya satır satır
+    eklenir ve sonraki çalışmalarda yeniden indirilmez.
+
+    Args:
+        store_path: Tamamlanan URL'lerin saklanacağı dosya (None ise yalnızca bellekte tutulur)
+    """
+
+    def __init__(self, store_path=None):
+        self.store_path = store_path
+        self._lock = threading.Lock()
+        self._seen = set()
+        self._done = set()
+
+        if store_path and os.path.exists(store_path):
+            with open(store_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    url = line.strip()
+                    if url:
+                        self._done.add(canonical_url(url))
+            self._seen.update(self._done)
+
+    def __contains__(self, url):
+        return canonical_url(url) in self._seen
+
+    def __len__(self):
+        return len(self._seen)
+
+    def add(self, url):
+        """URL daha önce görülmediyse işaretler ve True döndürür"""
+        url = canonical_url(url)
+        with self._lock:
+            if url in self._seen:
+                return False
+            self._seen.add(url)
+            return True
+
+    def filter_new(self, urls):
+        """
+        Daha önce görülmemiş URL'leri sırayı koruyarak standart biçimde döndürür
+
+        Döndürülen URL'ler görüldü olarak işaretlenir.
+        """
+        new_urls = []
+        with self._lock:
+            for url in urls:
+                url = canonical_url(url)
+                if url not in self._seen:
+                    self._seen.add(url)
+                    new_urls.append(url)
+        return new_urls
+
+    def mark_done(self, url):
+        """URL'nin işlendiğini kaydeder (kalıcı depo varsa dosyaya da yazar)"""
+        url = canonical_url(url)
+        with self._lock:
+            if url in self._done:
+                return
+            self._done.add(url)
+            self._seen.add(url)
+            if self.store_path:
+                os.makedirs(os.path.dirname(self.store_path) or '.', exist_ok=True)
+                with open(self.store_path, 'a', encoding='utf-8') as f:
+                    f.write(url + '\n')
+
+    def is_done(self, url):
+        return canonical_url(url) in self._done
+
+    def done_urls(self):
+        """Tamamlanan URL'lerin kopyası"""
+        with self._lock:
+            return list(self._done)
@@ -0,0 +1,369 @@
+import hmac
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from url_canon import canonical_url
+
+QUEUE_PATH = 'data/state/frontier.sqlite'
+
+# Kuyruk servisinin paylaşılan anahtarı: servis ve uzak işçiler bu ortam değişkeninden okur,
+# istekler anahtarı TOKEN_HEADER başlığında gönderir
+TOKEN_ENV = 'WORK_QUEUE_TOKEN'
+TOKEN_HEADER = 'X-Queue-Token'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_until REAL,
+    stored INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    added REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_lease ON urls (source, category, state, priority DESC, added);
+CREATE INDEX IF NOT EXISTS urls_stored ON urls (source, category, stored);
+"""
+
+
+class WorkQueue:
+    """
+    SQLite tabanlı kalıcı tarama kuyruğu (frontier)
+
+    Haber URL'leri kaynak, kategori ve öncelikle birlikte saklanır. İşçiler
+    `lease` ile bekleyen URL'leri belirli bir süre için kiralar; kiralanan URL
+    başka bir işçiye verilmez. İşçi `complete` veya `fail` ile sonucu bildirir.
+    Varsayılan max_attempts=1 ile her URL en fazla bir kez kiralanır, dolayısıyla
+    en fazla bir kez indirilir: süresi dolan kiralar (çöken işçi) ve `fail` ile
+    bildirilen hatalar yeniden denenmez, URL başarısız olarak işaretlenir.
+    max_attempts > 1 verilirse bu URL'ler hakları bitene kadar yeniden kuyruğa
+    alınır (en az bir kez indirme). Her iki durumda da süresi dolmuş bir kiranın
+    sahibi artık sonuç bildiremez, böylece her haber en fazla bir kez kaydedilir.
+
+    Aynı makinedeki süreçler dosyayı doğrudan paylaşabilir; farklı makineler
+    için kuyruk `serve` ile HTTP üzerinden sunulup RemoteWorkQueue ile kullanılır.
+
+    Args:
+        path: SQLite dosyası
+        lease_seconds: Kiralama süresi (saniye)
+        max_attempts: Bir URL'nin en fazla kiralanma (indirilme) sayısı
+    """
+
+    def __init__(self, path=QUEUE_PATH, lease_seconds=300, max_attempts=1):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(_SCHEMA)
+
+    def _transaction(self, statements):
+        """Sorguları tek bir yazma işleminde (BEGIN IMMEDIATE) çalıştırır"""
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                result = statements(self._db)
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+            return result
+
+    def add(self, urls, source, category, priority=0):
+        """
+        URL'leri kuyruğa ekler (kuyrukta zaten olanlar atlanır)
+
+        Returns:
+            Yeni eklenen URL sayısı
+        """
+        now = time.time()
+        rows = [(canonical_url(url), source, category, priority, now, now) for url in urls]
+
+        def insert(db):
+            before = db.total_changes
+            db.executemany('INSERT OR IGNORE INTO urls (url, source, category, priority, added, updated) '
+                           'VALUES (?, ?, ?, ?, ?, ?)', rows)
+            return db.total_changes - before
+
+        return self._transaction(insert) if rows else 0
+
+    def lease(self, worker, limit=10, source=None, category=None):
+        """
+        Bekleyen URL'lerden en yüksek öncelikli `limit` tanesini işçiye kiralar
+
+        Returns:
+            list: {'url', 'source', 'category', 'attempts'} sözlükleri
+        """
+        now = time.time()
+        filters, params = '', []
+        if source is not None:
+            filters += ' AND source = ?'
+            params.append(source)
+        if category is not None:
+            filters += ' AND category = ?'
+            params.append(category)
+
+        def take(db):
+            # Süresi dolan kiraları geri al: hakkı kalanlar kuyruğa, kalmayanlar başarısız
+            db.execute("UPDATE urls SET state = 'pending', lease_owner = NULL, updated = ? "
+                       "WHERE state = 'leased' AND lease_until < ? AND attempts < ?", (now, now, self.max_attempts))
+            db.execute("UPDATE urls SET state = 'failed', error = 'kira süresi doldu', lease_owner = NULL, updated = ? "
+                       "WHERE state = 'leased' AND lease_until < ?", (now, now))
+            rows = db.execute(f"SELECT url, source, category, attempts FROM urls WHERE state = 'pending'{filters} "
+                              "ORDER BY priority DESC, added LIMIT ?", params + [limit]).fetchall()
+            db.executemany("UPDATE urls SET state = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                           "lease_until = ?, updated = ? WHERE url = ?",
+                           [(worker, now + self.lease_seconds, now, row[0]) for row in rows])
+            return [{'url': url, 'source': src, 'category': cat, 'attempts': attempts + 1}
+                    for url, src, cat, attempts in rows]
+
+        return self._transaction(take)
+
+    def complete(self, url, worker, stored=False):
+        """
+        Kiralanan URL'nin işlendiğini bildirir
+
+        Args:
+            stored: Sayfadan haber çıkarılıp kaydedildiyse True
+
+        Returns:
+            bool: Kira hâlâ bu işçideyse True (False ise sonuç başka işçiye aittir, haber kaydedilmemeli)
+        """
+        def finish(db):
+            cursor = db.execute("UPDATE urls SET state = 'done', stored = ?, lease_owner = NULL, error = NULL, updated = ? "
+                                "WHERE url = ? AND state = 'leased' AND lease_owner = ?",
+                                (int(stored), time.time(), canonical_url(url), worker))
+            return cursor.rowcount == 1
+
+        return self._transaction(finish)
+
+    def fail(self, url, worker, error=None, retry=True):
+        """
+        Kiralanan URL'nin indirilemediğini bildirir; hakkı kalmışsa yeniden kuyruğa alınır
+
+        Returns:
+            bool: Kira hâlâ bu işçideyse True
+        """
+        def release(db):
+            state = f"CASE WHEN attempts < {int(self.max_attempts)} THEN 'pending' ELSE 'failed' END" if retry else "'failed'"
+            cursor = db.execute(f"UPDATE urls SET state = {state}, lease_owner = NULL, error = ?, updated = ? "
+                                "WHERE url = ? AND state = 'leased' AND lease_owner = ?",
+                                (str(error)[:500] if error else None, time.time(), canonical_url(url), worker))
+            return cursor.rowcount == 1
+
+        return self._transaction(release)
+
+    def release(self, worker, urls=None):
+        """
+        İşçinin kiralarını (ör. kapanırken) deneme hakkı düşürmeden kuyruğa geri verir
+
+        Yalnızca indirilmeye başlanmamış URL'ler için kullanılmalı; indirilen URL'ler
+        `complete` veya `fail` ile bildirilir.
+
+        Args:
+            urls: Yalnızca bu URL'lerin kiraları (varsayılan: işçinin tüm kiraları)
+        """
+        def give_back(db):
+            query = ("UPDATE urls SET state = 'pending', attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+                     "updated = ? WHERE state = 'leased' AND lease_owner = ?")
+            if urls is None:
+                return db.execute(query, (time.time(), worker)).rowcount
+            now = time.time()
+            before = db.total_changes
+            db.executemany(query + ' AND url = ?', [(now, worker, canonical_url(url)) for url in urls])
+            return db.total_changes - before
+
+        return self._transaction(give_back)
+
+    def stored(self, source, category):
+        """Kaynağın kategorisinde kaydedilen toplam haber sayısı (tüm işçiler)"""
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM urls WHERE source = ? AND category = ? AND stored = 1',
+                                    (source, category)).fetchone()[0]
+
+    def stats(self, source=None):
+        """
+        Returns:
+            list: Kaynak/kategori başına {'source', 'category', 'pending', 'leased', 'done', 'failed', 'stored'}
+        """
+        query = ("SELECT source, category, "
+                 "SUM(state = 'pending'), SUM(state = 'leased'), SUM(state = 'done'), SUM(state = 'failed'), SUM(stored) "
+                 "FROM urls" + (" WHERE source = ?" if source else "") + " GROUP BY source, category ORDER BY source, category")
+        with self._lock:
+            rows = self._db.execute(query, (source,) if source else ()).fetchall()
+        keys = ['source', 'category', 'pending', 'leased', 'done', 'failed', 'stored']
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def print_queue_stats(queue, source=None):
+    """Kuyruğun kaynak/kategori bazında durumunu yazdırır"""
+    rows = queue.stats(source)
+    if not rows:
+        print("Kuyruk boş.")
+        return
+    print("Tarama kuyruğu (bekleyen / kirada / biten / başarısız / kaydedilen haber):")
+    for row in rows:
+        print(f"  - {row['source']}/{row['category']}: {row['pending']} / {row['leased']} / {row['done']} / "
+              f"{row['failed']} / {row['stored']}")
+
+
+class RemoteWorkQueue:
+    """
+    `serve` ile sunulan kuyruğun HTTP istemcisi (WorkQueue ile aynı yöntemler)
+
+    Args:
+        base_url: Kuyruk servisinin adresi (ör. http://10.0.0.5:8700)
+        timeout: İstek zaman aşımı (saniye)
+        token: Servisin paylaşılan anahtarı (varsayılan: WORK_QUEUE_TOKEN ortam değişkeni)
+    """
+
+    def __init__(self, base_url, timeout=30, token=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        token = token or os.environ.get(TOKEN_ENV)
+        if token:
+            self.session.headers[TOKEN_HEADER] = token
+
+    def _call(self, method, **params):
+        response = self.session.post(f'{self.base_url}/{method}', json=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()['result']
+
+    def add(self, urls, source, category, priority=0):
+        return self._call('add', urls=list(urls), source=source, category=category, priority=priority)
+
+    def lease(self, worker, limit=10, source=None, category=None):
+        return self._call('lease', worker=worker, limit=limit, source=source, category=category)
+
+    def complete(self, url, worker, stored=False):
+        return self._call('complete', url=url, worker=worker, stored=stored)
+
+    def fail(self, url, worker, error=None, retry=True):
+        return self._call('fail', url=url, worker=worker, error=str(error) if error else None, retry=retry)
+
+    def release(self, worker, urls=None):
+        return self._call('release', worker=worker, urls=list(urls) if urls is not None else None)
+
+    def stored(self, source, category):
+        return self._call('stored', source=source, category=category)
+
+    def stats(self, source=None):
+        return self._call('stats', source=source)
+
+    def close(self):
+        self.session.close()
+
+
+def open_queue(location=QUEUE_PATH, **kwargs):
+    """Adres http(s):// ile başlıyorsa RemoteWorkQueue, değilse yerel WorkQueue açar"""
+    if location.startswith(('http://', 'https://')):
+        return RemoteWorkQueue(location)
+    return WorkQueue(location, **kwargs)
+
+
+_REMOTE_METHODS = {'add', 'lease', 'complete', 'fail', 'release', 'stored', 'stats'}
+
+
+def serve(queue, host='127.0.0.1', port=8700, token=None):
+    """
+    Kuyruğu diğer makinelerdeki işçiler için JSON/HTTP servisi olarak sunar
+
+    POST /<yöntem> gövdesindeki JSON parametrelerle WorkQueue yöntemini çağırır;
+    GET /stats kuyruk durumunu döndürür. Varsayılan olarak yalnızca bu makineden
+    erişilebilir; başka bir adreste (ör. 0.0.0.0) sunmak için paylaşılan anahtar
+    gerekir ve anahtarı TOKEN_HEADER başlığında göndermeyen istekler reddedilir.
+
+    Args:
+        host: Dinlenecek adres
+        port: Dinlenecek port
+        token: Paylaşılan anahtar (varsayılan: WORK_QUEUE_TOKEN ortam değişkeni)
+    """
+    token = token or os.environ.get(TOKEN_ENV)
+    if not token and host not in ('127.0.0.1', 'localhost', '::1'):
+        raise ValueError(f"Kuyruk {host} adresinde anahtarsız sunulamaz; {TOKEN_ENV} ortam değişkenini ayarlayın")
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorized(self):
+            if token and not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ''), token):
+                self._reply(401, {'error': 'yetkisiz'})
+                return False
+            return True
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            parts = urlsplit(self.path)
+            if parts.path.strip('/') != 'stats':
+                self._reply(404, {'error': 'bulunamadı'})
+                return
+            try:
+                self._reply(200, {'result': queue.stats(dict(parse_qsl(parts.query)).get('source'))})
+            except sqlite3.Error as e:
+                self._reply(503, {'error': str(e)})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            method = self.path.strip('/')
+            if method not in _REMOTE_METHODS:
+                self._reply(404, {'error': 'bulunamadı'})
+                return
+            try:
+                params = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                self._reply(200, {'result': getattr(queue, method)(**params)})
+            except (TypeError, ValueError) as e:
+                self._reply(400, {'error': str(e)})
+            except sqlite3.Error as e:
+                # ör. "database is locked": bağlantıyı yanıtsız kapatmak yerine hata döndür
+                self._reply(503, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Tarama kuyruğu http://{host}:{port} adresinde sunuluyor ({queue.path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    # python notebooks/work_queue.py serve [port] [adres]  |  python notebooks/work_queue.py stats [kuyruk]
+    # Başka makinelerden erişim için: WORK_QUEUE_TOKEN=<anahtar> python notebooks/work_queue.py serve 8700 0.0.0.0
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    if command == 'serve':
+        serve(WorkQueue(), port=int(sys.argv[2]) if len(sys.argv) > 2 else 8700,
+              host=sys.argv[3] if len(sys.argv) > 3 else '127.0.0.1')
+    else:
+        print_queue_stats(open_queue(sys.argv[2] if len(sys.argv) > 2 else QUEUE_PATH))